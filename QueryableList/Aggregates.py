@@ -0,0 +1,162 @@
+# Copyright (c) 2016, 2017 Timothy Savannah under the terms of the GNU Lesser General Public License version 2.1.
+#  You should have received a copy of this as "LICENSE" with this source distribution. The full license is available at https://raw.githubusercontent.com/kata198/QueryableList/master/LICENSE
+'''
+    Aggregates - Compute aggregates (count, sum, min, max, avg) of fields over a collection, in a single pass.
+
+      Aggregates are given as strings, like filters: "fieldName__aggregateType" (e.x. "price__avg"),
+        or just "count" for the number of items.
+'''
+
+#vim: set ts=4 st=4 sw=4 expandtab
+
+from __future__ import division
+
+from .constants import AGGREGATE_TYPES
+
+__all__ = ('parseAggregates', 'compileFieldGetters', 'Aggregator')
+
+
+def parseAggregates(aggregates):
+    '''
+        parseAggregates - Parse aggregate strings
+
+          @param aggregates list<str> - Each is "fieldName__aggregateType", or "count"
+
+          @return list<tuple> - A list of (aggregate string, fieldName or None for "count", aggregateType)
+
+          @raises ValueError - If an aggregate is not in a known format
+    '''
+    ret = []
+    for aggregate in aggregates:
+        if aggregate == 'count':
+            ret.append( (aggregate, None, 'count') )
+            continue
+
+        (fieldName, sep, aggregateType) = str(aggregate).rpartition('__')
+        if not fieldName or aggregateType not in AGGREGATE_TYPES:
+            raise ValueError('Unknown aggregate: %s. Must be "count" or "fieldName__type", where type is one of: (%s)' %(repr(aggregate), ', '.join(AGGREGATE_TYPES)))
+
+        ret.append( (aggregate, fieldName, aggregateType) )
+
+    return ret
+
+
+def compileFieldGetters(parsedAggregates, get_field_getter):
+    '''
+        compileFieldGetters - Get the functions to fetch each field used by some aggregates, once per field
+
+          @param parsedAggregates list<tuple> - As returned by parseAggregates
+
+          @param get_field_getter <function> - Returns the function to fetch a field value off an item, (fieldName) -> ((item) -> value).
+            Usually the _get_field_getter of a QueryableList type.
+
+          @return list<tuple> - A list of (fieldName, function to fetch that field off an item), in the order first used
+    '''
+    ret = []
+    seen = set()
+    for (aggregate, fieldName, aggregateType) in parsedAggregates:
+        if fieldName is None or fieldName in seen:
+            continue
+        seen.add(fieldName)
+        ret.append( (fieldName, get_field_getter(fieldName)) )
+
+    return ret
+
+
+class Aggregator(object):
+    '''
+        Aggregator - Computes aggregates over items, one item at a time.
+
+          Values which are None are ignored, so "fieldName__count" is the number of items where the field is not None,
+            and sum/min/max/avg are None if the field is None on every item.
+    '''
+
+    def __init__(self, parsedAggregates, get_field_getter=None, fieldGetters=None):
+        '''
+            __init__ - Create an Aggregator
+
+              @param parsedAggregates list<tuple> - As returned by parseAggregates
+
+              @param get_field_getter <function> - Returns the function to fetch a field value off an item, (fieldName) -> ((item) -> value).
+                Usually the _get_field_getter of a QueryableList type.
+
+              @param fieldGetters list<tuple>/None - The result of compileFieldGetters, used instead of #get_field_getter.
+                Pass this when creating many Aggregators for the same aggregates, so the getters are only compiled once.
+        '''
+        self.parsedAggregates = parsedAggregates
+
+        self.numItems = 0
+
+        # _fieldGetters - list of (fieldName, function to fetch that field off an item)
+        if fieldGetters is None:
+            fieldGetters = compileFieldGetters(parsedAggregates, get_field_getter)
+        self._fieldGetters = fieldGetters
+
+        # _fieldStats - fieldName -> [number of values, sum, min, max]. Sum, min, and max are only kept if used.
+        self._fieldStats = {}
+        # _fieldTypes - fieldName -> set of aggregate types used on that field
+        self._fieldTypes = {}
+        for (aggregate, fieldName, aggregateType) in parsedAggregates:
+            if fieldName is None:
+                continue
+            if fieldName not in self._fieldStats:
+                self._fieldStats[fieldName] = [0, None, None, None]
+            self._fieldTypes.setdefault(fieldName, set()).add(aggregateType)
+
+    def add(self, item):
+        '''
+            add - Add an item to the aggregates
+        '''
+        self.numItems += 1
+
+        fieldStats = self._fieldStats
+        for (fieldName, getValue) in self._fieldGetters:
+            value = getValue(item)
+            if value is None:
+                continue
+
+            stats = fieldStats[fieldName]
+            stats[0] += 1
+            if stats[0] == 1:
+                stats[1] = stats[2] = stats[3] = value
+                continue
+
+            aggregateTypes = self._fieldTypes[fieldName]
+            if 'sum' in aggregateTypes or 'avg' in aggregateTypes:
+                stats[1] += value
+            if 'min' in aggregateTypes and value < stats[2]:
+                stats[2] = value
+            if 'max' in aggregateTypes and value > stats[3]:
+                stats[3] = value
+
+    def getResults(self):
+        '''
+            getResults - Get the aggregates of the items added so far
+
+              @return dict - aggregate string -> value
+        '''
+        ret = {}
+        for (aggregate, fieldName, aggregateType) in self.parsedAggregates:
+            if fieldName is None:
+                ret[aggregate] = self.numItems
+                continue
+
+            (numValues, total, minValue, maxValue) = self._fieldStats[fieldName]
+            if aggregateType == 'count':
+                ret[aggregate] = numValues
+            elif numValues == 0:
+                ret[aggregate] = None
+            elif aggregateType == 'sum':
+                ret[aggregate] = total
+            elif aggregateType == 'min':
+                ret[aggregate] = minValue
+            elif aggregateType == 'max':
+                ret[aggregate] = maxValue
+            else:
+                # avg
+                ret[aggregate] = total / numValues
+
+        return ret
+
+
+#vim: set ts=4 st=4 sw=4 expandtab
@@ -2,22 +2,204 @@
 #  You should have received a copy of this as "LICENSE" with this source distribution. The full license is available at https://raw.githubusercontent.com/kata198/QueryableList/master/LICENSE
 
 #vim: set ts=4 st=4 sw=4 expandtab
-from .constants import FILTER_TYPES
+from .constants import FILTER_TYPES, FILTER_METHOD_AND, FILTER_METHOD_OR, INDEX_TYPE_HASH, INDEX_TYPE_SPLIT, INDEX_TYPE_LOWERCASE, INDEX_TYPES, JOIN_LEFT, JOIN_TYPES, STRING_TYPES
+from .Compiler import compileLinks, compileFieldPath, isFieldPath
+from .Indexes import INDEX_CLASSES, LowercaseIndex
+from .Aggregates import Aggregator, parseAggregates, compileFieldGetters
 
+from collections import OrderedDict
+
+import heapq
 import re
+import weakref
+
+try:
+    from itertools import ifilter as _filter
+except ImportError:
+    # Python 3, filter is already lazy
+    _filter = filter
 
 __all__ = ('FILTER_PARAM_RE', 'getFiltersFromArgs', 'QueryableListBase')
 
 FILTER_PARAM_RE = re.compile('^(?P<field>.+)__(?P<filterType>.+)$')
 
-'''
-    USE_CACHED - Set to True to cache field values on the items.
+# _ID_KEY - Marks a key made from the id of an unhashable item, @see _getHashKey
+_ID_KEY = object()
+
+def _getHashKey(item):
+    '''
+        _getHashKey - Get the key used to find an item in a set, for the set operators (-, |, &, ^)
+
+          Hashable items are their own key, so equal items match (same as "in").
+            Unhashable items (like dicts) are matched by identity.
+    '''
+    try:
+        hash(item)
+        return item
+    except TypeError:
+        return (_ID_KEY, id(item))
+
+def _getOne(matches):
+    '''
+        _getOne - Get the only item in #matches, stopping at the second. Used by "get" methods.
+
+          @return - The item, or None if there are none
+
+          @raises ValueError - If there is more than one
+    '''
+    ret = None
+    for (i, item) in enumerate(matches):
+        if i == 1:
+            raise ValueError('Expected at most one match, but found more than one.')
+        ret = item
+
+    return ret
+
+def _getJoinKey(value, fieldName):
+    '''
+        _getJoinKey - Check that a field value can be used to match items in a join, and return it
+
+          @raises ValueError - If the value cannot be hashed
+    '''
+    try:
+        hash(value)
+    except TypeError:
+        raise ValueError('Cannot join on field "%s", value %s is not hashable.' %(fieldName, repr(value)))
+
+    return value
+
+def _mergeItems(item, otherItem):
+    '''
+        _mergeItems - Merge the fields of two items (dicts, or objects with a __dict__) into a new dict. The fields of #item win.
+
+          @param otherItem - The other item, or None to only use #item
+
+          @raises ValueError - If an item is neither a dict nor has a __dict__
+    '''
+    ret = {}
+    for x in (otherItem, item):
+        if x is None:
+            continue
+        if isinstance(x, dict):
+            ret.update(x)
+        elif hasattr(x, '__dict__'):
+            ret.update(vars(x))
+        else:
+            raise ValueError('Cannot merge item %s, it is not a dict and has no __dict__.' %(repr(x), ))
+
+    return ret
+
+def _getHashKeys(items):
+    '''
+        _getHashKeys - Get a set of the keys of all #items, @see _getHashKey
+    '''
+    return set( [ _getHashKey(item) for item in items ] )
+
+def _parseSortField(fieldName, reverse, nullsFirst):
+    '''
+        _parseSortField - Parse one field to sort by. A "-" prefix on #fieldName flips #reverse for that field.
+          Field names which are not strings (like int dict keys) are used as-is.
+
+          Sort keys are (flag, value), or (noneFlag, 0) where the value is None, so None is never compared to a value.
+            Which flag is smaller depends on the direction, so None goes first only when #nullsFirst is set.
+
+          @return tuple<str, bool, bool, bool> - (fieldName, isDescending, noneFlag, valueFlag)
+    '''
+    isDescending = reverse
+    if isinstance(fieldName, STRING_TYPES) and fieldName.startswith('-'):
+        fieldName = fieldName[1:]
+        isDescending = not isDescending
+
+    noneFlag = (nullsFirst == isDescending)
+
+    return (fieldName, isDescending, noneFlag, not noneFlag)
+
+def _getSortKeys(column, noneFlag, valueFlag):
+    '''
+        _getSortKeys - Get the sort keys for a column of values. @see _parseSortField
+
+          The values are their own keys unless one of them is None, as wrapping every value costs more than the sort.
+
+          @return list - The keys, one per value
+    '''
+    # Checked by identity, so no value's __eq__ is called
+    for value in column:
+        if value is None:
+            break
+    else:
+        return column
+
+    return [ (noneFlag, 0) if value is None else (valueFlag, value) for value in column ]
+
+def _getFieldsSortKeys(fieldNames, reverse, nullsFirst, getColumn):
+    '''
+        _getFieldsSortKeys - Get the sort keys of every item for each field to sort by. @see _parseSortField
+
+          @param getColumn <function> - (fieldName) -> the value of that field for every item, in order
+
+          @return list<tuple<list, bool>> - For each field, in order: (the sort key of each item, whether that field is descending)
+    '''
+    sortKeys = []
+    for fieldName in fieldNames:
+        (fieldName, isDescending, noneFlag, valueFlag) = _parseSortField(fieldName, reverse, nullsFirst)
+
+        sortKeys.append( ( _getSortKeys(getColumn(fieldName), noneFlag, valueFlag), isDescending ) )
+
+    return sortKeys
+
+def _getSortedPositions(sortKeys, limit=None):
+    '''
+        _getSortedPositions - Sort the positions of the items by their keys (the items themselves are never compared).
+
+          @param sortKeys list<tuple<list, bool>> - As returned by _getFieldsSortKeys
+
+          @param limit <int/None> - If given, only the first #limit positions in order are returned, found with a heap holding at most #limit
+
+          @return list<int> - The positions of the items, in order. Items which are equal on every field keep their original order.
+    '''
+    if not sortKeys:
+        return []
+
+    numItems = len(sortKeys[0][0])
+
+    directions = set( [ isDescending for (keys, isDescending) in sortKeys ] )
+    if len(directions) == 1:
+        # All the same direction, a single sort on the keys (tuples of them, with several fields)
+        isDescending = directions.pop()
+        if len(sortKeys) == 1:
+            keys = sortKeys[0][0]
+        else:
+            keys = list( zip( *[ keys for (keys, isDescending) in sortKeys ] ) )
+
+        if limit is None:
+            return sorted(range(numItems), key=keys.__getitem__, reverse=isDescending)
+
+        # These are the same as sorted(..)[:limit], including for equal items
+        if isDescending:
+            return heapq.nlargest(limit, range(numItems), key=keys.__getitem__)
+        return heapq.nsmallest(limit, range(numItems), key=keys.__getitem__)
+
+    # Mixed directions, a stable sort on each field, from the last to the first
+    order = list(range(numItems))
+    for (keys, isDescending) in reversed(sortKeys):
+        order.sort(key=keys.__getitem__, reverse=isDescending)
+
+    if limit is not None:
+        return order[:limit]
+    return order
+
+def _popSortArgs(methodName, kwargs):
+    '''
+        _popSortArgs - Pop the reverse and nullsFirst arguments of sort_by/order_by off #kwargs
 
-      I don't notice any performance difference with this on or off,
-        so best to leave it False for now.
-'''
-USE_CACHED = False
+          @return tuple<bool, bool> - (reverse, nullsFirst)
+    '''
+    reverse = kwargs.pop('reverse', False)
+    nullsFirst = kwargs.pop('nullsFirst', False)
+    if kwargs:
+        raise TypeError('%s got unexpected keyword argument(s): %s' %(methodName, ', '.join(kwargs.keys()), ))
 
+    return (reverse, nullsFirst)
 
 def getFiltersFromArgs(kwargs):
     '''
@@ -52,7 +234,7 @@ def getFiltersFromArgs(kwargs):
 
 
             if filterType not in FILTER_TYPES:
-                raise ValueError('Unknown filter type: %s. Choices are: (%s)' %(filterType, ', '.join(FILTER_TYPES)))
+                raise ValueError('Unknown filter type: %s. Choices are: (%s). If "%s" is a nested field, add the operation, e.x. %s__eq' %(filterType, ', '.join(FILTER_TYPES), filterType, key))
 
 
             if filterType == 'isnull':
@@ -87,6 +269,114 @@ def getFiltersFromArgs(kwargs):
 
 
 
+class TrackedListMixin(object):
+    '''
+        TrackedListMixin - Overrides the list methods which modify a QueryableList to record that it was modified, @see QueryableListBase._checkModified
+
+          Only lists which keep state computed from their items need this, as it slows down every modification.
+            A QueryableList is switched to a tracked type (@see _getTrackedClass) when it is first checked, like when an index is created on it.
+    '''
+
+    # _isTracked - True for types which record modifications
+    _isTracked = True
+
+    # _isModified - Set when this list is modified, until the next _checkModified. Starts out True, as nothing has been checked yet.
+    _isModified = True
+
+    def append(self, item):
+        super(TrackedListMixin, self).append(item)
+        self._isModified = True
+
+    def extend(self, items):
+        super(TrackedListMixin, self).extend(items)
+        self._isModified = True
+
+    def insert(self, idx, item):
+        super(TrackedListMixin, self).insert(idx, item)
+        self._isModified = True
+
+    def remove(self, item):
+        super(TrackedListMixin, self).remove(item)
+        self._isModified = True
+
+    def pop(self, *args):
+        ret = super(TrackedListMixin, self).pop(*args)
+        self._isModified = True
+        return ret
+
+    def sort(self, *args, **kwargs):
+        super(TrackedListMixin, self).sort(*args, **kwargs)
+        self._isModified = True
+
+    def reverse(self):
+        super(TrackedListMixin, self).reverse()
+        self._isModified = True
+
+    def __setitem__(self, idx, value):
+        super(TrackedListMixin, self).__setitem__(idx, value)
+        self._isModified = True
+
+    def __delitem__(self, idx):
+        super(TrackedListMixin, self).__delitem__(idx)
+        self._isModified = True
+
+    def __iadd__(self, other):
+        ret = super(TrackedListMixin, self).__iadd__(other)
+        self._isModified = True
+        return ret
+
+    def __imul__(self, num):
+        ret = super(TrackedListMixin, self).__imul__(num)
+        self._isModified = True
+        return ret
+
+    if hasattr(list, 'clear'):
+        # Python 3
+        def clear(self):
+            super(TrackedListMixin, self).clear()
+            self._isModified = True
+
+    if hasattr(list, '__setslice__'):
+        # Python 2
+        def __setslice__(self, start, end, values):
+            super(TrackedListMixin, self).__setslice__(start, end, values)
+            self._isModified = True
+
+        def __delslice__(self, start, end):
+            super(TrackedListMixin, self).__delslice__(start, end)
+            self._isModified = True
+
+# _TRACKED_CLASSES - QueryableList type -> weak reference to the tracked type made from it, @see _getTrackedClass
+#   Both are weak (the tracked type holds the type it was made from), so types made at runtime (like by with_fields) can still be freed.
+_TRACKED_CLASSES = weakref.WeakKeyDictionary()
+
+def _getTrackedClass(cls):
+    '''
+        _getTrackedClass - Get a type which is #cls with TrackedListMixin, made once per type (and again only if it was freed).
+
+          A list is switched to this type in place (by setting __class__). It is a subclass of #cls with the same name,
+            so isinstance checks still pass, but type(lst) is no longer #cls. New lists made from it (like the results of a filter),
+            copies, and pickles are of #cls, so only the list which needed tracking pays for it.
+    '''
+    if cls._isTracked:
+        return cls
+
+    trackedClassRef = _TRACKED_CLASSES.get(cls)
+    trackedClass = trackedClassRef() if trackedClassRef is not None else None
+    if trackedClass is None:
+
+        def __new__(trackedCls, *args, **kwargs):
+            return cls(*args, **kwargs)
+
+        def __reduce_ex__(self, protocol):
+            return (cls, (list(self), ))
+
+        trackedClass = type(cls.__name__, (TrackedListMixin, cls), { '__new__' : __new__, '__reduce_ex__' : __reduce_ex__, '__module__' : cls.__module__, '_untrackedClass' : cls })
+        _TRACKED_CLASSES[cls] = weakref.ref(trackedClass)
+
+    return trackedClass
+
+
 class QueryableListBase(list):
     '''
         QueryableListBase - The base implementation of a QueryableList. 
@@ -96,6 +386,22 @@ class QueryableListBase(list):
         You cannot use this directly, instead use one of the implementing classes (like QueryableListDicts or QueryableListObjs), or your own implementing class.
     '''
 
+    # USE_CACHED - Set to True (on an implementing class, or an instance) to fetch each field at most once per item
+    #   when filtering, even if several filters use that field.
+    #
+    #   This costs a little on every fetch, so only enable it if #_get_item_value is expensive
+    #     (like a computed property, or a custom implementation that does I/O.)
+    USE_CACHED = False
+
+    # CACHE_LOWERCASE - Set to True (on an implementing class, or an instance) to keep the lowercase value of any field
+    #   used by a case-insensitive filter (ieq, ine, icontains, noticontains), so later filters on this list do not
+    #   fetch and lowercase every value again. This creates an INDEX_TYPE_LOWERCASE index on the field, @see create_index
+    CACHE_LOWERCASE = False
+
+    # LITERAL_FIELDS - Set (on an implementing class) to the names of fields which contain "__" (like "my__field") but are
+    #   fields themselves. Any other name containing "__" is a path to a nested field, e.x. "address__city". @see _isFieldPath
+    LITERAL_FIELDS = ()
+
     def all(self):
         '''
             all - Returns all items in this collection, as the collection type (aka returns a copy of "self").
@@ -124,30 +430,74 @@ class QueryableListBase(list):
         '''
         raise NotImplementedError('QueryableList type must implement _get_item_value')
 
+    @classmethod
+    def _get_field_getter(cls, fieldName):
+        '''
+            _get_field_getter - Returns a function which fetches the value of a field off an item.
+
+              #fieldName may be a path to a nested field, like "address__city" (@see Compiler.compileFieldPath), which is
+                split into a chain of accessors once, here, rather than for every item.
 
-    def _getItemValueFunction(self, caches, _get_item_value):
+              Filters, sorting, grouping, aggregates, joins, projections, and indexes all fetch values through this,
+                so a type with a faster way to fetch a single field than _get_item_value can override it.
 
-        _i = ctypes.c_int()
+                @param fieldName <str> - The name of the field (or path to a nested field) to fetch
 
-        maxI = len(caches)
+            @return <function> - A function (item) -> value of #fieldName on that item
+        '''
+        if not cls._isFieldPath(fieldName):
+            get_item_value = cls._get_item_value
+            return lambda item : get_item_value(item, fieldName)
 
-        def _getItemValue_impl(item, fieldName):
-            i = _i.value
-            cache = caches[i]
-            _i.value += 1
-            if i >= maxI:
-                _i.value = 0
-            else:
-                _i.value = i
+        return compileFieldPath(cls._get_item_value, fieldName, cls._get_field_getter)
 
-            if fieldName in cache:
-                val = cache[fieldName]
-            else:
-                val = _get_item_value(item, fieldName)
-                cache[fieldName] = val
-            return val
+    @classmethod
+    def _isFieldPath(cls, fieldName):
+        '''
+            _isFieldPath - Check if a field name is a path to a nested field on this type, e.x. "address__city".
+
+              Names in LITERAL_FIELDS are fields themselves. This is decided once per field name, never per item.
+        '''
+        return fieldName not in cls.LITERAL_FIELDS and isFieldPath(fieldName)
+
+    def _getFieldAccessType(self):
+        '''
+            _getFieldAccessType - Get the QueryableList type whose field access should be used for the items in this list.
+
+              This is the type of this list, but QueryableListMixed uses a faster type when all its items are alike.
+
+              private method - used when compiling filters to run on this list
+        '''
+        return self._untrackedClass or self.__class__
+
+    def _get_column(self, fieldName):
+        '''
+            _get_column - Returns the value of a field for every item in this list, in order.
+
+                @param fieldName <str> - The name of the field (or path to a nested field) to fetch
+
+            @return list - The values, one per item
+        '''
+        return list( map(self._get_field_getter(fieldName), self) )
+
+    @classmethod
+    def _get_fields_getter(cls, fieldNames):
+        '''
+            _get_fields_getter - Returns a function which fetches the values of several fields off an item at once, used by values and values_list.
+
+              The default uses _get_field_getter for each field. Override this to use a faster bulk accessor for your type.
+
+                @param fieldNames list<str> - The names of the fields to fetch
+
+            @return <function> - A function (item) -> tuple of the values of #fieldNames on that item, in order
+        '''
+        getters = tuple( [ cls._get_field_getter(fieldName) for fieldName in fieldNames ] )
+        if len(getters) == 1:
+            getter = getters[0]
+            return lambda item : (getter(item), )
+
+        return lambda item : tuple( [ getter(item) for getter in getters ] )
 
-        return _getItemValue_impl
 
     def customFilter(self, filterFunc):
         '''
@@ -158,13 +508,8 @@ class QueryableListBase(list):
 
             @return - A QueryableList object of the same type, with only the matching objects returned.
         '''
-        ret = self.__class__()
-        for item in self:
-            if filterFunc(item):
-                ret.append(item)
+        return self.__class__( [item for item in self if filterFunc(item)] )
 
-        return ret
-                
 
     def count(self):
         '''
@@ -176,377 +521,453 @@ class QueryableListBase(list):
         '''
         return len(self)
 
+    def lazy(self):
+        '''
+            lazy - Get a lazy query on this collection. Calls to filter/filterAnd/filterOr/sort_by on it are recorded,
+              and only run (with all the filters fused into a single pass) when the results are first needed.
+
+              This saves creating a list for each step when filtering in several steps.
+
+              @return <QuerySet> - A QuerySet on this collection, with no filters.
+        '''
+        from .QuerySet import QuerySet
+        return QuerySet(self)
+
 
-    def sort_by(self, fieldName, reverse=False):
+    def sort_by(self, *fieldNames, **kwargs):
         '''
-            sort_by - Return a copy of this collection, sorted by the given fieldName.
+            sort_by - Return a copy of this collection, sorted by the given field(s).
 
-              The fieldName is accessed the same way as other filtering, so it supports custom properties, etc.
+              The fields are accessed the same way as other filtering, so it supports custom properties, etc.
+                Each field is fetched only once per item.
 
-              @param fieldName <str> - The name of the field on which to sort by
+              @param fieldNames <str> - The names of the fields on which to sort by. Items are sorted by the first field,
+                then by the second where the first is equal, and so on.
+                Prefix a field name with "-" to sort on that field from largest to smallest, e.x. sort_by('-priority', 'created')
+                For compatibility, a single field may also be given as the keyword argument #fieldName, e.x. sort_by(fieldName='a')
 
-              @param reverse <bool> Default False - If True, list will be in reverse order.
+              @param reverse <bool> Default False - If True, list will be in reverse order (every field's direction is flipped).
+                For compatibility with sort_by(fieldName, reverse), if #reverse is not given as a keyword, a second positional
+                argument which is not a string (e.x. sort_by('a', True) or sort_by('a', 1)), or a last one which is a bool, is #reverse.
+
+              @param nullsFirst <bool> Default False - If True, items where a field is None come before the others for that field,
+                otherwise after. None is never compared to other values.
 
               @return <QueryableList> - A QueryableList of the same type with the elements sorted based on arguments.
+                Items which are equal on every field keep their original order.
         '''
-        return self.__class__(
-            sorted(self, key = lambda item : self._get_item_value(item, fieldName), reverse=reverse)
-        )
+        fieldName = kwargs.pop('fieldName', None)
+        if 'reverse' not in kwargs and fieldNames:
+            lastArg = fieldNames[-1]
+            if isinstance(lastArg, bool) or ( len(fieldNames) == 2 and not isinstance(lastArg, STRING_TYPES) ):
+                # Old form, sort_by(fieldName, reverse)
+                kwargs['reverse'] = lastArg
+                fieldNames = fieldNames[:-1]
 
+        (reverse, nullsFirst) = _popSortArgs('sort_by', kwargs)
 
-    def filterAnd(self, **kwargs):
+        if fieldName is not None:
+            # Old form, sort_by(fieldName=..)
+            fieldNames = (fieldName, ) + tuple(fieldNames)
+
+        if not fieldNames:
+            raise ValueError('sort_by requires at least one field name.')
+
+        return self.__class__( self._sortItems(fieldNames, reverse, nullsFirst) )
+
+    def _sortItems(self, fieldNames, reverse=False, nullsFirst=False, limit=None):
         '''
-            filter/filterAnd - Performs a filter and returns a QueryableList object of the same type.
+            _sortItems - Sort the items of this list by one or more fields. @see sort_by
 
-                All the provided filters must match for the item to be returned.
+              private method - used by sort_by and order_by
 
-            @params are in the format of fieldName__operation=value  where fieldName is the name of the field on any given item, "operation" is one of the given operations (@see main documentation) (e.x. eq, ne, isnull), and value is what is used in the operation.
+              @return list - The items in order (only the first #limit, if given)
+        '''
+        sortKeys = _getFieldsSortKeys(fieldNames, reverse, nullsFirst, self._get_column)
 
-            @return - A QueryableList object of the same type, with only the matching objects returned.
+        return [ self[i] for i in _getSortedPositions(sortKeys, limit) ]
+
+    def order_by(self, *fieldNames, **kwargs):
         '''
-        filters = getFiltersFromArgs(kwargs)
-        ret = self.__class__()
+            order_by - Return a copy of this collection ordered by the given field(s), optionally only the first #limit items.
 
-        if USE_CACHED:
-            caches = [dict() for i in range(len(self))]
-            get_item_value = self._getItemValueFunction(caches, self._get_item_value)
-        else:
-            get_item_value = self._get_item_value
+              The order is the same as sort_by. With a limit, a heap holding at most #limit items is used instead
+                of sorting the whole collection, so getting the top few of a large collection is much faster.
 
-        # AND loop - for each item in this collection, run through each of the filter types.
-        # If any of the filter types do not match, move on to next item
-        # If all filters match, add item to the return set
-        for item in self:
-            keepIt = True
+              @param fieldNames <str> - The names of the fields on which to order by, same as sort_by.
+                Prefix a field name with "-" to order from largest to smallest.
 
-            # Do is/isnot first (and implicitly, isnull)
-            for fieldName, value in filters['is']:
-                if get_item_value(item, fieldName) is not value:
-                    keepIt = False
-                    break
+              @param reverse <bool> Default False - If True, the direction of every field is flipped.
 
-            if keepIt is False:
-                continue
+              @param limit <int/None> Default None - If given, only the first #limit items in that order are returned.
 
-            for fieldName, value in filters['isnot']:
-                if get_item_value(item, fieldName) is value:
-                    keepIt = False
-                    break
+              @param nullsFirst <bool> Default False - If True, items where a field is None come before the others, otherwise after.
 
-            if keepIt is False:
-                continue
+              @return <QueryableList> - A QueryableList of the same type with the elements in order. Equal items keep their original order.
+        '''
+        limit = kwargs.pop('limit', None)
+        (reverse, nullsFirst) = _popSortArgs('order_by', kwargs)
 
-            for fieldName, matchFunc in filters['customMatch']:
-                val = get_item_value(item, fieldName)
-                if not matchFunc(val):
-                    keepIt = False
-                    break
+        if not fieldNames:
+            raise ValueError('order_by requires at least one field name.')
 
-            if keepIt is False:
-                continue
+        return self.__class__( self._sortItems(fieldNames, reverse, nullsFirst, limit) )
 
-            for fieldName, value in filters['in']:
-                if get_item_value(item, fieldName) not in value:
-                    keepIt = False
-                    break
+    @classmethod
+    def _orderItems(cls, items, fieldNames, reverse=False, limit=None, nullsFirst=False):
+        '''
+            _orderItems - Order any iterable of items by one or more fields, using the field access of this type. @see order_by
 
-            if keepIt is False:
-                continue
+              private method - used by QueryBuilder
 
-            for fieldName, value in filters['notin']:
-                if get_item_value(item, fieldName) in value:
-                    keepIt = False
-                    break
+              @return list - The items in order (only the first #limit, if given)
+        '''
+        sortFields = [ _parseSortField(fieldName, reverse, nullsFirst) for fieldName in fieldNames ]
 
-            if keepIt is False:
-                continue
+        if limit is not None and not isinstance(items, list) and len( set( [ sortField[1] for sortField in sortFields ] ) ) == 1:
+            # Only #limit items are kept at a time, so each key is made as the item is seen
+            getters = [ (cls._get_field_getter(fieldName), noneFlag, valueFlag) for (fieldName, isDescending, noneFlag, valueFlag) in sortFields ]
 
+            def key(item):
+                keys = []
+                for (getValue, noneFlag, valueFlag) in getters:
+                    value = getValue(item)
+                    if value is None:
+                        keys.append( (noneFlag, 0) )
+                    else:
+                        keys.append( (valueFlag, value) )
+                return keys
 
-            for fieldName, value in filters['eq']:
-                if get_item_value(item, fieldName) != value:
-                    keepIt = False
-                    break
+            # These are the same as sorted(..)[:limit], including for equal items, but only keep #limit items at a time
+            if sortFields[0][1]:
+                return heapq.nlargest(limit, items, key=key)
+            return heapq.nsmallest(limit, items, key=key)
 
-            if keepIt is False:
-                continue
+        if not isinstance(items, list):
+            items = list(items)
 
-            for fieldName, value in filters['ieq']:
-                # If we can't lowercase the item's value, it obviously doesn't match whatever we previously could.
-                # Reminder: the "i" filter's values have already been lowercased
-                itemValue = get_item_value(item, fieldName)
-                try:
-                    itemValueLower = itemValue.lower()
-                except:
-                    keepIt = False
-                    break
+        getColumn = lambda fieldName : list( map(cls._get_field_getter(fieldName), items) )
+        sortKeys = _getFieldsSortKeys(fieldNames, reverse, nullsFirst, getColumn)
 
-                if itemValueLower != value:
-                    keepIt = False
-                    break
+        return [ items[i] for i in _getSortedPositions(sortKeys, limit) ]
 
-            if keepIt is False:
-                continue
+    def values(self, *fieldNames, **kwargs):
+        '''
+            values - Get only the given fields of each item, as dicts.
 
-            for fieldName, value in filters['ne']:
-                if get_item_value(item, fieldName) == value:
-                    keepIt = False
-                    break
+              The fields are fetched together with a bulk accessor where the type has one (@see _get_fields_getter).
 
-            if keepIt is False:
-                continue
+              @param fieldNames <str> - The names of the fields to get
 
-            for fieldName, value in filters['ine']:
-                itemValue = get_item_value(item, fieldName)
-                try:
-                    itemValueLower = itemValue.lower()
-                except:
-                    # If we can't convert the field value to lowercase, it does not equal the other.
-                    continue
+              Any other arguments are filters, in the format fieldName__operation=value (same as #filterAnd).
+                If given, only the matching items are used, without creating an intermediate list.
 
-                if itemValueLower == value:
-                    keepIt = False
-                    break
+              @return list<dict> - For each (matching) item, a dict of fieldName -> value
 
-            if keepIt is False:
-                continue
+              @raises ValueError - If no field names are given
+        '''
+        if not fieldNames:
+            raise ValueError('values requires at least one field name.')
 
-            for fieldName, value in filters['lt']:
-                if get_item_value(item, fieldName) >= value:
-                    keepIt = False
-                    break
+        get_fields = self._getFieldAccessType()._get_fields_getter(fieldNames)
 
-            if keepIt is False:
-                continue
+        return [ dict(zip(fieldNames, get_fields(item))) for item in self._getFilteredItems(kwargs) ]
 
-            for fieldName, value in filters['lte']:
-                if get_item_value(item, fieldName) > value:
-                    keepIt = False
-                    break
+    def values_list(self, *fieldNames, **kwargs):
+        '''
+            values_list - Get only the given fields of each item, as tuples.
 
-            if keepIt is False:
-                continue
+              The fields are fetched together with a bulk accessor where the type has one (@see _get_fields_getter).
 
-            for fieldName, value in filters['gt']:
-                if get_item_value(item, fieldName) <= value:
-                    keepIt = False
-                    break
+              @param fieldNames <str> - The names of the fields to get
 
-            if keepIt is False:
-                continue
+              @param flat <bool> default False - If True, only one field name may be given, and the values are returned
+                directly instead of in a tuple of one.
 
+              Any other arguments are filters, in the format fieldName__operation=value (same as #filterAnd).
+                If given, only the matching items are used, without creating an intermediate list.
 
-            for fieldName, value in filters['gte']:
-                if get_item_value(item, fieldName) < value:
-                    keepIt = False
-                    break
+              @return list<tuple> - For each (matching) item, a tuple of the values of #fieldNames. If #flat, a list of the values.
 
-            if keepIt is False:
-                continue
+              @raises ValueError - If no field names are given, or flat is True and more than one is given
+        '''
+        flat = kwargs.pop('flat', False)
 
-            for fieldName, value in filters['contains']:
-                itemValue = get_item_value(item, fieldName)
-                try:
-                    if value not in itemValue:
-                        keepIt = False
-                        break
-                except:
-                    # If field does not support "in", it does not contain the item.
-                    keepIt = False
-                    break
+        if not fieldNames:
+            raise ValueError('values_list requires at least one field name.')
 
-            if keepIt is False:
-                continue
+        if flat and len(fieldNames) != 1:
+            raise ValueError('values_list with flat=True requires exactly one field name, but got %d.' %(len(fieldNames), ))
 
-            for fieldName, value in filters['icontains']:
-                itemValue = get_item_value(item, fieldName)
-                try:
-                    itemValue = itemValue.lower()
+        if flat and not kwargs:
+            return self._get_column(fieldNames[0])
 
-                    if value not in itemValue:
-                        keepIt = False
-                        break
-                except:
-                    keepIt = False
-                    break
+        get_fields = self._getFieldAccessType()._get_fields_getter(fieldNames)
+        items = self._getFilteredItems(kwargs)
 
-            if keepIt is False:
-                continue
+        if flat:
+            return [ get_fields(item)[0] for item in items ]
 
-            for fieldName, value in filters['notcontains']:
-                itemValue = get_item_value(item, fieldName)
-                try:
-                    if value in itemValue:
-                        keepIt = False
-                        break
-                except:
-                    # If field does not support "in", it does not contain the item.
-                    continue
+        return list( map(get_fields, items) )
 
-            if keepIt is False:
-                continue
+    def _getFilteredItems(self, filters):
+        '''
+            _getFilteredItems - Get the items matching #filters (AND), or this list itself if there are none.
 
-            for fieldName, value in filters['noticontains']:
-                itemValue = get_item_value(item, fieldName)
-                try:
-                    itemValue = itemValue.lower()
+              private method - used by values and values_list
 
-                    if value in itemValue:
-                        keepIt = False
-                        break
-                except:
-                    continue
+              @param filters <dict> - fieldName__operation -> value, same as #filterAnd
+        '''
+        if not filters:
+            return self
 
+        return self._getMatches( [ (FILTER_METHOD_AND, getFiltersFromArgs(filters)) ], self.USE_CACHED )
 
-            if keepIt is False:
-                continue
+    def distinct(self, *fieldNames):
+        '''
+            distinct - Return a copy of this collection without duplicates, keeping the first occurrence of each, in order.
 
-            for fieldName, value in filters['containsAny']:
-                itemValue = get_item_value(item, fieldName)
+              Uses hashing, so this is a single pass. Unhashable values (like dicts) are only duplicates if they are the very same object.
 
-                if itemValue is None:
-                    # Cannot split None
-                    keepIt = False
-                    break
+              @param fieldNames <str> - If given, items are duplicates when all these fields are equal.
+                If not given, items are duplicates when the items themselves are equal.
 
-                didContain = False
-                for maybeContains in value:
-                    if maybeContains in itemValue:
-                        didContain = True
-                        break
-                if didContain is False:
-                    keepIt = False
-                    break
+              @return <QueryableList> - A QueryableList of the same type, with only the first item of each distinct value
+        '''
+        seen = set()
+        ret = []
 
-            if keepIt is False:
-                continue
+        # keepAlive - Unhashable field values are matched by id, so hold on to them until done (else an id could be reused)
+        keepAlive = []
 
-            for fieldName, value in filters['notcontainsAny']:
-                itemValue = get_item_value(item, fieldName)
+        numFields = len(fieldNames)
+        if numFields == 1:
+            getValue = self._getFieldAccessType()._get_field_getter(fieldNames[0])
+        elif numFields > 1:
+            getValues = self._getFieldAccessType()._get_fields_getter(fieldNames)
 
-                if itemValue is None:
-                    # Cannot split None, so it is a match..
-                    continue
+        for item in self:
+            if numFields == 0:
+                key = item
+            elif numFields == 1:
+                key = getValue(item)
+            else:
+                key = getValues(item)
 
-                didContain = False
-                for maybeContains in value:
-                    if maybeContains in itemValue:
-                        didContain = True
-                        break
-                if didContain is True:
-                    keepIt = False
-                    break
+            # Unhashable types (like dict and list) set __hash__ to None, so most are found without raising for each item
+            isHashable = getattr(key, '__hash__', True) is not None
+            if isHashable:
+                try:
+                    isDuplicate = key in seen
+                except TypeError:
+                    # e.x. a tuple holding a list
+                    isHashable = False
+
+            if not isHashable:
+                if numFields != 0:
+                    keepAlive.append(key)
 
-            if keepIt is False:
+                if numFields > 1:
+                    key = tuple( [ _getHashKey(value) for value in key ] )
+                else:
+                    key = (_ID_KEY, id(key))
+
+                isDuplicate = key in seen
+
+            if isDuplicate:
                 continue
 
-            # IDEA: Could implement a dict here of last several splits, incase we have repeated splits on same large field.
-            #   I think this may be more lossy in the general case to support a corner case though.
+            seen.add(key)
+            ret.append(item)
+
+        return self.__class__(ret)
 
-            for fieldName, value in filters['splitcontains']:
-                (splitBy, maybeContains) = value
+    def join(self, other, on=None, left_on=None, right_on=None, how='inner', merge=False):
+        '''
+            join - Join this collection with another, pairing items where a field on this side equals a field on the other side.
 
-                itemValue = get_item_value(item, fieldName)
+              This is a hash join: a table keyed by the field values of the smaller side is built, then the larger side
+                is passed over once to match its items. So it is a pass over each list, not a filter of the other list for every item.
 
-                if itemValue is None:
-                    # Cannot split, no match
-                    keepIt = False
-                    break
+              @param other <QueryableList/list> - The items to join with. These can be a different QueryableList type,
+                their fields are fetched with their own _get_item_value. A plain list is used as a QueryableListMixed (dicts or objects).
 
-                try:
-                    itemValue = itemValue.split(splitBy)
-                    if maybeContains not in itemValue:
-                        keepIt = False
-                        break
-                except:
-                    # If field does not supprt "in", or cannot be split, it does not contain the item.
-                    keepIt = False
-                    break
+              @param on <str/None> - The name of the field to match on, on both sides
 
-            if keepIt is False:
-                continue
+              @param left_on <str/None> - Instead of #on, the name of the field on this side
 
-            for fieldName, value in filters['splitnotcontains']:
-                (splitBy, maybeContains) = value
+              @param right_on <str/None> - Instead of #on, the name of the field on the other side
 
-                itemValue = get_item_value(item, fieldName)
+              @param how <str> default 'inner' - One of JOIN_TYPES.
+                'inner' - Only items with a match are returned
+                'left'  - Every item of this list is returned, paired with None if there is no match
 
-                if itemValue is None:
-                    # Cannot split, so does not contain and is a match.
-                    continue
+              @param merge <bool> default False - If True, instead of pairs, return a new dict for each pair holding the fields
+                of both items (the item on this side wins when both have the same field). Items must be dicts or objects with a __dict__.
 
-                try:
-                    itemValue = itemValue.split(splitBy)
-                    if maybeContains in itemValue:
-                        keepIt = False
-                        break
-                except:
-                    # If field does not supprt "in", or cannot be split, it does not contain the item and thus matches here.
+              Fields which are None never match. An item matching several items on the other side is returned once with each of them.
+
+              @return <iterator> - Yields (item, otherItem) tuples (or dicts, if #merge), in the order of this list,
+                then of #other for items with several matches.
+
+              @raises ValueError - If the fields are not given as #on or as #left_on and #right_on, or #how is unknown
+        '''
+        if on is not None:
+            if left_on is not None or right_on is not None:
+                raise ValueError('join takes either "on", or "left_on" and "right_on", not both.')
+            left_on = right_on = on
+        elif left_on is None or right_on is None:
+            raise ValueError('join requires either "on", or both "left_on" and "right_on".')
+
+        if how not in JOIN_TYPES:
+            raise ValueError('Unknown join type: %s. Must be one of: (%s)' %(repr(how), ', '.join(JOIN_TYPES)))
+
+        return self._joinItems(other, left_on, right_on, how, merge)
+
+    def _joinItems(self, other, left_on, right_on, how, merge):
+        '''
+            _joinItems - Generator which performs the join, after join checks the arguments. @see join
+
+              private method - used by join
+        '''
+        if not issubclass(other.__class__, QueryableListBase):
+            from . import QueryableListMixed
+            other = QueryableListMixed(other)
+
+        getValue = self._getFieldAccessType()._get_field_getter(left_on)
+        getOtherValue = other._getFieldAccessType()._get_field_getter(right_on)
+
+        leftKeys = [ _getJoinKey(getValue(item), left_on) for item in self ]
+
+        if len(other) > len(self):
+            # The table is built on this (smaller) side: each key here -> the items of #other matching it, filled in one pass over #other
+            table = dict( [ (key, []) for key in leftKeys if key is not None ] )
+            for otherItem in other:
+                matches = table.get( _getJoinKey(getOtherValue(otherItem), right_on) )
+                if matches is not None:
+                    matches.append(otherItem)
+        else:
+            # The table is built on #other (the smaller side): each key there -> its items with that key
+            table = {}
+            for otherItem in other:
+                key = _getJoinKey(getOtherValue(otherItem), right_on)
+                if key is None:
                     continue
 
-            if keepIt is False:
+                matches = table.get(key)
+                if matches is None:
+                    table[key] = [otherItem]
+                else:
+                    matches.append(otherItem)
+
+        isLeft = (how == JOIN_LEFT)
+        for (item, key) in zip(self, leftKeys):
+            matches = table.get(key) if key is not None else None
+            if not matches:
+                if isLeft:
+                    yield _mergeItems(item, None) if merge else (item, None)
                 continue
 
-            for fieldName, value in filters['splitcontainsAny']:
-                (splitBy, maybeContainsLst) = value
+            for otherItem in matches:
+                yield _mergeItems(item, otherItem) if merge else (item, otherItem)
 
-                itemValue = get_item_value(item, fieldName)
+    def group_by(self, fieldName):
+        '''
+            group_by - Split this collection into groups by the value of a field, in a single pass.
 
-                if itemValue is None:
-                    # Cannot split, so it does not contain a match
-                    keepIt = False
-                    break
+              @param fieldName <str> - The name of the field to group by
 
-                try:
-                    itemValue = itemValue.split(splitBy)
-                except:
-                    # Cannot split, does not match.
-                    keepIt = False
-                    break
+              @return OrderedDict<value, QueryableList> - Each distinct value -> a QueryableList of the same type holding the items with that value.
+                Groups are in the order their value was first seen, and items keep their order within each group.
 
+              @raises ValueError - If a value of the field cannot be hashed (e.x. a list)
+        '''
+        groups = OrderedDict()
+        getValue = self._getFieldAccessType()._get_field_getter(fieldName)
+        for item in self:
+            value = getValue(item)
+            try:
+                group = groups.get(value)
+            except TypeError:
+                raise ValueError('Cannot group by field "%s", value %s is not hashable.' %(fieldName, repr(value)))
+
+            if group is None:
+                groups[value] = [item]
+            else:
+                group.append(item)
 
-                didContain = False
-                for maybeContains in maybeContainsLst:
-                    if maybeContains in itemValue:
-                        didContain = True
-                        break
-                if didContain is False:
-                    keepIt = False
-                    break
+        myClass = self.__class__
+        for (value, group) in groups.items():
+            groups[value] = myClass(group)
 
-            if keepIt is False:
-                continue
+        return groups
 
-            for fieldName, value in filters['splitnotcontainsAny']:
-                (splitBy, maybeContainsLst) = value
+    def aggregate(self, *aggregates):
+        '''
+            aggregate - Compute aggregates over this collection, in a single pass.
 
-                itemValue = get_item_value(item, fieldName)
+              @param aggregates <str> - Each is "fieldName__type", where type is one of: count, sum, min, max, avg.
+                Or just "count" for the number of items.
 
-                if itemValue is None:
-                    # Cannot split, so it must not contain any (and is a match)
-                    continue
+                Values which are None are ignored, so "fieldName__count" is the number of items where that field is not None,
+                  and sum/min/max/avg are None when there are no values.
 
-                try:
-                    itemValue = itemValue.split(splitBy)
-                except:
-                    # Cannot split, so must not contain any (and is a match)
-                    continue
+              @return dict - aggregate -> value, e.x. {'count' : 3, 'price__avg' : 4.5}
 
-                didContain = False
-                for maybeContains in maybeContainsLst:
-                    if maybeContains in itemValue:
-                        didContain = True
-                        break
-                if didContain is True:
-                    keepIt = False
-                    break
+              @raises ValueError - If an aggregate is not in a known format
+        '''
+        aggregator = Aggregator(parseAggregates(aggregates), self._getFieldAccessType()._get_field_getter)
+        for item in self:
+            aggregator.add(item)
 
-            if keepIt is False:
-                continue
+        return aggregator.getResults()
 
-            # All the way through all filters, the item matches.
-            ret.append(item)
+    def annotate_groups(self, fieldName, *aggregates):
+        '''
+            annotate_groups - Compute aggregates for each group of items sharing a value of a field, in a single pass.
 
-        return ret
+              Like calling aggregate on each group from group_by, without building the groups.
+
+              @param fieldName <str> - The name of the field to group by
+
+              @param aggregates <str> - The aggregates to compute for each group. @see aggregate
+
+              @return OrderedDict<value, dict> - Each distinct value -> the aggregates of the items with that value, in the order values were first seen.
+
+              @raises ValueError - If an aggregate is not in a known format, or a value of the field cannot be hashed
+        '''
+        parsedAggregates = parseAggregates(aggregates)
+        # Shared by the aggregators of every group
+        accessType = self._getFieldAccessType()
+        fieldGetters = compileFieldGetters(parsedAggregates, accessType._get_field_getter)
+
+        aggregators = OrderedDict()
+        getValue = accessType._get_field_getter(fieldName)
+        for item in self:
+            value = getValue(item)
+            try:
+                aggregator = aggregators.get(value)
+            except TypeError:
+                raise ValueError('Cannot group by field "%s", value %s is not hashable.' %(fieldName, repr(value)))
+
+            if aggregator is None:
+                aggregator = aggregators[value] = Aggregator(parsedAggregates, fieldGetters=fieldGetters)
+            aggregator.add(item)
+
+        return OrderedDict( (value, aggregator.getResults()) for (value, aggregator) in aggregators.items() )
+
+
+    def filterAnd(self, **kwargs):
+        '''
+            filter/filterAnd - Performs a filter and returns a QueryableList object of the same type.
+
+                All the provided filters must match for the item to be returned.
+
+            @params are in the format of fieldName__operation=value  where fieldName is the name of the field on any given item, "operation" is one of the given operations (@see main documentation) (e.x. eq, ne, isnull), and value is what is used in the operation.
+
+            @return - A QueryableList object of the same type, with only the matching objects returned.
+        '''
+        return self.__class__( self._getMatches( [ (FILTER_METHOD_AND, getFiltersFromArgs(kwargs)) ], self.USE_CACHED ) )
 
 
     '''
@@ -566,375 +987,493 @@ class QueryableListBase(list):
 
             @return - A QueryableList object of the same type, with only the matching objects returned.
         '''
-        filters = getFiltersFromArgs(kwargs)
-        ret = self.__class__()
+        return self.__class__( self._getMatches( [ (FILTER_METHOD_OR, getFiltersFromArgs(kwargs)) ], self.USE_CACHED ) )
 
-        if USE_CACHED:
-            caches = [dict() for i in range(len(self))]
-            get_item_value = self._getItemValueFunction(caches, self._get_item_value)
-        else:
-            get_item_value = self._get_item_value
+    def first(self, **kwargs):
+        '''
+            first - Get the first item which matches all the provided filters. Stops at the first match.
 
-        # OR filtering - For each item in the collection
-        #   Run through each filter type. If anything matches, we add the item to the collection and continue
-        #   If we get to the end without a match, we continue to next item
-        for item in self:
-            keepIt = False
+            @params are in the format of fieldName__operation=value, same as #filterAnd
 
-            # Do is/isnot (and implicitly isnull) first.
-            for fieldName, value in filters['is']:
-                if get_item_value(item, fieldName) is value:
-                    keepIt = True
-                    break
+            @return - The first matching item, or None if no item matches
+        '''
+        for item in self._getMatches( [ (FILTER_METHOD_AND, getFiltersFromArgs(kwargs)) ], self.USE_CACHED ):
+            return item
 
-            if keepIt is True:
-                ret.append(item)
-                continue
+        return None
 
-            for fieldName, value in filters['isnot']:
-                if get_item_value(item, fieldName) is not value:
-                    keepIt = True
-                    break
+    def exists(self, **kwargs):
+        '''
+            exists - Check if any item matches all the provided filters. Stops at the first match.
 
-            if keepIt is True:
-                ret.append(item)
-                continue
+            @params are in the format of fieldName__operation=value, same as #filterAnd
 
-            for fieldName, matchFunc in filters['customMatch']:
-                val = get_item_value(item, fieldName)
-                if matchFunc(val):
-                    keepIt = True
-                    break
+            @return <bool> - True if any item matches
+        '''
+        for item in self._getMatches( [ (FILTER_METHOD_AND, getFiltersFromArgs(kwargs)) ], self.USE_CACHED ):
+            return True
 
-            if keepIt is True:
-                ret.append(item)
-                continue
+        return False
 
-            for fieldName, value in filters['in']:
-                if get_item_value(item, fieldName) in value:
-                    keepIt = True
-                    break
+    def get(self, **kwargs):
+        '''
+            get - Get the one item which matches all the provided filters. Stops at the second match.
 
-            if keepIt is True:
-                ret.append(item)
-                continue
+            @params are in the format of fieldName__operation=value, same as #filterAnd
 
-            for fieldName, value in filters['notin']:
-                if get_item_value(item, fieldName) not in value:
-                    keepIt = True
-                    break
+            @return - The matching item, or None if no item matches
 
-            if keepIt is True:
-                ret.append(item)
-                continue
+            @raises ValueError - If more than one item matches
+        '''
+        return _getOne( self._getMatches( [ (FILTER_METHOD_AND, getFiltersFromArgs(kwargs)) ], self.USE_CACHED ) )
 
-            for fieldName, value in filters['eq']:
-                if get_item_value(item, fieldName) == value:
-                    keepIt = True
-                    break
+    def count_where(self, **kwargs):
+        '''
+            count_where - Count the items which match all the provided filters, without creating a list of them.
 
-            if keepIt is True:
-                ret.append(item)
-                continue
+              Same as filter(..).count(), but faster.
 
-            for fieldName, value in filters['ieq']:
-                # If we can't lowercase the item's value, it obviously doesn't match whatever we previously could.
-                # Reminder: the "i" filter's values have already been lowercased
-                itemValue = get_item_value(item, fieldName)
-                try:
-                    itemValueLower = itemValue.lower()
-                except:
-                    keepIt = False
-                    break
+            @params are in the format of fieldName__operation=value, same as #filterAnd
 
-                if itemValueLower == value:
-                    keepIt = True
-                    break
+            @return <int> - The number of matching items
+        '''
+        return self._countMatches( [ (FILTER_METHOD_AND, getFiltersFromArgs(kwargs)) ], self.USE_CACHED )
 
-            if keepIt is True:
-                ret.append(item)
-                continue
+    @classmethod
+    def ifilterAnd(cls, iterable, **kwargs):
+        '''
+            ifilter/ifilterAnd - Filter any iterable (like a generator) using the field access of this QueryableList type,
+              without loading it into a list. Matches are yielded as they are found, so memory use does not grow with the input.
 
-            for fieldName, value in filters['ne']:
-                if get_item_value(item, fieldName) != value:
-                    keepIt = True
-                    break
+                All the provided filters must match for the item to be returned.
 
-            if keepIt is True:
-                ret.append(item)
-                continue
+            @param iterable <iterable> - The items to filter. It is only iterated once.
 
-            for fieldName, value in filters['ine']:
-                itemValue = get_item_value(item, fieldName)
-                try:
-                    itemValueLower = itemValue.lower()
-                except:
-                    # If we can't convert the field value to lowercase, it does not equal the other.
-                    continue
+            @params are in the format of fieldName__operation=value, same as #filterAnd
 
-                if itemValueLower != value:
-                    keepIt = True
-                    break
+            @return <iterator> - The matching items, in order
+        '''
+        return _filter( cls._compileLinks( [ (FILTER_METHOD_AND, getFiltersFromArgs(kwargs)) ], cls.USE_CACHED ), iterable )
 
-            if keepIt is True:
-                ret.append(item)
-                continue
+    ifilter = ifilterAnd
 
-            for fieldName, value in filters['lt']:
-                if get_item_value(item, fieldName) < value:
-                    keepIt = True
-                    break
+    @classmethod
+    def ifilterOr(cls, iterable, **kwargs):
+        '''
+            ifilterOr - Filter any iterable (like a generator) using the field access of this QueryableList type,
+              without loading it into a list. Matches are yielded as they are found.
 
-            if keepIt is True:
-                ret.append(item)
-                continue
+                Any of the provided filters can match for the item to be returned.
 
-            for fieldName, value in filters['lte']:
-                if get_item_value(item, fieldName) <= value:
-                    keepIt = True
-                    break
+            @see #ifilterAnd
+        '''
+        return _filter( cls._compileLinks( [ (FILTER_METHOD_OR, getFiltersFromArgs(kwargs)) ], cls.USE_CACHED ), iterable )
 
-            if keepIt is True:
-                ret.append(item)
-                continue
+    def _getMatches(self, links, useCache=False, matchFunc=None):
+        '''
+            _getMatches - Get the items which match a chain of parsed filter links, in list order.
 
-            for fieldName, value in filters['gt']:
-                if get_item_value(item, fieldName) > value:
-                    keepIt = True
-                    break
+              Any filters which can be answered by an index on this list are, and the remaining filters are only tested
+                against the items the indexes selected. Otherwise, all items are tested in a single pass.
 
-            if keepIt is True:
-                ret.append(item)
-                continue
+              private method - used by filterAnd, filterOr, and QueryBuilder
 
+              @param links list<tuple> - A list of (filterMethod, filters), filters as returned by getFiltersFromArgs
 
-            for fieldName, value in filters['gte']:
-                if get_item_value(item, fieldName) >= value:
-                    keepIt = True
-                    break
+              @param useCache <bool> default False - @see _compileLinks
 
-            if keepIt is True:
-                ret.append(item)
-                continue
+              @param matchFunc <function/None> - If provided, the already-compiled match function for #links
 
-            for fieldName, value in filters['contains']:
-                itemValue = get_item_value(item, fieldName)
-                try:
-                    if value in itemValue:
-                        keepIt = True
-                        break
-                except:
-                    # If field does not support "in", it does not contain the item.
-                    continue
+              @return <iterable> - The matching items
+        '''
+        (positions, residualLinks) = self._planLinks(links)
 
-            if keepIt is True:
-                ret.append(item)
-                continue
+        return self._getPlannedMatches(links, positions, residualLinks, useCache, matchFunc)
 
-            for fieldName, value in filters['icontains']:
-                itemValue = get_item_value(item, fieldName)
-                try:
-                    itemValue = itemValue.lower()
+    def _countMatches(self, links, useCache=False, matchFunc=None):
+        '''
+            _countMatches - Count the items which match a chain of parsed filter links. @see _getMatches
 
-                    if value in itemValue:
-                        keepIt = True
-                        break
-                except:
-                    continue
+              If indexes answer every filter, this is just the number of positions they found.
 
-            if keepIt is True:
-                ret.append(item)
-                continue
+              private method - used by count_where and QueryBuilder
+        '''
+        (positions, residualLinks) = self._planLinks(links)
 
-            for fieldName, value in filters['notcontains']:
-                itemValue = get_item_value(item, fieldName)
-                try:
-                    if value not in itemValue:
-                        keepIt = True
-                        break
-                except:
-                    # If field does not support "in", it does not contain the item.
-                    keepIt = True
-                    break
+        if positions is not None and not residualLinks:
+            return len(positions)
 
-            if keepIt is True:
-                ret.append(item)
-                continue
+        count = 0
+        for item in self._getPlannedMatches(links, positions, residualLinks, useCache, matchFunc):
+            count += 1
 
-            for fieldName, value in filters['noticontains']:
-                itemValue = get_item_value(item, fieldName)
-                try:
-                    itemValue = itemValue.lower()
+        return count
 
-                    if value not in itemValue:
-                        keepIt = True
-                        break
-                except:
-                    # If field does not support "in", it does not contain the item.
-                    keepIt = True
-                    break
+    def _getPlannedMatches(self, links, positions, residualLinks, useCache=False, matchFunc=None):
+        '''
+            _getPlannedMatches - Get the items which match #links, given the result of planning them. @see _getMatches
 
-            if keepIt is True:
-                ret.append(item)
-                continue
+              @param positions set<int>/None - The positions selected by indexes, or None to test every item
 
+              @param residualLinks list<tuple> - The links which still must be tested against the items at #positions
+        '''
+        if positions is None:
+            # No index could help, test every item
+            if matchFunc is None:
+                matchFunc = self._getFieldAccessType()._compileLinks(links, useCache)
+            return _filter(matchFunc, self)
 
-            for fieldName, value in filters['containsAny']:
-                itemValue = get_item_value(item, fieldName)
+        items = list(map(self.__getitem__, sorted(positions)))
+        if not residualLinks:
+            return items
 
-                if itemValue is None:
-                    # None contains nothing, no match
-                    continue
+        return _filter(self._getFieldAccessType()._compileLinks(residualLinks, useCache), items)
 
-                didContain = False
-                for maybeContains in value:
-                    if maybeContains in itemValue:
-                        didContain = True
-                        break
-                if didContain is True:
-                    keepIt = True
-                    break
+    @classmethod
+    def _compileLinks(cls, links, useCache=False):
+        '''
+            _compileLinks - Compile a chain of parsed filter links into a single match function for this QueryableList type.
 
-            if keepIt is True:
-                ret.append(item)
-                continue
+              Unless #useCache is True, the result does not depend on the contents of any list, so it can be reused across lists of this type.
 
-            for fieldName, value in filters['notcontainsAny']:
-                itemValue = get_item_value(item, fieldName)
+              @param links list<tuple> - A list of (filterMethod, filters), filters as returned by getFiltersFromArgs
 
-                if itemValue is None:
-                    # None contains nothing, so this is a match
-                    keepIt = True
-                    break
+              @param useCache <bool> default False - If True, fields used by more than one filter are fetched once per item.
+                The match function holds state and must only be used for one pass. @see USE_CACHED
 
-                didContain = False
-                for maybeContains in value:
-                    if maybeContains in itemValue:
-                        didContain = True
-                        break
-                if didContain is False:
-                    keepIt = True
-                    break
+              @return <function> - Takes an item, returns True if it matches every link.
+        '''
+        return compileLinks(links, cls._get_field_getter, useCache)
 
-            if keepIt is True:
-                ret.append(item)
-                continue
 
+    ################################################
+    ##                 Indexes                    ##
+    ################################################
 
-            for fieldName, value in filters['splitcontains']:
-                (splitBy, maybeContains) = value
+    # _indexes - Map of index key -> FieldIndex, for indexes created on this list. None until one is created.
+    _indexes = None
 
-                itemValue = get_item_value(item, fieldName)
+    # _isTracked - True if this type records its modifications (@see TrackedListMixin). Other lists are switched to a tracked type by _checkModified.
+    _isTracked = False
 
-                if itemValue is None:
-                    # Cannot split, no match
-                    continue
+    # _untrackedClass - On a tracked type, the type it was made from. @see _getTrackedClass
+    _untrackedClass = None
 
-                try:
-                    itemValue = itemValue.split(splitBy)
-                    if maybeContains in itemValue:
-                        keepIt = True
-                        break
-                except:
-                    # If field does not supprt "in", or cannot be split, it does not contain the item.
-                    continue
+    # _checkedLength - The length of this list when _checkModified was last called
+    _checkedLength = None
 
+    # _MAX_INDEX_FRACTION - An index is not used for filters it estimates would match more than this fraction of the list,
+    #   as gathering that many positions costs more than testing every item
+    _MAX_INDEX_FRACTION = 0.75
 
-            if keepIt is True:
-                ret.append(item)
+    def create_index(self, fieldName, indexType=INDEX_TYPE_HASH, splitBy=None):
+        '''
+            create_index - Create an index on a field of this list, which filterAnd/filterOr (and QueryBuilder) will then use
+              on their own to answer filters on that field, instead of testing every item.
+
+              Indexes are rebuilt automatically (on the next filter that needs them) after the list is modified.
+                If you modify the items themselves, call create_index again to rebuild it.
+
+              Indexes are not copied to the results of a filter.
+
+              So that it can record its modifications, this list is switched to a subclass of its type (of the same name),
+                e.x. isinstance(lst, QueryableListObjs) is still True, but type(lst) is no longer QueryableListObjs.
+                Copies, pickles, and the results of filters are of the original type.
+
+              An index is not used for a filter it estimates would match most of the list (like isnull=False), where testing every item is faster.
+                A lowercase index is still used for ine and noticontains, as testing every item would lowercase every value again.
+
+              @param fieldName <str> - The name of the field to index
+
+              @param indexType <str> default INDEX_TYPE_HASH - One of INDEX_TYPES
+
+                INDEX_TYPE_HASH - Used by eq, in, is, and isnull filters
+
+                INDEX_TYPE_SORTED - Used by lt, lte, gt, and gte. Items whose value is None never match a filter answered by this index.
+
+                INDEX_TYPE_SPLIT - Used by splitcontains, splitnotcontains, splitcontainsAny, and splitnotcontainsAny which split by #splitBy
+
+                INDEX_TYPE_NGRAM - Used by contains, icontains, notcontains, and noticontains with a value of at least 3 characters
+
+                INDEX_TYPE_LOWERCASE - Used by ieq, ine, icontains, and noticontains. Keeps the lowercase values, created on its own when CACHE_LOWERCASE is set.
+
+              @param splitBy <str/None> default None - For INDEX_TYPE_SPLIT, the separator the filters will split by. None splits on whitespace.
+                Create one index per separator if filters use several.
+
+              @raises ValueError if indexType is not one of the known types, splitBy is given for another type of index, or the values cannot be indexed (like values of a sorted index which cannot be compared)
+        '''
+        if indexType not in INDEX_TYPES:
+            raise ValueError('Unknown index type, %s. Must be one of: %s' %(str(indexType), repr(INDEX_TYPES)))
+
+        if indexType == INDEX_TYPE_SPLIT:
+            index = INDEX_CLASSES[indexType](fieldName, splitBy)
+        elif splitBy is not None:
+            raise ValueError('splitBy is only used with INDEX_TYPE_SPLIT, not %s' %(str(indexType), ))
+        else:
+            index = INDEX_CLASSES[indexType](fieldName)
+
+        # Before building, so other indexes are rebuilt if the list was modified since they were
+        self._checkModified()
+        self._buildIndex(index)
+
+        if self._indexes is None:
+            self._indexes = {}
+        self._indexes[index.key] = index
+
+    def drop_index(self, fieldName, indexType=None):
+        '''
+            drop_index - Remove indexes on a field of this list
+
+              @param fieldName <str> - The name of the indexed field
+
+              @param indexType <str/None> default None - If None, all indexes on this field are removed. Otherwise, only the given type.
+        '''
+        if not self._indexes:
+            return
+
+        for (key, index) in list(self._indexes.items()):
+            if index.fieldName == fieldName and (indexType is None or index.indexType == indexType):
+                del self._indexes[key]
+
+    def _buildIndex(self, index):
+        '''
+            _buildIndex - Build (or rebuild) an index from the current contents of this list
+        '''
+        index.build( self._get_column(index.fieldName) )
+
+    def _checkModified(self):
+        '''
+            _checkModified - Check if this list was modified since this was last called, and if so, call #_onModified.
+
+              The first call switches this list to a tracked type (@see TrackedListMixin), whose list methods record any modification,
+                so later calls do not look at the items at all. Lists which are never checked (like ones without indexes) are not slowed down.
+
+              A modification which skips the overrides (like calling list.append(lst, item) directly) is only noticed if it changes the length.
+
+              @return <bool> - True if the list was modified (or this is the first call)
+        '''
+        if not self._isTracked:
+            self.__class__ = _getTrackedClass(self.__class__)
+            isModified = True
+        else:
+            isModified = self._isModified or len(self) != self._checkedLength
+
+        if isModified:
+            self._isModified = False
+            self._checkedLength = len(self)
+            self._onModified()
+
+        return isModified
+
+    def _onModified(self):
+        '''
+            _onModified - Called by #_checkModified when this list was modified, to drop anything computed from its contents (like indexes).
+              Subclasses which keep more such state should clear it here, and call this.
+        '''
+        if self._indexes:
+            self._invalidateIndexes()
+
+    def _invalidateIndexes(self):
+        '''
+            _invalidateIndexes - Called when this list was modified (@see _onModified). Marks all indexes as needing a rebuild.
+        '''
+        for index in self._indexes.values():
+            index.invalidate()
+
+    def _lookupIndexes(self, indexesByField, fieldName, filterType, value):
+        '''
+            _lookupIndexes - Try to answer a single filter with an index
+
+              @return tuple<set<int>, bool>/None - (positions, exact) from the first index which could answer it, otherwise None
+        '''
+        for index in indexesByField.get(fieldName, ()):
+            if filterType not in index.filterTypes or not self._ensureIndexBuilt(index):
+                continue
+
+            if self._isBroadLookup(index, [ (filterType, value) ]):
                 continue
 
-            for fieldName, value in filters['splitnotcontains']:
-                (splitBy, maybeContains) = value
+            positions = index.lookup(filterType, value)
+            if positions is not None:
+                return (positions, index.exact)
 
-                itemValue = get_item_value(item, fieldName)
+        return None
 
-                if itemValue is None:
-                    # Cannot split, so does not contain and is a match.
-                    keepIt = True
-                    break
+    def _lookupIndexesAnd(self, indexesByField, fieldName, entries):
+        '''
+            _lookupIndexesAnd - Try to answer several AND'd filters on the same field with the indexes on that field
 
+              @param entries list<tuple> - A list of (filterType, (fieldName, value)), where the inner tuple is the entry from the parsed filters
 
-                try:
-                    itemValue = itemValue.split(splitBy)
-                    if maybeContains not in itemValue:
-                        keepIt = True
-                        break
-                except:
-                    # If field does not supprt "in", or cannot be split, it does not contain the item and thus matches here.
-                    keepIt = True
-                    break
+              @return tuple<set<int>/None, set<int>> - (positions, ids of the entries which were answered exactly)
+        '''
+        positions = None
+        answeredIds = set()
 
+        for index in indexesByField[fieldName]:
+            usable = [ (filterType, entry) for (filterType, entry) in entries if filterType in index.filterTypes and id(entry) not in answeredIds ]
+            if not usable or not self._ensureIndexBuilt(index):
+                continue
 
-            if keepIt is True:
-                ret.append(item)
+            indexFilters = [ (filterType, entry[1]) for (filterType, entry) in usable ]
+            if self._isBroadLookup(index, indexFilters):
                 continue
 
+            (found, answered) = index.lookupAll(indexFilters)
+            if found is None:
+                continue
 
-            for fieldName, value in filters['splitcontainsAny']:
-                (splitBy, maybeContainsLst) = value
+            if positions is None:
+                positions = found
+            else:
+                positions = positions & found
 
-                itemValue = get_item_value(item, fieldName)
+            if index.exact:
+                for i in answered:
+                    answeredIds.add( id(usable[i][1]) )
 
-                if itemValue is None:
-                    # Cannot split, so it does not contain a match
-                    continue
+        return (positions, answeredIds)
 
-                try:
-                    itemValue = itemValue.split(splitBy)
-                except:
-                    # Cannot split, does not match.
-                    continue
+    def _isBroadLookup(self, index, filters):
+        '''
+            _isBroadLookup - Check if an index estimates #filters would match so much of the list that a scan is faster. @see _MAX_INDEX_FRACTION
 
+              @param filters list<tuple> - A list of (filterType, value), as given to FieldIndex.lookupAll
+        '''
+        count = index.estimateAll(filters)
 
-                didContain = False
-                for maybeContains in maybeContainsLst:
-                    if maybeContains in itemValue:
-                        didContain = True
-                        break
+        return count is not None and count > index.numItems * self._MAX_INDEX_FRACTION
+
+    def _addLowercaseIndexes(self, links):
+        '''
+            _addLowercaseIndexes - Add a (not yet built) lowercase index for every field used by a case-insensitive filter in #links
+              which does not already have one. They are built the first time they are needed. @see CACHE_LOWERCASE
+        '''
+        for (filterMethod, filters) in links:
+            for filterType in LowercaseIndex.filterTypes:
+                for (fieldName, value) in filters[filterType]:
+                    if self._indexes is None:
+                        self._indexes = {}
+                    elif (INDEX_TYPE_LOWERCASE, fieldName) in self._indexes:
+                        continue
+
+                    index = LowercaseIndex(fieldName)
+                    self._indexes[index.key] = index
+
+    def _ensureIndexBuilt(self, index):
+        '''
+            _ensureIndexBuilt - Build an index if it needs to be (like after the list was modified)
 
-                if didContain is True:
-                    keepIt = True
-                    break
+              @return <bool> - True if the index can be used, False if it could not be built from the current contents
+        '''
+        if index.isBuilt:
+            return True
 
+        try:
+            self._buildIndex(index)
+        except ValueError:
+            return False
 
-            if keepIt is True:
-                ret.append(item)
-                continue
+        return True
+
+    def _planLinks(self, links):
+        '''
+            _planLinks - Use the indexes on this list to answer as many filters in a chain of links as possible.
 
-            for fieldName, value in filters['splitnotcontainsAny']:
-                (splitBy, maybeContainsLst) = value
+              Every filter in an AND link which an index can answer narrows the positions.
+                An OR link narrows the positions only if every one of its filters can be answered.
 
-                itemValue = get_item_value(item, fieldName)
+              private method - used by _getMatches
 
-                if itemValue is None:
-                    # Cannot split, so it must not contain any (and is a match)
-                    keepIt = True
-                    break
+              @return tuple<set<int>/None, list> - (positions, residualLinks)
 
-                try:
-                    itemValue = itemValue.split(splitBy)
-                except:
-                    # Cannot split, so must not contain any (and is a match)
-                    keepIt = True
-                    break
-
-                didContain = False
-                for maybeContains in maybeContainsLst:
-                    if maybeContains in itemValue:
-                        didContain = True
+                positions - The positions of the only items which could match, or None if no index was used
+
+                residualLinks - The links (same format as #links), minus the filters the indexes answered exactly.
+                  These must still be tested against the items at #positions
+        '''
+        if self.CACHE_LOWERCASE:
+            self._addLowercaseIndexes(links)
+
+        if not self._indexes:
+            return (None, links)
+
+        self._checkModified()
+
+        indexesByField = {}
+        for index in self._indexes.values():
+            indexesByField.setdefault(index.fieldName, []).append(index)
+
+        positions = None
+        residualLinks = []
+
+        for (filterMethod, filters) in links:
+
+            if filterMethod == FILTER_METHOD_AND:
+                # Group the filters on indexed fields, so an index can answer all the filters on its field at once
+                #   (like a sorted index turning a gt and a lte into one range)
+                entriesByField = {}
+                for (filterType, fieldFilters) in filters.items():
+                    for entry in fieldFilters:
+                        if entry[0] in indexesByField:
+                            entriesByField.setdefault(entry[0], []).append( (filterType, entry) )
+
+                answeredIds = set()
+                for (fieldName, entries) in entriesByField.items():
+                    (foundPositions, foundAnsweredIds) = self._lookupIndexesAnd(indexesByField, fieldName, entries)
+                    if foundPositions is None:
+                        continue
+
+                    if positions is None:
+                        positions = foundPositions
+                    else:
+                        positions = positions & foundPositions
+
+                    answeredIds |= foundAnsweredIds
+
+                residualFilters = {}
+                hasResidual = False
+                for (filterType, fieldFilters) in filters.items():
+                    residualFieldFilters = [ entry for entry in fieldFilters if id(entry) not in answeredIds ]
+
+                    residualFilters[filterType] = residualFieldFilters
+                    if residualFieldFilters:
+                        hasResidual = True
+
+                if hasResidual:
+                    residualLinks.append( (filterMethod, residualFilters) )
+
+            else:
+                # OR - Only helps if the indexes can answer every filter in the link exactly
+                orPositions = set()
+                for (filterType, fieldFilters) in filters.items():
+                    for (fieldName, value) in fieldFilters:
+                        found = None
+                        if fieldName in indexesByField:
+                            found = self._lookupIndexes(indexesByField, fieldName, filterType, value)
+
+                        if found is None or found[1] is False:
+                            orPositions = None
+                            break
+
+                        orPositions |= found[0]
+
+                    if orPositions is None:
                         break
-                if didContain is False:
-                    keepIt = True
-                    break
 
+                if orPositions is None:
+                    residualLinks.append( (filterMethod, filters) )
+                elif positions is None:
+                    positions = orPositions
+                else:
+                    positions = positions & orPositions
 
-            if keepIt is True:
-                ret.append(item)
-                continue
+            if positions is not None and not positions:
+                # Nothing can match, no need to look any further.
+                return (positions, [])
 
+        return (positions, residualLinks)
 
-        return ret
 
     ################################################
     ##     List overrides to return same type     ##
@@ -984,33 +1523,25 @@ class QueryableListBase(list):
         '''
             __sub__ - Implement subtract. Removes any items from #self that are present in #other
 
+              Items which cannot be hashed (like dicts) are only matched if they are the same object.
+
               Returns a copy, does not modify inline
         '''
-        myCopy = self[:]
+        otherKeys = _getHashKeys(other)
 
-        for item in other:
-            while True:
-                # Remove ALL copies
-                try:
-                    myCopy.remove(item)
-                except ValueError:
-                    break
-        return myCopy
+        return self.__class__( [ item for item in self if _getHashKey(item) not in otherKeys ] )
 
     def __isub__(self, other):
         '''
             __isub__ - Implement subtract-equals. Removes any items from #self that are present in #other
 
+              Items which cannot be hashed (like dicts) are only matched if they are the same object.
+
             Works inline and modifies #self
         '''
-        for item in other:
-            while True:
-                # Remove ALL copies of OTHER
-                try:
-                    self.remove(item)
-                except ValueError:
-                    break
+        otherKeys = _getHashKeys(other)
 
+        self[:] = [ item for item in self if _getHashKey(item) not in otherKeys ]
         return self
 
 
@@ -1019,39 +1550,58 @@ class QueryableListBase(list):
         '''
             __or__ - Append any items found in #other which are not already present in #self
 
+              Items which cannot be hashed (like dicts) are only matched if they are the same object.
+
                 Returns a copy
         '''
-        ret = self[:]
-        for item in other:
-            if item not in self:
-                ret.append(item)
+        myKeys = _getHashKeys(self)
 
-        return ret
+        return self.__class__( list(self) + [ item for item in other if _getHashKey(item) not in myKeys ] )
 
     def __ior__(self, other):
+        '''
+            __ior__ - Append any items found in #other which are not already present in #self (including ones just appended from #other)
+
+              Items which cannot be hashed (like dicts) are only matched if they are the same object.
+
+              Works inline and modifies #self
+        '''
+        myKeys = _getHashKeys(self)
+
+        # Each item is checked against the list as it grows, so a duplicate within #other is only appended once
+        toAppend = []
         for item in other:
-            if item not in self:
-                self.append(item)
+            key = _getHashKey(item)
+            if key not in myKeys:
+                myKeys.add(key)
+                toAppend.append(item)
+
+        self.extend(toAppend)
         return self
 
     def __and__(self, other):
         '''
             __and__ - Return a QueryableList (of this type) which contains all the elements in #self that are also in #other
 
+              Items which cannot be hashed (like dicts) are only matched if they are the same object.
+
               Returns a copy
         '''
-        # TODO: Optimize for least number of searches, N > M stuff
-        ret = self.__class__([])
-        for item in self:
-            if item in other:
-                ret.append(item)
+        otherKeys = _getHashKeys(other)
 
-        return ret
+        return self.__class__( [ item for item in self if _getHashKey(item) in otherKeys ] )
 
     def __iand__(self, other):
-        for item in self:
-            if item not in other:
-                self.remove(item)
+        '''
+            __iand__ - Remove any items from #self that are not also in #other
+
+              Items which cannot be hashed (like dicts) are only matched if they are the same object.
+
+            Works inline and modifies #self
+        '''
+        otherKeys = _getHashKeys(other)
+
+        self[:] = [ item for item in self if _getHashKey(item) in otherKeys ]
         return self
 
     def __xor__(self, other):
@@ -1059,24 +1609,49 @@ class QueryableListBase(list):
             __xor__ - Return a QueryableList (of this type) which contains all the elements
               that appear in either #self or #other, but not both.
 
+              For each item in #other which is in #self, the first remaining copy of it in #self is dropped.
+                The items of #other which are not in #self are appended, in order.
+
+              Items which cannot be hashed (like dicts) are only matched if they are the same object.
+
               Returns a copy
         '''
-        ret = self[:]
-        for item in other:
-            if item not in self:
-                ret.append(item)
-            else:
-                ret.remove(item)
-
-        return ret
+        return self.__class__( self._getXorItems(other) )
 
     def __ixor__(self, other):
+        '''
+            __ixor__ - Keep only the elements that appear in either #self or #other, but not both. @see __xor__
+
+            Works inline and modifies #self
+        '''
+        self[:] = self._getXorItems(other)
+        return self
+
+    def _getXorItems(self, other):
+        '''
+            _getXorItems - Get a list of the items in #self XOR #other, @see __xor__
+        '''
+        myKeys = _getHashKeys(self)
+
+        # Number of copies to drop from #self, per key
+        numToRemove = {}
+        toAppend = []
         for item in other:
-            if item not in self:
-                self.append(item)
+            key = _getHashKey(item)
+            if key in myKeys:
+                numToRemove[key] = numToRemove.get(key, 0) + 1
             else:
-                self.remove(item)
-        return self
+                toAppend.append(item)
+
+        ret = []
+        for item in self:
+            key = _getHashKey(item)
+            if numToRemove.get(key):
+                numToRemove[key] -= 1
+            else:
+                ret.append(item)
+
+        return ret + toAppend
 
     def __copy__(self):
         '''
@@ -1,8 +1,6 @@
 # Copyright (c) 2016, 2017 Timothy Savannah under the terms of the GNU Lesser General Public License version 2.1.
 #  You should have received a copy of this as "LICENSE" with this source distribution.
 #  The full license is available at https://raw.githubusercontent.com/kata198/QueryableList/master/LICENSE
-#
-# TODO: Add tests for QueryBuilder
 '''
     Builder - Provides "QueryBuilder", which supports building reuaable queries which can be reused and executed
       on datasets.
@@ -14,7 +12,7 @@
 import copy
 from collections import namedtuple, deque
 
-from .Base import getFiltersFromArgs, QueryableListBase
+from .Base import getFiltersFromArgs, QueryableListBase, _filter, _getOne, _popSortArgs
 
 from .constants import FILTER_METHODS, FILTER_METHOD_AND, FILTER_METHOD_OR
 
@@ -30,6 +28,15 @@ class QueryBuilder(object):
     def __init__(self):
         self.filters = deque()
 
+        # _parsedFilters - Parallel to #filters, each link as (filterMethod, parsed filters from getFiltersFromArgs)
+        self._parsedFilters = []
+        # _compiledFilters - Map of QueryableList type -> match function for the whole chain.
+        #   Cleared whenever a link is added.
+        self._compiledFilters = {}
+
+        # orderBy - (fieldNames, reverse, limit, nullsFirst) to order the results by, or None to keep list order. @see order_by
+        self.orderBy = None
+
     def addFilter(self, filterMethod=FILTER_METHOD_AND, **kwargs):
         '''
             addFilter - Add a filter to this query.
@@ -37,14 +44,19 @@ class QueryBuilder(object):
             @param filterMethod  <str> - The filter method to use (AND or OR), default: 'AND'
             @param additional args - Filter arguments. @see QueryableListBase.filter
 
-            @raises ValueError if filterMethod is not one of known methods.
+            @raises ValueError if filterMethod is not one of known methods, or any of the filters are invalid.
 
+            The filters are parsed here, once, so executing the query does not need to parse them again.
         '''
         filterMethod = filterMethod.upper()
         if filterMethod not in FILTER_METHODS:
             raise ValueError('Unknown filter method, %s. Must be one of: %s' %(str(filterMethod), repr(FILTER_METHODS)))
 
+        parsedFilters = getFiltersFromArgs(kwargs)
+
         self.filters.append((filterMethod, kwargs))
+        self._parsedFilters.append((filterMethod, parsedFilters))
+        self._compiledFilters = {}
 
     def addFilterAnd(self, **kwargs):
         '''
@@ -62,32 +74,198 @@ class QueryBuilder(object):
         '''
         return self.addFilter(FILTER_METHOD_OR, **kwargs)
 
-    def execute(self, lst):
+    def order_by(self, *fieldNames, **kwargs):
+        '''
+            order_by - Order the results of this query by one or more fields. This replaces any ordering set before.
+
+              The ordering is applied to the matches as they are found, so with a #limit, only that many items are
+                kept at a time (in a heap), and the full set of matches is never sorted or even put in a list.
+
+            @param fieldNames <str> - The names of the fields on which to order by, same as sort_by.
+                Prefix a field name with "-" to order from largest to smallest.
+
+            @param reverse <bool> Default False - If True, the direction of every field is flipped.
+
+            @param limit <int/None> Default None - If given, only the first #limit items in that order are returned.
+
+            @param nullsFirst <bool> Default False - If True, items where a field is None come before the others, otherwise after.
+
+            @see QueryableListBase.order_by
+        '''
+        limit = kwargs.pop('limit', None)
+        (reverse, nullsFirst) = _popSortArgs('order_by', kwargs)
+
+        if not fieldNames:
+            raise ValueError('order_by requires at least one field name.')
+
+        self.orderBy = (fieldNames, reverse, limit, nullsFirst)
+
+    def execute(self, lst, useCache=None):
         '''
             execute - Execute the series of filters, in order, on the provided list.
 
+              All the links are fused and evaluated in a single pass over #lst, with no intermediate lists.
+                If #lst has indexes (@see QueryableListBase.create_index), they are used for the filters they can answer.
+
             @param lst <list/ A QueryableList type> - The list to filter. If you already know the types of items within
                 the list, you can pick a QueryableList implementing class to get faster results. Otherwise, if a list type that does
                 not extend QueryableListBase is provided, QueryableListMixed will be used (Supports both object-like and dict-like items)
 
+            @param useCache <bool/None> default None - If True, every field used by more than one filter anywhere in the chain is fetched
+                only once per item. If None, the USE_CACHED setting of the QueryableList type is used.
+
             @return - QueryableList of results. If you provided #lst as a QueryableList type already, that same type will be returned.
                 Otherwise, a QueryableListMixed will be returned.
+
+                If an ordering was set with #order_by, the results are in that order.
+        '''
+        (lst, matches) = self._getMatches(lst, useCache)
+
+        return lst.__class__( self._applyOrder(lst._getFieldAccessType(), matches) )
+
+    def count(self, lst, useCache=None):
+        '''
+            count - Count the items in #lst which match this query, without creating a list of them.
+
+            @param lst <list/ A QueryableList type> - The list to search. @see execute
+
+            @param useCache <bool/None> default None - @see execute
+
+            @return <int> - The number of matching items (at most the limit set by #order_by, if any)
+        '''
+        (lst, useCache, matchFunc) = self._prepare(lst, useCache)
+
+        count = lst._countMatches(self._parsedFilters, useCache, matchFunc)
+
+        limit = self._getLimit()
+        if limit is not None and count > limit:
+            return limit
+
+        return count
+
+    def first(self, lst, useCache=None):
+        '''
+            first - Get the first item in #lst which matches this query. Stops at the first match.
+
+            @param lst <list/ A QueryableList type> - The list to search. @see execute
+
+            @param useCache <bool/None> default None - @see execute
+
+            @return - The first matching item (in the order set by #order_by, if any), or None if no item matches
+        '''
+        (lst, matches) = self._getMatches(lst, useCache)
+        if self.orderBy is not None:
+            matches = self._applyOrder(lst._getFieldAccessType(), matches, 1)
+
+        for item in matches:
+            return item
+
+        return None
+
+    def exists(self, lst, useCache=None):
+        '''
+            exists - Check if any item in #lst matches this query. Stops at the first match.
+
+            @param lst <list/ A QueryableList type> - The list to search. @see execute
+
+            @param useCache <bool/None> default None - @see execute
+
+            @return <bool> - True if any item matches (always False if #order_by set a limit of 0)
+        '''
+        if self._getLimit() == 0:
+            return False
+
+        (lst, matches) = self._getMatches(lst, useCache)
+        for item in matches:
+            return True
+
+        return False
+
+    def get(self, lst, useCache=None):
+        '''
+            get - Get the one item in #lst which matches this query. Stops at the second match.
+
+            @param lst <list/ A QueryableList type> - The list to search. @see execute
+
+            @param useCache <bool/None> default None - @see execute
+
+            @return - The matching item, or None if no item matches.
+              If #order_by set a limit, only that many matches (the first in that order) are considered.
+
+            @raises ValueError - If more than one item matches
+        '''
+        (lst, matches) = self._getMatches(lst, useCache)
+        if self._getLimit() is not None:
+            # Two are enough to tell if there is more than one
+            matches = self._applyOrder(lst._getFieldAccessType(), matches, 2)
+
+        return _getOne(matches)
+
+    def _getMatches(self, lst, useCache=None):
+        '''
+            _getMatches - Get the items in #lst which match this query, as an iterable which finds them as it is iterated.
+
+             private method - used by execute, first, exists, and get
+
+             @return tuple<QueryableList, iterable> - #lst (converted to a QueryableListMixed if it was not a QueryableList), and the matches
+        '''
+        (lst, useCache, matchFunc) = self._prepare(lst, useCache)
+
+        return (lst, lst._getMatches(self._parsedFilters, useCache, matchFunc))
+
+    def _prepare(self, lst, useCache=None):
+        '''
+            _prepare - Get what is needed to run this query on #lst
+
+             private method - used by _getMatches and count
+
+             @return tuple<QueryableList, bool, function/None> - #lst (converted to a QueryableListMixed if it was not a QueryableList),
+               whether to use the value cache, and the compiled match function (None when using the cache,
+               as the cache lives in the match function, so a fresh one is compiled for each pass)
         '''
         from . import QueryableListMixed
         if not issubclass(lst.__class__, QueryableListBase):
             lst = QueryableListMixed(lst)
-        filters = copy.copy(self.filters)
-        nextFilter = filters.popleft()
-        while nextFilter:
-            (filterMethod, filterArgs) = nextFilter
-            lst = self._applyFilter(lst, filterMethod, filterArgs)
-            if len(lst) == 0:
-                return lst
-            try:
-                nextFilter = filters.popleft()
-            except:
-                break
-        return lst
+
+        if useCache is None:
+            useCache = lst.USE_CACHED
+
+        if useCache:
+            return (lst, True, None)
+
+        return (lst, False, self._getCompiledFilters(lst._getFieldAccessType()))
+
+    def stream(self, iterable, listType=None, useCache=None):
+        '''
+            stream - Execute this query on any iterable (like a generator), yielding the matches as they are found,
+              without loading the items into a list. Memory use does not grow with the input.
+
+            @param iterable <iterable> - The items to filter. It is only iterated once.
+
+            @param listType <type/None> default None - The QueryableList type whose field access should be used.
+                If None, QueryableListMixed is used (Supports both object-like and dict-like items)
+
+            @param useCache <bool/None> default None - @see execute
+
+            @return <iterator> - The matching items, in order. If an ordering was set with #order_by, the whole of #iterable
+              is read before the first item is returned.
+        '''
+        if listType is None:
+            from . import QueryableListMixed
+            listType = QueryableListMixed
+
+        if useCache is None:
+            useCache = listType.USE_CACHED
+
+        if useCache:
+            matches = _filter( listType._compileLinks(self._parsedFilters, True), iterable )
+        else:
+            matches = _filter( self._getCompiledFilters(listType), iterable )
+
+        if self.orderBy is not None:
+            return iter( self._applyOrder(listType, matches) )
+
+        return matches
 
     def copy(self):
         '''
@@ -97,21 +275,62 @@ class QueryBuilder(object):
         '''
         ret = QueryBuilder()
         ret.filters = copy.copy(self.filters)
+        ret._parsedFilters = self._parsedFilters[:]
+        ret.orderBy = self.orderBy
         return ret
 
-    @staticmethod
-    def _applyFilter(lst, filterMethod, filterArgs):
+    def _getLimit(self):
         '''
-            _applyFilter - Applies the given filter method on a set of args
+            _getLimit - Get the limit set by #order_by, or None if there is none
+
+             private method - used by count, exists, and get
+        '''
+        if self.orderBy is None:
+            return None
+
+        return self.orderBy[2]
+
+    def _applyOrder(self, listType, matches, maxItems=None):
+        '''
+            _applyOrder - Apply the ordering set by #order_by (if any) to the matches
+
+             private method - used by execute, stream, first, and get
+
+             @param listType <type> - The QueryableList type whose field access should be used
+
+             @param maxItems <int/None> - If given, at most this many items are needed
+
+             @return <iterable> - The matches, in order
+        '''
+        if self.orderBy is None:
+            return matches
+
+        (fieldNames, reverse, limit, nullsFirst) = self.orderBy
+        if maxItems is not None and (limit is None or maxItems < limit):
+            limit = maxItems
+
+        return listType._orderItems(matches, fieldNames, reverse, limit, nullsFirst)
+
+    def _getCompiledFilters(self, listType):
+        '''
+            _getCompiledFilters - Gets the chain of this query compiled into one match function for a given QueryableList type.
+
+              The chain is compiled once per type, and reused on every following execute.
 
              private method - used by execute
 
-             @return QueryableList - a QueryableList containing the elements of the resulting filter
+             @param listType <type> - A QueryableList type
+
+             @return <function> - Takes an item, returns True if it matches every link in the chain
         '''
-        if filterMethod == FILTER_METHOD_AND:
-            return lst.filterAnd(**filterArgs)
-        else: # ALready validated in addFIlter that type is AND or OR
-            return lst.filterOr(**filterArgs)
+        try:
+            return self._compiledFilters[listType]
+        except KeyError:
+            pass
+
+        matchFunc = listType._compileLinks(self._parsedFilters)
+        self._compiledFilters[listType] = matchFunc
+        return matchFunc
 
 
 #vim: set ts=4 st=4 sw=4 expandtab
@@ -0,0 +1,475 @@
+# Copyright (c) 2016, 2017 Timothy Savannah under the terms of the GNU Lesser General Public License version 2.1.
+#  You should have received a copy of this as "LICENSE" with this source distribution. The full license is available at https://raw.githubusercontent.com/kata198/QueryableList/master/LICENSE
+'''
+    Compiler - Turns the parsed filters (the output of getFiltersFromArgs) into a single match function
+      which contains only the operations actually requested.
+
+      The match function takes an item and returns True if it matches, otherwise False.
+'''
+
+#vim: set ts=4 st=4 sw=4 expandtab
+
+from .constants import FILTER_EVAL_ORDER, FILTER_METHOD_AND, FIELD_PATH_SEP, STRING_TYPES
+
+# _NO_ITEM - Marks that no item has been seen yet, in cacheFieldValues
+_NO_ITEM = object()
+
+__all__ = ('compileFilters', 'compileLinks', 'cacheFieldValues', 'compileFieldPath', 'isFieldPath')
+
+
+def compileFilters(filters, get_field_getter, filterMethod=FILTER_METHOD_AND, useCache=False):
+    '''
+        compileFilters - Compile parsed filters into a single match function.
+
+            @param filters <dict> - The parsed filters, as returned by getFiltersFromArgs
+
+            @param get_field_getter <function> - Returns the function to fetch a field value off an item, (fieldName) -> ((item) -> value).
+              Usually the _get_field_getter of a QueryableList type.
+
+            @param filterMethod <str> - FILTER_METHOD_AND if all filters must match, FILTER_METHOD_OR if any can match.
+
+            @param useCache <bool> default False - If True, any field used by more than one filter is fetched only once per item.
+              @see compileLinks
+
+        @return <function> - A function which takes an item and returns True if it matches the filters.
+
+          If there are no filters, an AND match function matches everything and an OR match function matches nothing.
+    '''
+    return compileLinks( [ (filterMethod, filters) ], get_field_getter, useCache )
+
+
+def compileLinks(links, get_field_getter, useCache=False):
+    '''
+        compileLinks - Compile a chain of filter links, each applied to the results of the link before it,
+          into a single match function.
+
+            Since every link only narrows the results of the previous one, an item is in the final results
+              if it matches every link, so the whole chain is evaluated in one pass with no intermediate lists.
+
+            @param links list<tuple> - A list of (filterMethod, filters), where filters are as returned by getFiltersFromArgs
+
+            @param get_field_getter <function> - Returns the function to fetch a field value off an item, (fieldName) -> ((item) -> value).
+              Usually the _get_field_getter of a QueryableList type.
+              It is called once per field here, and the matchers call the returned getters directly.
+
+            @param useCache <bool> default False - If True, any field used by more than one filter (in any link) is fetched
+              only once per item, @see cacheFieldValues. Use this when fetching a value is expensive.
+
+              The returned match function then holds state, so compile a new one for each pass over a list.
+
+        @return <function> - A function which takes an item and returns True if it matches every link.
+    '''
+    matchers = []
+
+    cachedFieldNames = None
+    if useCache:
+        cachedFieldNames = _getRepeatedFieldNames(links)
+
+    # fieldGetters - fieldName -> the getter for that field, shared by all the filters (and links) on that field
+    fieldGetters = {}
+    for (filterMethod, filters) in links:
+        linkMatchers = _getMatchers(filters, get_field_getter, fieldGetters, cachedFieldNames)
+        if filterMethod == FILTER_METHOD_AND:
+            # AND links flatten right into the chain
+            matchers += linkMatchers
+        else:
+            matchers.append( _matchAny(linkMatchers) )
+
+    return _matchAll(matchers)
+
+
+def cacheFieldValues(getValue):
+    '''
+        cacheFieldValues - Wrap a field getter so that the value fetched off the most recent item is remembered.
+
+            A match function evaluates one item completely before moving on to the next, so this fetches
+              the field at most once per item per pass, while holding only one value.
+
+            @param getValue <function> - The function to fetch the field value off an item, (item) -> value
+
+        @return <function> - A function with the same signature as #getValue
+    '''
+    last = [ _NO_ITEM, None ]
+
+    def _get_value_cached(item):
+        if last[0] is item:
+            return last[1]
+
+        value = getValue(item)
+        last[0] = item
+        last[1] = value
+        return value
+
+    return _get_value_cached
+
+
+def isFieldPath(fieldName):
+    '''
+        isFieldPath - Check if a field name is a path to a nested field, e.x. "address__city"
+
+          Field names which are not strings (like int dict keys) are never paths.
+    '''
+    if not isinstance(fieldName, STRING_TYPES) or FIELD_PATH_SEP not in fieldName:
+        return False
+
+    # Names like "__class__" are not paths
+    return '' not in fieldName.split(FIELD_PATH_SEP)
+
+
+def compileFieldPath(get_item_value, fieldName, get_field_getter=None):
+    '''
+        compileFieldPath - Get a function which fetches a field off an item. The field may be a path to a nested field, e.x. "address__city".
+
+            The path is split once, here, into a chain of accessors. The first name is fetched with #get_item_value,
+              then each following name is fetched off the value before it: by key if that value is a dict, otherwise by attribute.
+              If any value along the path is None (or missing), the result is None.
+
+            @param get_item_value <function> - The function to fetch a field value off an item, (item, fieldName) -> value
+
+            @param fieldName <str> - The name of the field, or a path of names joined by "__"
+
+            @param get_field_getter <function/None> - If given, used instead of #get_item_value to get the function
+              which fetches the first name, (fieldName) -> ((item) -> value). Usually the _get_field_getter of a QueryableList type.
+
+        @return <function> - A function which takes an item and returns the value of the field
+    '''
+    if not isFieldPath(fieldName):
+        return lambda item : get_item_value(item, fieldName)
+
+    names = fieldName.split(FIELD_PATH_SEP)
+    firstName = names[0]
+    nestedNames = tuple(names[1:])
+
+    if get_field_getter is not None:
+        get_first_value = get_field_getter(firstName)
+    else:
+        get_first_value = lambda item : get_item_value(item, firstName)
+
+    if len(nestedNames) == 1:
+        # The most common path, "a__b", without the loop
+        nestedName = nestedNames[0]
+
+        def _get_path_value(item):
+            value = get_first_value(item)
+            if value is None:
+                return None
+            if isinstance(value, dict):
+                return value.get(nestedName)
+            return getattr(value, nestedName, None)
+
+        return _get_path_value
+
+    def _get_path_value(item):
+        value = get_first_value(item)
+        for name in nestedNames:
+            if value is None:
+                return None
+            if isinstance(value, dict):
+                value = value.get(name)
+            else:
+                value = getattr(value, name, None)
+
+        return value
+
+    return _get_path_value
+
+
+def _getRepeatedFieldNames(links):
+    '''
+        _getRepeatedFieldNames - Get the names of fields which are used by more than one filter across all links.
+    '''
+    seenFieldNames = set()
+    repeatedFieldNames = set()
+    for (filterMethod, filters) in links:
+        for filterType in FILTER_EVAL_ORDER:
+            for fieldName, value in filters[filterType]:
+                if fieldName in seenFieldNames:
+                    repeatedFieldNames.add(fieldName)
+                else:
+                    seenFieldNames.add(fieldName)
+
+    return repeatedFieldNames
+
+
+def _getMatchers(filters, get_field_getter, fieldGetters, cachedFieldNames=None):
+    '''
+        _getMatchers - Get a list of match functions, one for each filter requested.
+
+            The getter for each field is made once, and kept in #fieldGetters (fieldName -> getter).
+              Getters for fields in #cachedFieldNames remember their last value, @see cacheFieldValues
+    '''
+    matchers = []
+
+    # Keep the evaluation order stable, cheap identity tests first, splits last.
+    for filterType in FILTER_EVAL_ORDER:
+        makeMatcher = _MATCHER_MAKERS[filterType]
+        for fieldName, value in filters[filterType]:
+            getValue = fieldGetters.get(fieldName)
+            if getValue is None:
+                getValue = get_field_getter(fieldName)
+                if cachedFieldNames and fieldName in cachedFieldNames:
+                    getValue = cacheFieldValues(getValue)
+                fieldGetters[fieldName] = getValue
+
+            matchers.append( makeMatcher(getValue, value) )
+
+    return matchers
+
+
+def _matchAll(matchers):
+    '''
+        _matchAll - Combine a list of match functions into one, which matches if ALL match.
+    '''
+    numMatchers = len(matchers)
+    if numMatchers == 0:
+        return lambda item : True
+    if numMatchers == 1:
+        return matchers[0]
+    if numMatchers == 2:
+        (matcher1, matcher2) = matchers
+        return lambda item : matcher1(item) and matcher2(item)
+
+    matchers = tuple(matchers)
+    def _matchAll_impl(item):
+        for matcher in matchers:
+            if not matcher(item):
+                return False
+        return True
+
+    return _matchAll_impl
+
+
+def _matchAny(matchers):
+    '''
+        _matchAny - Combine a list of match functions into one, which matches if ANY match.
+    '''
+    numMatchers = len(matchers)
+    if numMatchers == 0:
+        return lambda item : False
+    if numMatchers == 1:
+        return matchers[0]
+    if numMatchers == 2:
+        (matcher1, matcher2) = matchers
+        return lambda item : matcher1(item) or matcher2(item)
+
+    matchers = tuple(matchers)
+    def _matchAny_impl(item):
+        for matcher in matchers:
+            if matcher(item):
+                return True
+        return False
+
+    return _matchAny_impl
+
+
+################################################
+##     Matchers, one per filter type          ##
+################################################
+
+# Each of these takes (getValue, value), where getValue fetches the field off an item, and returns a function
+#   which takes an item and returns True if that single filter matches the item.
+
+def _mk_is(getValue, value):
+    return lambda item : getValue(item) is value
+
+def _mk_isnot(getValue, value):
+    return lambda item : getValue(item) is not value
+
+def _mk_customMatch(getValue, matchFunc):
+    return lambda item : matchFunc(getValue(item))
+
+def _mk_in(getValue, value):
+    return lambda item : getValue(item) in value
+
+def _mk_notin(getValue, value):
+    return lambda item : getValue(item) not in value
+
+def _mk_eq(getValue, value):
+    return lambda item : getValue(item) == value
+
+def _mk_ieq(getValue, value):
+    # Reminder: the "i" filter's values have already been lowercased
+    def _ieq(item):
+        try:
+            return getValue(item).lower() == value
+        except:
+            # If we can't lowercase the item's value, it obviously doesn't match whatever we previously could.
+            return False
+    return _ieq
+
+def _mk_ne(getValue, value):
+    return lambda item : getValue(item) != value
+
+def _mk_ine(getValue, value):
+    def _ine(item):
+        try:
+            return getValue(item).lower() != value
+        except:
+            # If we can't convert the field value to lowercase, it does not equal the other.
+            return True
+    return _ine
+
+def _mk_lt(getValue, value):
+    return lambda item : getValue(item) < value
+
+def _mk_lte(getValue, value):
+    return lambda item : getValue(item) <= value
+
+def _mk_gt(getValue, value):
+    return lambda item : getValue(item) > value
+
+def _mk_gte(getValue, value):
+    return lambda item : getValue(item) >= value
+
+def _mk_contains(getValue, value):
+    def _contains(item):
+        try:
+            return value in getValue(item)
+        except:
+            # If field does not support "in", it does not contain the item.
+            return False
+    return _contains
+
+def _mk_icontains(getValue, value):
+    def _icontains(item):
+        try:
+            return value in getValue(item).lower()
+        except:
+            return False
+    return _icontains
+
+def _mk_notcontains(getValue, value):
+    def _notcontains(item):
+        try:
+            return value not in getValue(item)
+        except:
+            # If field does not support "in", it does not contain the item.
+            return True
+    return _notcontains
+
+def _mk_noticontains(getValue, value):
+    def _noticontains(item):
+        try:
+            return value not in getValue(item).lower()
+        except:
+            return True
+    return _noticontains
+
+def _mk_containsAny(getValue, value):
+    def _containsAny(item):
+        itemValue = getValue(item)
+        if itemValue is None:
+            # None contains nothing, no match
+            return False
+        for maybeContains in value:
+            if maybeContains in itemValue:
+                return True
+        return False
+    return _containsAny
+
+def _mk_notcontainsAny(getValue, value):
+    def _notcontainsAny(item):
+        itemValue = getValue(item)
+        if itemValue is None:
+            # None contains nothing, so this is a match
+            return True
+        for maybeContains in value:
+            if maybeContains in itemValue:
+                return False
+        return True
+    return _notcontainsAny
+
+def _mk_splitcontains(getValue, value):
+    (splitBy, maybeContains) = value
+    def _splitcontains(item):
+        itemValue = getValue(item)
+        if itemValue is None:
+            # Cannot split, no match
+            return False
+        try:
+            return maybeContains in itemValue.split(splitBy)
+        except:
+            # If field does not supprt "in", or cannot be split, it does not contain the item.
+            return False
+    return _splitcontains
+
+def _mk_splitnotcontains(getValue, value):
+    (splitBy, maybeContains) = value
+    def _splitnotcontains(item):
+        itemValue = getValue(item)
+        if itemValue is None:
+            # Cannot split, so does not contain and is a match.
+            return True
+        try:
+            return maybeContains not in itemValue.split(splitBy)
+        except:
+            # If field does not supprt "in", or cannot be split, it does not contain the item and thus matches here.
+            return True
+    return _splitnotcontains
+
+def _mk_splitcontainsAny(getValue, value):
+    (splitBy, maybeContainsLst) = value
+    def _splitcontainsAny(item):
+        itemValue = getValue(item)
+        if itemValue is None:
+            # Cannot split, so it does not contain a match
+            return False
+        try:
+            itemValue = itemValue.split(splitBy)
+        except:
+            # Cannot split, does not match.
+            return False
+        for maybeContains in maybeContainsLst:
+            if maybeContains in itemValue:
+                return True
+        return False
+    return _splitcontainsAny
+
+def _mk_splitnotcontainsAny(getValue, value):
+    (splitBy, maybeContainsLst) = value
+    def _splitnotcontainsAny(item):
+        itemValue = getValue(item)
+        if itemValue is None:
+            # Cannot split, so it must not contain any (and is a match)
+            return True
+        try:
+            itemValue = itemValue.split(splitBy)
+        except:
+            # Cannot split, so must not contain any (and is a match)
+            return True
+        for maybeContains in maybeContainsLst:
+            if maybeContains in itemValue:
+                return False
+        return True
+    return _splitnotcontainsAny
+
+
+# _MATCHER_MAKERS - Map of filter type -> function which creates a matcher for that type
+_MATCHER_MAKERS = {
+    'is' : _mk_is,
+    'isnot' : _mk_isnot,
+    'customMatch' : _mk_customMatch,
+    'in' : _mk_in,
+    'notin' : _mk_notin,
+    'eq' : _mk_eq,
+    'ieq' : _mk_ieq,
+    'ne' : _mk_ne,
+    'ine' : _mk_ine,
+    'lt' : _mk_lt,
+    'lte' : _mk_lte,
+    'gt' : _mk_gt,
+    'gte' : _mk_gte,
+    'contains' : _mk_contains,
+    'icontains' : _mk_icontains,
+    'notcontains' : _mk_notcontains,
+    'noticontains' : _mk_noticontains,
+    'containsAny' : _mk_containsAny,
+    'notcontainsAny' : _mk_notcontainsAny,
+    'splitcontains' : _mk_splitcontains,
+    'splitnotcontains' : _mk_splitnotcontains,
+    'splitcontainsAny' : _mk_splitcontainsAny,
+    'splitnotcontainsAny' : _mk_splitnotcontainsAny,
+}
+
+
+#vim: set ts=4 st=4 sw=4 expandtab
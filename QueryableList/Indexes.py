@@ -0,0 +1,707 @@
+# Copyright (c) 2016, 2017 Timothy Savannah under the terms of the GNU Lesser General Public License version 2.1.
+#  You should have received a copy of this as "LICENSE" with this source distribution. The full license is available at https://raw.githubusercontent.com/kata198/QueryableList/master/LICENSE
+'''
+    Indexes - Indexes on a field of a QueryableList, which can answer some filters without a scan.
+
+      An index is built from the "column" of values for its field (one value per item, in list order),
+        and answers filters with the set of positions (indexes into the list) which match.
+'''
+
+#vim: set ts=4 st=4 sw=4 expandtab
+
+from bisect import bisect_left, bisect_right
+from operator import itemgetter
+
+from .constants import INDEX_TYPE_HASH, INDEX_TYPE_SORTED, INDEX_TYPE_SPLIT, INDEX_TYPE_NGRAM, INDEX_TYPE_LOWERCASE, STRING_TYPES
+
+__all__ = ('FieldIndex', 'HashIndex', 'SortedIndex', 'SplitIndex', 'NgramIndex', 'LowercaseIndex', 'INDEX_CLASSES')
+
+
+class FieldIndex(object):
+    '''
+        FieldIndex - Base class of an index on a single field.
+
+          Implementing classes set #indexType and #filterTypes, and implement #_build and #lookup.
+            They may also implement #estimate, so filters which would match most of the list are left to a scan.
+    '''
+
+    # indexType - One of INDEX_TYPES
+    indexType = None
+
+    # filterTypes - The filter types this index may be able to answer
+    filterTypes = ()
+
+    # exact - True if #lookup returns exactly the matching positions,
+    #   False if it returns candidates which must still be tested against the filter
+    exact = True
+
+    def __init__(self, fieldName):
+        '''
+            __init__ - Create an (unbuilt) index
+
+              @param fieldName <str> - The name of the field to index
+        '''
+        self.fieldName = fieldName
+        self.isBuilt = False
+        self.numItems = 0
+
+    @property
+    def key(self):
+        '''
+            key - The key which identifies this index on a list. Two indexes with the same key are the same index.
+        '''
+        return (self.indexType, self.fieldName)
+
+    def build(self, values):
+        '''
+            build - Build (or rebuild) this index
+
+              @param values list - The value of this index's field for every item, in list order
+        '''
+        self.numItems = len(values)
+        self._build(values)
+        self.isBuilt = True
+
+    def invalidate(self):
+        '''
+            invalidate - Mark this index as out of date (like after the list has been modified),
+              and release the data. It must be built again before use.
+        '''
+        if not self.isBuilt:
+            return
+
+        self.isBuilt = False
+        self.numItems = 0
+        self._clear()
+
+    def _build(self, values):
+        raise NotImplementedError('Index type must implement _build')
+
+    def _clear(self):
+        raise NotImplementedError('Index type must implement _clear')
+
+    def lookup(self, filterType, value):
+        '''
+            lookup - Answer a filter with this index
+
+              @param filterType <str> - The filter type (after parsing, so "isnull" has become "is" or "isnot")
+
+              @param value - The value to filter by (after parsing)
+
+              @return set<int>/None - The positions which match, or None if this index cannot answer this filter.
+                If #exact is False, these are only candidates.
+        '''
+        raise NotImplementedError('Index type must implement lookup')
+
+    def lookupAll(self, filters):
+        '''
+            lookupAll - Answer several AND'd filters on this index's field
+
+              The default calls #lookup for each and intersects the results. Index types which can combine filters
+                (like a range from a "gt" and a "lte") override this.
+
+              @param filters list<tuple> - A list of (filterType, value)
+
+              @return tuple<set<int>/None, list<int>> - The positions which match all the answered filters (or None if none were answered),
+                and the offsets into #filters of the filters which were answered.
+        '''
+        positions = None
+        answered = []
+
+        for i, (filterType, value) in enumerate(filters):
+            found = self.lookup(filterType, value)
+            if found is None:
+                continue
+
+            answered.append(i)
+            if positions is None:
+                positions = found
+            else:
+                positions = positions & found
+
+        return (positions, answered)
+
+    def estimate(self, filterType, value):
+        '''
+            estimate - Cheaply estimate how many positions #lookup would return, without building them
+
+              @return <int/None> - The estimated number of positions, or None if it cannot be estimated cheaply
+        '''
+        return None
+
+    def estimateAll(self, filters):
+        '''
+            estimateAll - Cheaply estimate how many positions #lookupAll would return. @see estimate
+
+              The default is the smallest estimate of any filter, as the filters are AND'd.
+
+              @return <int/None> - The estimated number of positions, or None if none of the filters can be estimated
+        '''
+        ret = None
+        for (filterType, value) in filters:
+            count = self.estimate(filterType, value)
+            if count is not None and (ret is None or count < ret):
+                ret = count
+
+        return ret
+
+
+class HashIndex(FieldIndex):
+    '''
+        HashIndex - Maps each value of a field to the positions of items having that value.
+
+          Answers eq, in, is, and isnot (isnull) filters.
+
+          Values which are not hashable are kept aside, and compared directly on every lookup.
+    '''
+
+    indexType = INDEX_TYPE_HASH
+
+    filterTypes = ('eq', 'in', 'is', 'isnot')
+
+    def __init__(self, fieldName):
+        FieldIndex.__init__(self, fieldName)
+        self._clear()
+
+    def _clear(self):
+        # _positions - value -> list of positions with that value
+        self._positions = {}
+        # _unhashable - list of (position, value) for values which cannot be hashed
+        self._unhashable = []
+        # _values - the column this index was built from, used to check identity
+        self._values = []
+
+    def _build(self, values):
+        self._clear()
+
+        positions = self._positions
+        unhashable = self._unhashable
+
+        for i, value in enumerate(values):
+            try:
+                positions[value].append(i)
+            except KeyError:
+                positions[value] = [i]
+            except TypeError:
+                unhashable.append( (i, value) )
+
+        self._values = values
+
+    def _getEqual(self, value):
+        '''
+            _getEqual - Get a set of positions whose value equals #value
+
+              @raises TypeError if #value cannot be hashed
+        '''
+        ret = set(self._positions.get(value, ()))
+        for (i, itemValue) in self._unhashable:
+            if itemValue == value:
+                ret.add(i)
+        return ret
+
+    def lookup(self, filterType, value):
+
+        try:
+            if filterType == 'eq':
+                return self._getEqual(value)
+
+            if filterType == 'in':
+                if not isinstance(value, (set, frozenset)):
+                    # Could be any object implementing "in", which we cannot enumerate
+                    return None
+
+                ret = set()
+                positions = self._positions
+                for maybeValue in value:
+                    ret.update( positions.get(maybeValue, ()) )
+                for (i, itemValue) in self._unhashable:
+                    if itemValue in value:
+                        ret.add(i)
+                return ret
+
+            # "is" is a subset of "eq", then check identity
+            values = self._values
+            isPositions = set([ i for i in self._getEqual(value) if values[i] is value ])
+
+            if filterType == 'is':
+                return isPositions
+
+            # isnot
+            return set(range(self.numItems)) - isPositions
+
+        except TypeError:
+            # Unhashable value given, let a scan handle it.
+            return None
+
+    def estimate(self, filterType, value):
+        positions = self._positions
+
+        try:
+            if filterType == 'in':
+                if not isinstance(value, (set, frozenset)):
+                    return None
+                count = sum( [ len(positions.get(maybeValue, ())) for maybeValue in value ] )
+            else:
+                count = len(positions.get(value, ()))
+        except TypeError:
+            return None
+
+        if filterType == 'isnot':
+            return self.numItems - count
+
+        return count + len(self._unhashable)
+
+
+class SortedIndex(FieldIndex):
+    '''
+        SortedIndex - Keeps the values of a field in order, with their positions, to find a range by bisection.
+
+          Answers lt, lte, gt, and gte filters. Several of these on the same field (in an AND) are answered as a single range.
+
+          Items whose value is None are not in the index, and never match a filter answered by it.
+
+          All other values must be comparable with eachother, or building the index raises ValueError.
+    '''
+
+    indexType = INDEX_TYPE_SORTED
+
+    filterTypes = ('lt', 'lte', 'gt', 'gte')
+
+    def __init__(self, fieldName):
+        FieldIndex.__init__(self, fieldName)
+        self._clear()
+
+    def _clear(self):
+        # _keys - the non-None values, in order
+        self._keys = []
+        # _positions - the position of each value in #_keys
+        self._positions = []
+
+    def _build(self, values):
+        self._clear()
+
+        pairs = [ (value, i) for i, value in enumerate(values) if value is not None ]
+        try:
+            # Sort on value alone, so equal values keep list order and the positions are never compared
+            pairs.sort(key=itemgetter(0))
+        except TypeError as e:
+            raise ValueError('Cannot create a sorted index on field "%s", values cannot be compared: %s' %(self.fieldName, str(e)))
+
+        self._keys = [ pair[0] for pair in pairs ]
+        self._positions = [ pair[1] for pair in pairs ]
+
+    def lookup(self, filterType, value):
+        (positions, answered) = self.lookupAll( [ (filterType, value) ] )
+        return positions
+
+    def _getRange(self, filters):
+        '''
+            _getRange - Find the range of #_keys which matches the filters this index can answer
+
+              @return tuple<int, int, list<int>> - (lo, hi, offsets into #filters of the filters which were answered)
+        '''
+        keys = self._keys
+
+        lo = 0
+        hi = len(keys)
+        answered = []
+
+        for i, (filterType, value) in enumerate(filters):
+            if filterType not in self.filterTypes:
+                continue
+
+            try:
+                if filterType == 'lt':
+                    hi = min(hi, bisect_left(keys, value))
+                elif filterType == 'lte':
+                    hi = min(hi, bisect_right(keys, value))
+                elif filterType == 'gt':
+                    lo = max(lo, bisect_right(keys, value))
+                else:
+                    # gte
+                    lo = max(lo, bisect_left(keys, value))
+            except TypeError:
+                # Value cannot be compared with the indexed values, let a scan handle it.
+                continue
+
+            answered.append(i)
+
+        return (lo, hi, answered)
+
+    def lookupAll(self, filters):
+        (lo, hi, answered) = self._getRange(filters)
+
+        if not answered:
+            return (None, answered)
+
+        if lo >= hi:
+            return (set(), answered)
+
+        return (set(self._positions[lo:hi]), answered)
+
+    def estimateAll(self, filters):
+        if len(self._keys) != self.numItems:
+            # A scan compares None values rather than skipping them, so always use this index to keep the same results
+            return None
+
+        (lo, hi, answered) = self._getRange(filters)
+
+        if not answered:
+            return None
+
+        return max(0, hi - lo)
+
+
+class SplitIndex(FieldIndex):
+    '''
+        SplitIndex - Maps each token of a field (split by a separator) to the positions of items containing that token.
+
+          Answers splitcontains, splitnotcontains, splitcontainsAny, and splitnotcontainsAny filters which use the same separator.
+
+          Items whose value is None, or cannot be split, are treated as they are in a scan:
+            they match the "not" filters, and nothing else.
+    '''
+
+    indexType = INDEX_TYPE_SPLIT
+
+    filterTypes = ('splitcontains', 'splitnotcontains', 'splitcontainsAny', 'splitnotcontainsAny')
+
+    def __init__(self, fieldName, splitBy=None):
+        '''
+            __init__ - Create an (unbuilt) index
+
+              @param fieldName <str> - The name of the field to index
+
+              @param splitBy <str/None> - The separator to split by. None splits on whitespace (like str.split)
+        '''
+        FieldIndex.__init__(self, fieldName)
+        self.splitBy = splitBy
+        self._clear()
+
+    @property
+    def key(self):
+        return (self.indexType, self.fieldName, self.splitBy)
+
+    def _clear(self):
+        # _positions - token -> list of positions containing that token
+        self._positions = {}
+        # _unhashable - list of (position, tokens) for items with a token which cannot be hashed
+        self._unhashable = []
+
+    def _build(self, values):
+        self._clear()
+
+        splitBy = self.splitBy
+        positions = self._positions
+        unhashable = self._unhashable
+
+        for i, value in enumerate(values):
+            if value is None:
+                continue
+            try:
+                tokens = value.split(splitBy)
+            except:
+                # Cannot split, does not contain any token.
+                continue
+
+            try:
+                for token in tokens:
+                    tokenPositions = positions.get(token)
+                    if tokenPositions is None:
+                        positions[token] = [i]
+                    elif tokenPositions[-1] != i:
+                        # Only once per item, even if the token repeats
+                        tokenPositions.append(i)
+            except TypeError:
+                unhashable.append( (i, tokens) )
+
+    def _getContaining(self, maybeContains):
+        '''
+            _getContaining - Get a set of positions whose tokens contain #maybeContains
+
+              @raises TypeError if #maybeContains cannot be hashed
+        '''
+        ret = set(self._positions.get(maybeContains, ()))
+        for (i, tokens) in self._unhashable:
+            if maybeContains in tokens:
+                ret.add(i)
+        return ret
+
+    def lookup(self, filterType, value):
+        (splitBy, maybeContains) = value
+        if splitBy != self.splitBy:
+            return None
+
+        try:
+            if filterType in ('splitcontains', 'splitnotcontains'):
+                ret = self._getContaining(maybeContains)
+            else:
+                ret = set()
+                for oneMaybeContains in maybeContains:
+                    ret |= self._getContaining(oneMaybeContains)
+
+        except TypeError:
+            # Unhashable value given, let a scan handle it.
+            return None
+
+        if filterType in ('splitnotcontains', 'splitnotcontainsAny'):
+            return set(range(self.numItems)) - ret
+
+        return ret
+
+    def estimate(self, filterType, value):
+        (splitBy, maybeContains) = value
+        if splitBy != self.splitBy:
+            return None
+
+        positions = self._positions
+        try:
+            if filterType in ('splitcontains', 'splitnotcontains'):
+                count = len(positions.get(maybeContains, ()))
+            else:
+                count = sum( [ len(positions.get(oneMaybeContains, ())) for oneMaybeContains in maybeContains ] )
+        except TypeError:
+            return None
+
+        if filterType in ('splitnotcontains', 'splitnotcontainsAny'):
+            return max(0, self.numItems - count - len(self._unhashable))
+
+        return count + len(self._unhashable)
+
+
+class NgramIndex(FieldIndex):
+    '''
+        NgramIndex - Maps each n-gram (substring of #ngramLength characters) of a string field to the positions of items containing it.
+
+          Answers contains, icontains, notcontains, and noticontains filters with a string of at least #ngramLength characters.
+            The items having every n-gram of the filter value are candidates, which are then checked for the whole value.
+
+          Values which are not strings (like lists) are checked directly on every lookup. The lowercase n-grams used by
+            icontains and noticontains are only built the first time they are needed.
+    '''
+
+    indexType = INDEX_TYPE_NGRAM
+
+    filterTypes = ('contains', 'icontains', 'notcontains', 'noticontains')
+
+    # ngramLength - The length of each n-gram. Shorter filter values are not answered by this index.
+    ngramLength = 3
+
+    def __init__(self, fieldName):
+        FieldIndex.__init__(self, fieldName)
+        self._clear()
+
+    def _clear(self):
+        # _values - the column this index was built from
+        self._values = []
+        # _grams - n-gram -> list of positions of strings containing it
+        self._grams = {}
+        # _lowerValues / _lowerGrams - the same for the lowercased strings, None until first needed
+        self._lowerValues = None
+        self._lowerGrams = None
+        # _others - positions of values which are not strings (and not None), checked directly
+        self._others = []
+
+    def _build(self, values):
+        self._clear()
+
+        self._values = values
+        self._grams = self._buildGrams(values)
+        self._others = [ i for i, value in enumerate(values) if value is not None and not isinstance(value, STRING_TYPES) ]
+
+    def _buildGrams(self, values):
+        '''
+            _buildGrams - Build a map of n-gram -> positions of the strings in #values containing it
+        '''
+        n = self.ngramLength
+        grams = {}
+
+        for i, value in enumerate(values):
+            if not isinstance(value, STRING_TYPES):
+                continue
+
+            for gram in set( [ value[j:j+n] for j in range(len(value) - n + 1) ] ):
+                try:
+                    grams[gram].append(i)
+                except KeyError:
+                    grams[gram] = [i]
+
+        return grams
+
+    def _getGrams(self, lower):
+        '''
+            _getGrams - Get the n-grams and the strings they were built from
+
+              @param lower <bool> - If True, the lowercase n-grams and strings (built now if this is the first time they are needed)
+
+              @return tuple<dict, list> - (n-gram -> positions, strings)
+        '''
+        if lower:
+            if self._lowerGrams is None:
+                self._lowerValues = [ itemValue.lower() if isinstance(itemValue, STRING_TYPES) else None for itemValue in self._values ]
+                self._lowerGrams = self._buildGrams(self._lowerValues)
+            return (self._lowerGrams, self._lowerValues)
+
+        return (self._grams, self._values)
+
+    def _getGramPositions(self, grams, value):
+        '''
+            _getGramPositions - Get the list of positions for each n-gram of #value
+        '''
+        n = self.ngramLength
+        return [ grams.get(value[j:j+n], ()) for j in range(len(value) - n + 1) ]
+
+    def _getContaining(self, value, lower):
+        '''
+            _getContaining - Get a set of positions whose value contains #value
+
+              @param lower <bool> - If True, check the lowercased values (#value should already be lowercase)
+        '''
+        (grams, strings) = self._getGrams(lower)
+
+        gramPositions = sorted( self._getGramPositions(grams, value), key=len )
+
+        candidates = set(gramPositions[0])
+        for positions in gramPositions[1:]:
+            if not candidates:
+                break
+            candidates.intersection_update(positions)
+
+        ret = set( [ i for i in candidates if value in strings[i] ] )
+
+        values = self._values
+        for i in self._others:
+            try:
+                itemValue = values[i]
+                if lower:
+                    itemValue = itemValue.lower()
+                if value in itemValue:
+                    ret.add(i)
+            except:
+                # Same as a scan, if field does not support "in", it does not contain the item.
+                pass
+
+        return ret
+
+    def lookup(self, filterType, value):
+        if not isinstance(value, STRING_TYPES) or len(value) < self.ngramLength:
+            return None
+
+        ret = self._getContaining(value, filterType in ('icontains', 'noticontains'))
+
+        if filterType in ('notcontains', 'noticontains'):
+            return set(range(self.numItems)) - ret
+
+        return ret
+
+    def estimate(self, filterType, value):
+        if not isinstance(value, STRING_TYPES) or len(value) < self.ngramLength:
+            return None
+
+        (grams, strings) = self._getGrams(filterType in ('icontains', 'noticontains'))
+
+        # Only the items having the rarest n-gram could contain #value
+        count = min( [ len(positions) for positions in self._getGramPositions(grams, value) ] ) + len(self._others)
+
+        if filterType in ('notcontains', 'noticontains'):
+            return max(0, self.numItems - count)
+
+        return count
+
+
+class LowercaseIndex(FieldIndex):
+    '''
+        LowercaseIndex - Keeps the lowercase value of a field for every item, so case-insensitive filters
+          do not fetch and lowercase every value again on each query.
+
+          Answers ieq, ine, icontains, and noticontains. Each lookup still checks every value, but only with a
+            comparison against the kept lowercase value.
+
+          Values which cannot be lowercased (like None) are treated as they are in a scan:
+            they match ine and noticontains, and nothing else.
+
+          Unlike the other indexes, it is used even for a filter which matches most of the list (usually ine and noticontains),
+            as the scan it would be left to lowercases every value again. @see estimate
+    '''
+
+    indexType = INDEX_TYPE_LOWERCASE
+
+    filterTypes = ('ieq', 'ine', 'icontains', 'noticontains')
+
+    def __init__(self, fieldName):
+        FieldIndex.__init__(self, fieldName)
+        self._clear()
+
+    def _clear(self):
+        # _lowerValues - the lowercase value for each position, or None if it could not be lowercased
+        self._lowerValues = []
+        # _noLower - positions whose value could not be lowercased
+        self._noLower = set()
+
+    def _build(self, values):
+        self._clear()
+
+        lowerValues = self._lowerValues
+        noLower = self._noLower
+
+        for i, value in enumerate(values):
+            try:
+                lowerValues.append( value.lower() )
+            except:
+                lowerValues.append( None )
+                noLower.add(i)
+
+    def _getContaining(self, value):
+        '''
+            _getContaining - Get a set of positions whose lowercase value contains #value
+        '''
+        ret = set()
+        for i, lowerValue in enumerate(self._lowerValues):
+            try:
+                if value in lowerValue:
+                    ret.add(i)
+            except:
+                # Same as a scan, if field does not support "in", it does not contain the item.
+                pass
+
+        return ret
+
+    def lookup(self, filterType, value):
+        lowerValues = self._lowerValues
+
+        if filterType == 'ieq':
+            return set( [ i for i, lowerValue in enumerate(lowerValues) if lowerValue == value ] ) - self._noLower
+
+        if filterType == 'ine':
+            # Built directly rather than as the complement of ieq, as it usually matches most of the list
+            noLower = self._noLower
+            return set( [ i for i, lowerValue in enumerate(lowerValues) if lowerValue != value or i in noLower ] )
+
+        if filterType == 'icontains':
+            return self._getContaining(value)
+
+        # noticontains - Also built directly, in one pass, unless some lowercase value does not support "in"
+        try:
+            return set( [ i for i, lowerValue in enumerate(lowerValues) if lowerValue is None or value not in lowerValue ] )
+        except TypeError:
+            return set(range(self.numItems)) - self._getContaining(value)
+
+    def estimate(self, filterType, value):
+        if filterType == 'ieq':
+            return self._lowerValues.count(value)
+
+        # ine and noticontains usually match most of the list, but are not estimated,
+        #   so they are still answered here rather than by a scan which lowercases every value
+        return None
+
+
+# INDEX_CLASSES - Map of index type -> the class which implements it
+INDEX_CLASSES = {
+    INDEX_TYPE_HASH : HashIndex,
+    INDEX_TYPE_SORTED : SortedIndex,
+    INDEX_TYPE_SPLIT : SplitIndex,
+    INDEX_TYPE_NGRAM : NgramIndex,
+    INDEX_TYPE_LOWERCASE : LowercaseIndex,
+}
+
+#vim: set ts=4 st=4 sw=4 expandtab
@@ -0,0 +1,129 @@
+# Copyright (c) 2016, 2017 Timothy Savannah under the terms of the GNU Lesser General Public License version 2.1.
+#  You should have received a copy of this as "LICENSE" with this source distribution.
+#  The full license is available at https://raw.githubusercontent.com/kata198/QueryableList/master/LICENSE
+'''
+    QuerySet - Provides "QuerySet", a lazy query bound to a QueryableList, returned by QueryableList.lazy()
+
+'''
+
+#vim: set ts=4 st=4 sw=4 expandtab
+
+from .Builder import QueryBuilder
+
+from .constants import FILTER_METHOD_AND, FILTER_METHOD_OR
+
+__all__ = ('QuerySet', )
+
+
+class QuerySet(object):
+    '''
+        QuerySet - A lazy query on a QueryableList.
+
+            filter/filterAnd/filterOr and sort_by do not run right away, they return a new QuerySet with that step added.
+              The query runs the first time the results are needed (iterating, indexing, len, etc), with all the filters
+              fused into a single pass over the list, and the results are kept for later use.
+
+            The contents of the list at that time are used, so items added to the list after creating the QuerySet
+              (but before the results are needed) are included.
+    '''
+
+    def __init__(self, lst, query=None, sortBy=None):
+        '''
+            __init__ - Create a QuerySet. Use QueryableList.lazy() rather than calling this directly.
+
+              @param lst <QueryableList> - The list to query
+
+              @param query <QueryBuilder/None> - The filters to apply. None for no filters.
+
+              @param sortBy list<tuple>/None - A list of (fieldNames, kwargs) to sort the results by, in order. @see sort_by
+        '''
+        self.lst = lst
+        self.query = query or QueryBuilder()
+        self.sortBy = list(sortBy or [])
+
+        self._results = None
+
+    def filterAnd(self, **kwargs):
+        '''
+            filter/filterAnd - Add a filter where all the provided filters must match. @see QueryableListBase.filterAnd
+
+              @return <QuerySet> - A new QuerySet, with this filter added
+        '''
+        return self._addFilter(FILTER_METHOD_AND, **kwargs)
+
+    filter = filterAnd
+
+    def filterOr(self, **kwargs):
+        '''
+            filterOr - Add a filter where any of the provided filters can match. @see QueryableListBase.filterOr
+
+              @return <QuerySet> - A new QuerySet, with this filter added
+        '''
+        return self._addFilter(FILTER_METHOD_OR, **kwargs)
+
+    def sort_by(self, *fieldNames, **kwargs):
+        '''
+            sort_by - Sort the results by the given field(s). Takes the same arguments as QueryableListBase.sort_by
+
+              Filters are applied before sorting, no matter the order they were added in.
+
+              @return <QuerySet> - A new QuerySet, with this sort added
+        '''
+        return self.__class__(self.lst, self.query.copy(), self.sortBy + [ (fieldNames, kwargs) ])
+
+    def _addFilter(self, filterMethod, **kwargs):
+        query = self.query.copy()
+        query.addFilter(filterMethod, **kwargs)
+
+        return self.__class__(self.lst, query, self.sortBy)
+
+    def all(self):
+        '''
+            all - Run the query (if it has not yet run)
+
+              @return <QueryableList> - A copy of the results, of the same type as the queried list
+        '''
+        return self._getResults().all()
+
+    def count(self):
+        '''
+            count - Returns the number of results
+        '''
+        return len(self._getResults())
+
+    def _getResults(self):
+        '''
+            _getResults - Run the query if it has not yet run, and return the results
+        '''
+        if self._results is None:
+            results = self.query.execute(self.lst)
+
+            for (fieldNames, kwargs) in self.sortBy:
+                results = results.sort_by(*fieldNames, **kwargs)
+
+            self._results = results
+
+        return self._results
+
+    def __iter__(self):
+        return iter(self._getResults())
+
+    def __len__(self):
+        return len(self._getResults())
+
+    def __getitem__(self, idx):
+        return self._getResults()[idx]
+
+    def __contains__(self, item):
+        return item in self._getResults()
+
+    def __bool__(self):
+        return bool(self._getResults())
+
+    __nonzero__ = __bool__
+
+    def __repr__(self):
+        return '%s(%s)' %(self.__class__.__name__, repr(list(self._getResults())))
+
+
+#vim: set ts=4 st=4 sw=4 expandtab
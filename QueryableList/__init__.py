@@ -23,16 +23,102 @@
       Now you support ALL the operations available in QueryableList, acting on your objects!
 '''
 
-__all__ = ('FILTER_TYPES', 'FILTER_METHOD_OR', 'FILTER_METHOD_OR', 'FILTER_METHODS', 'QueryableListObjs', 'QueryableListDicts', 'QueryableListBase', 'QueryableListMixed', 'QueryBuilder')
+__all__ = ('FILTER_TYPES', 'FILTER_METHOD_OR', 'FILTER_METHOD_OR', 'FILTER_METHODS', 'QueryableListObjs', 'QueryableListDicts', 'QueryableListBase', 'QueryableListMixed', 'QueryableListTuples', 'QueryBuilder', 'QuerySet', 'INDEX_TYPE_HASH', 'INDEX_TYPE_SORTED', 'INDEX_TYPE_SPLIT', 'INDEX_TYPE_NGRAM', 'INDEX_TYPE_LOWERCASE', 'INDEX_TYPES', 'AGGREGATE_TYPES', 'JOIN_INNER', 'JOIN_LEFT', 'JOIN_TYPES', 'FIELD_PATH_SEP')
 
 __version__ = '3.1.0'
 __version_tuple__ = (3, 1, 0)
 
 
+from operator import attrgetter, itemgetter
+from weakref import WeakKeyDictionary
+
 from .constants import FILTER_TYPES, FILTER_METHODS, FILTER_METHOD_OR, FILTER_METHOD_OR
+from .constants import INDEX_TYPE_HASH, INDEX_TYPE_SORTED, INDEX_TYPE_SPLIT, INDEX_TYPE_NGRAM, INDEX_TYPE_LOWERCASE, INDEX_TYPES
+from .constants import AGGREGATE_TYPES, JOIN_INNER, JOIN_LEFT, JOIN_TYPES
+from .constants import FIELD_PATH_SEP
 
 from .Base import QueryableListBase
 from .Builder import QueryBuilder
+from .QuerySet import QuerySet
+
+try:
+    from types import InstanceType as _InstanceType
+except ImportError:
+    # Python 3, no old-style classes
+    _InstanceType = None
+
+# _DICT_LIKE_TYPES - Type of item -> whether items of that type are dict-like (have __getitem__), @see _isDictLike
+#   Weak keys, so types which are no longer used (like classes created at runtime) can be freed.
+_DICT_LIKE_TYPES = WeakKeyDictionary()
+
+def _isDictLike(item):
+    '''
+        _isDictLike - Check if an item is dict-like (has __getitem__). The answer is remembered for the type of the item.
+    '''
+    itemType = type(item)
+    try:
+        return _DICT_LIKE_TYPES[itemType]
+    except KeyError:
+        isDictLike = hasattr(item, '__getitem__')
+        if itemType is not _InstanceType:
+            # Python 2 old-style class instances all share one type, so those are checked every time
+            _DICT_LIKE_TYPES[itemType] = isDictLike
+        return isDictLike
+
+def _getAttrColumn(items, fieldName):
+    '''
+        _getAttrColumn - Get the value of an attribute on every item (None where it is missing), calling getattr directly
+    '''
+    return [ getattr(item, fieldName, None) for item in items ]
+
+def _getFieldIndexes(fields):
+    '''
+        _getFieldIndexes - Convert a QueryableListTuples schema into a dict of field name -> position
+
+          @param fields <list/tuple/dict> - A sequence of field names in order, or a dict of field name -> position
+
+          @raises ValueError - If there is no schema, or a position is not an int
+    '''
+    if fields is None:
+        raise ValueError('QueryableListTuples requires a schema. Set FIELDS on a subclass, or use QueryableListTuples.with_fields(..)')
+
+    if isinstance(fields, dict):
+        fieldIndexes = dict(fields)
+    else:
+        fieldIndexes = dict( [ (fieldName, index) for (index, fieldName) in enumerate(fields) ] )
+
+    for (fieldName, index) in fieldIndexes.items():
+        if type(index) is not int:
+            raise ValueError('QueryableListTuples field %s has position %s, but positions must be ints.' %(repr(fieldName), repr(index)))
+
+    return fieldIndexes
+
+def _getBulkGetter(getter, numFields, missingException, fallback):
+    '''
+        _getBulkGetter - Wrap an operator.attrgetter/itemgetter as a _get_fields_getter function
+
+          @param getter <operator.attrgetter/operator.itemgetter> - The getter for all the fields
+
+          @param numFields <int> - The number of fields #getter fetches. With one, the getter returns the value alone, not in a tuple.
+
+          @param missingException <Exception type> - The exception #getter raises when a field is missing
+
+          @param fallback <function> - Used for an item which is missing a field
+    '''
+    if numFields == 1:
+        def get_fields(item):
+            try:
+                return (getter(item), )
+            except missingException:
+                return fallback(item)
+    else:
+        def get_fields(item):
+            try:
+                return getter(item)
+            except missingException:
+                return fallback(item)
+
+    return get_fields
 
 
 class QueryableListObjs(QueryableListBase):
@@ -53,6 +139,64 @@ class QueryableListObjs(QueryableListBase):
         '''
         return getattr(item, fieldName, None)
 
+    @classmethod
+    def _get_field_getter(cls, fieldName):
+        '''
+            _get_field_getter - Returns a function which fetches an attribute off an item, using operator.attrgetter
+
+              This skips calling _get_item_value for every item. @see QueryableListBase._get_field_getter
+
+                @param fieldName <str> - The name of the field to fetch
+
+            @return <function> - A function (item) -> value of #fieldName on that item, or None if it has no such attribute
+        '''
+        if cls._get_item_value is not QueryableListObjs._get_item_value or '.' in fieldName or cls._isFieldPath(fieldName):
+            # Values are fetched differently on this subclass, attrgetter would follow a dotted name, or this is a path to a nested field
+            return super(QueryableListObjs, cls)._get_field_getter(fieldName)
+
+        getter = attrgetter(fieldName)
+
+        def get_value(item):
+            try:
+                return getter(item)
+            except AttributeError:
+                return None
+
+        return get_value
+
+    def _get_column(self, fieldName):
+        '''
+            _get_column - Returns the value of a field for every item in this list, in order, using getattr directly (no Python call per item)
+
+                @param fieldName <str> - The name of the field to fetch
+
+            @return list - The values, one per item (None where an item has no such attribute)
+        '''
+        if self._get_item_value is not QueryableListObjs._get_item_value or self._isFieldPath(fieldName):
+            return super(QueryableListObjs, self)._get_column(fieldName)
+
+        return _getAttrColumn(self, fieldName)
+
+    @classmethod
+    def _get_fields_getter(cls, fieldNames):
+        '''
+            _get_fields_getter - Returns a function which fetches several attributes off an item at once, using operator.attrgetter
+
+              If an item is missing any of the attributes, they are fetched one at a time (with None for the missing ones).
+
+                @param fieldNames list<str> - The names of the fields to fetch
+
+            @return <function> - A function (item) -> tuple of the values of #fieldNames on that item, in order
+        '''
+        fieldNames = tuple(fieldNames)
+        fallback = super(QueryableListObjs, cls)._get_fields_getter(fieldNames)
+
+        if cls._get_item_value is not QueryableListObjs._get_item_value or [ fieldName for fieldName in fieldNames if '.' in fieldName or cls._isFieldPath(fieldName) ]:
+            # Values are fetched differently on this subclass, attrgetter would follow a dotted name, or there is a path to a nested field
+            return fallback
+
+        return _getBulkGetter(attrgetter(*fieldNames), len(fieldNames), AttributeError, fallback)
+
 
 class QueryableListDicts(QueryableListBase):
     '''
@@ -75,14 +219,200 @@ class QueryableListDicts(QueryableListBase):
             return item[fieldName]
         return None
 
+    @classmethod
+    def _get_field_getter(cls, fieldName):
+        '''
+            _get_field_getter - Returns a function which fetches a key off an item, with a single lookup for plain dicts
+
+              This skips calling _get_item_value (which checks "in" and then fetches) for every item. @see QueryableListBase._get_field_getter
+
+                @param fieldName <str> - The name of the field to fetch
+
+            @return <function> - A function (item) -> value of #fieldName on that item, or None if it has no such key
+        '''
+        if cls._get_item_value is not QueryableListDicts._get_item_value or cls._isFieldPath(fieldName):
+            # Values are fetched differently on this subclass, or this is a path to a nested field
+            return super(QueryableListDicts, cls)._get_field_getter(fieldName)
+
+        get_item_value = QueryableListDicts._get_item_value
+
+        def get_value(item):
+            if type(item) is dict:
+                return item.get(fieldName)
+            # Subclasses of dict (like defaultdict) and other types may handle a missing key differently, check with "in" first
+            return get_item_value(item, fieldName)
+
+        return get_value
+
+    @classmethod
+    def _get_fields_getter(cls, fieldNames):
+        '''
+            _get_fields_getter - Returns a function which fetches several keys off an item at once, using operator.itemgetter for plain dicts
+
+              If an item is missing any of the keys, or is not a plain dict (like a defaultdict), they are fetched one at a time
+                (with None for the missing ones), the same as _get_field_getter.
+
+                @param fieldNames list<str> - The names of the fields to fetch
+
+            @return <function> - A function (item) -> tuple of the values of #fieldNames on that item, in order
+        '''
+        fieldNames = tuple(fieldNames)
+        fallback = super(QueryableListDicts, cls)._get_fields_getter(fieldNames)
+
+        if cls._get_item_value is not QueryableListDicts._get_item_value or [ fieldName for fieldName in fieldNames if cls._isFieldPath(fieldName) ]:
+            # Values are fetched differently on this subclass, or there is a path to a nested field
+            return fallback
+
+        bulkGetter = _getBulkGetter(itemgetter(*fieldNames), len(fieldNames), KeyError, fallback)
+
+        def get_fields(item):
+            if type(item) is dict:
+                return bulkGetter(item)
+            # Subclasses of dict (like defaultdict) may add or compute a missing key on access, check with "in" first
+            return fallback(item)
+
+        return get_fields
+
+
+class QueryableListTuples(QueryableListBase):
+    '''
+        QueryableListTuples - QueryableList where each item is a tuple (or namedtuple, list, or any row supporting positional access),
+          with the fields at positions given by a schema.
+
+            Set FIELDS on a subclass, or use QueryableListTuples.with_fields(..) to create one:
+
+              Rows = QueryableListTuples.with_fields( ('id', 'name', 'age') )
+              rows = Rows( cursor.fetchall() )
+              adults = rows.filter(age__gte=18)
+
+            Fields are read by position with operator.itemgetter, so filtering, sorting, and values/values_list
+              never convert the rows to dicts or objects, and never go through attribute access.
+              Every row must be long enough to hold all the fields.
+    '''
+
+    # FIELDS - The schema. Either a sequence of field names, in the order they appear in each row,
+    #   or a dict of field name -> position in each row. Fields not in the schema are None.
+    FIELDS = None
+
+    @classmethod
+    def with_fields(cls, fields, name=None):
+        '''
+            with_fields - Create a QueryableListTuples type for a schema
+
+                @param fields <list/tuple/dict/namedtuple type> - A sequence of field names, in the order they appear in each row,
+                  or a dict of field name -> position in each row, or a namedtuple type (its fields are used)
+
+                @param name <str/None> - The name of the new type. Defaults to the name of this type.
+
+            @return <type> - A subclass of this type with FIELDS set, e.x. Rows = QueryableListTuples.with_fields(('id', 'name'))
+        '''
+        fields = getattr(fields, '_fields', fields)
+        _getFieldIndexes(fields)
+
+        return type(name or cls.__name__, (cls, ), { 'FIELDS' : fields })
+
+    @classmethod
+    def _getFieldIndexes(cls):
+        '''
+            _getFieldIndexes - Get the schema of this type as a dict of field name -> position
+        '''
+        cached = cls.__dict__.get('_fieldIndexesCache')
+        if cached is not None and cached[0] is cls.FIELDS:
+            return cached[1]
+
+        fieldIndexes = _getFieldIndexes(cls.FIELDS)
+        cls._fieldIndexesCache = (cls.FIELDS, fieldIndexes)
+
+        return fieldIndexes
+
+    @classmethod
+    def _get_item_value(cls, item, fieldName):
+        '''
+            _get_item_value - Returns the value of a given field on #item, from the position given by the schema (FIELDS)
+
+                @param item <tuple/???> - The item that needs a value fetched off it. items must support positional access (__getitem__ with an int)
+                @param fieldName <str> - The name of the field on that item which is being requested
+
+            @return - The value at the position of #fieldName in #item, or None if #fieldName is not in the schema
+        '''
+        index = cls._getFieldIndexes().get(fieldName)
+        if index is None:
+            return None
+
+        return item[index]
+
+    @classmethod
+    def _isOwnAccess(cls):
+        '''
+            _isOwnAccess - Check that this type fetches values with the QueryableListTuples _get_item_value (not one of a subclass)
+        '''
+        return getattr(cls._get_item_value, '__func__', None) is QueryableListTuples._get_item_value.__func__
+
+    @classmethod
+    def _isFieldPath(cls, fieldName):
+        '''
+            _isFieldPath - Check if a field name is a path to a nested field. Names in the schema are always fields themselves.
+        '''
+        return fieldName not in cls._getFieldIndexes() and super(QueryableListTuples, cls)._isFieldPath(fieldName)
+
+    @classmethod
+    def _get_field_getter(cls, fieldName):
+        '''
+            _get_field_getter - Returns an operator.itemgetter for the position of a field
+
+                @param fieldName <str> - The name of the field to fetch
+
+            @return <function> - A function (item) -> value of #fieldName on that item
+        '''
+        if not cls._isOwnAccess() or cls._isFieldPath(fieldName):
+            # Values are fetched differently on this subclass, or this is a path to a nested field
+            return super(QueryableListTuples, cls)._get_field_getter(fieldName)
+
+        index = cls._getFieldIndexes().get(fieldName)
+        if index is None:
+            return lambda item : None
+
+        return itemgetter(index)
+
+    @classmethod
+    def _get_fields_getter(cls, fieldNames):
+        '''
+            _get_fields_getter - Returns a function which fetches several fields off an item at once, using one operator.itemgetter
+
+                @param fieldNames list<str> - The names of the fields to fetch
+
+            @return <function> - A function (item) -> tuple of the values of #fieldNames on that item, in order
+        '''
+        fieldNames = tuple(fieldNames)
+        fieldIndexes = cls._getFieldIndexes()
+
+        if not cls._isOwnAccess() or [ fieldName for fieldName in fieldNames if fieldName not in fieldIndexes or cls._isFieldPath(fieldName) ]:
+            # Values are fetched differently on this subclass, or some fields are not in the schema (and are None), or are paths
+            return super(QueryableListTuples, cls)._get_fields_getter(fieldNames)
+
+        getter = itemgetter( *[ fieldIndexes[fieldName] for fieldName in fieldNames ] )
+        if len(fieldNames) == 1:
+            return lambda item : (getter(item), )
+
+        return getter
+
 
 class QueryableListMixed(QueryableListBase):
     '''
         QueryableListMixed - QueryableList which can contain dict-like items or object-like items 
         
             This is somewhat slower than using QueryableListObjs or QueryableListDicts directly, but use it if you need to mix, or need to support either type.
+
+            Whether items are dict-like is remembered for each type of item, rather than checked on every access.
+              When every item is dict-like (or every item is not), filters and columns use the QueryableListDicts
+              (or QueryableListObjs) field access directly. The first such access switches this list to a type which records
+              its modifications (@see QueryableListBase._checkModified), so this is checked again only after a modification,
+              and lists which are only built up and never queried are not slowed down.
     '''
 
+    # _fieldAccessType - The result of _getFieldAccessType, or None until it is next needed. Cleared when the list was modified, @see _checkModified
+    _fieldAccessType = None
+
     @staticmethod
     def _get_item_value(item, fieldName):
         '''
@@ -99,9 +429,109 @@ class QueryableListMixed(QueryableListBase):
             @return - The value of the #fieldName key/attribute on #item
         '''
 
-        if hasattr(item, '__getitem__'):
+        if _isDictLike(item):
             return QueryableListDicts._get_item_value(item, fieldName)
 
         return QueryableListObjs._get_item_value(item, fieldName)
 
+    @classmethod
+    def _get_field_getter(cls, fieldName):
+        '''
+            _get_field_getter - Returns a function which fetches a field off an item, with the QueryableListDicts getter
+              for dict-like items and the QueryableListObjs getter otherwise.
+
+                @param fieldName <str> - The name of the field to fetch
+
+            @return <function> - A function (item) -> value of #fieldName on that item
+        '''
+        if cls._get_item_value is not QueryableListMixed._get_item_value or cls._isFieldPath(fieldName) or fieldName in cls.LITERAL_FIELDS:
+            # Values are fetched differently on this subclass, this is a path to a nested field,
+            #   or a literal field which the QueryableListDicts and QueryableListObjs getters would take as a path
+            return super(QueryableListMixed, cls)._get_field_getter(fieldName)
+
+        get_dict_value = QueryableListDicts._get_field_getter(fieldName)
+        get_obj_value = QueryableListObjs._get_field_getter(fieldName)
+
+        # gettersByType - Type of item -> the getter for items of that type. A plain dict, as looking up the
+        #   weak keys of _DICT_LIKE_TYPES for every item costs more than the check it saves. It lives only as long as this getter.
+        gettersByType = {}
+
+        def get_value(item):
+            getter = gettersByType.get(type(item))
+            if getter is None:
+                getter = get_dict_value if _isDictLike(item) else get_obj_value
+                if type(item) is not _InstanceType:
+                    gettersByType[type(item)] = getter
+
+            return getter(item)
+
+        return get_value
+
+    def _get_column(self, fieldName):
+        '''
+            _get_column - Returns the value of a field for every item in this list, in order.
+
+              If the items are all dict-like, or all not, the QueryableListDicts or QueryableListObjs access is used directly.
+
+                @param fieldName <str> - The name of the field to fetch
+
+            @return list - The values, one per item
+        '''
+        accessType = self._getFieldAccessType()
+        if accessType is QueryableListObjs and not self._isFieldPath(fieldName) and '.' not in fieldName:
+            return _getAttrColumn(self, fieldName)
+
+        return list( map(accessType._get_field_getter(fieldName), self) )
+
+    def _getFieldAccessType(self):
+        '''
+            _getFieldAccessType - Get QueryableListDicts if every item is dict-like, QueryableListObjs if none are,
+              otherwise (or if this subclass fetches values differently) this type.
+
+              The answer is kept until this list is modified.
+        '''
+        self._checkModified()
+        if self._fieldAccessType is None:
+            self._fieldAccessType = self._findFieldAccessType()
+
+        return self._fieldAccessType
+
+    def _onModified(self):
+        self._fieldAccessType = None
+        QueryableListBase._onModified(self)
+
+    def _findFieldAccessType(self):
+        '''
+            _findFieldAccessType - Check the items of this list for _getFieldAccessType
+        '''
+        myClass = self._untrackedClass or self.__class__
+        if myClass._get_item_value is not QueryableListMixed._get_item_value or myClass.LITERAL_FIELDS or not self:
+            # QueryableListDicts and QueryableListObjs would not know this type's LITERAL_FIELDS
+            return myClass
+
+        itemTypes = set( map(type, self) )
+        if _InstanceType is not None and _InstanceType in itemTypes:
+            # Python 2 old-style class instances all share one type, check them each
+            dictLikes = set( map(_isDictLike, self) )
+        else:
+            unknownTypes = itemTypes.difference(_DICT_LIKE_TYPES)
+            if unknownTypes:
+                # Check one item of each type not seen before
+                for item in self:
+                    itemType = type(item)
+                    if itemType in unknownTypes:
+                        _isDictLike(item)
+                        unknownTypes.discard(itemType)
+                        if not unknownTypes:
+                            break
+
+            dictLikes = set( [ _DICT_LIKE_TYPES[itemType] for itemType in itemTypes ] )
+
+        if len(dictLikes) != 1:
+            return myClass
+
+        if dictLikes.pop():
+            return QueryableListDicts
+        return QueryableListObjs
+
 #vim: set ts=4 st=4 sw=4 expandtab
@@ -8,6 +8,22 @@ FILTER_TYPES = {'eq', 'ieq', 'ne', 'ine', 'lt', 'gt', 'lte', 'gte', 'isnull', 'i
     'in', 'notin', 'contains', 'icontains', 'notcontains', 'noticontains', 'containsAny', 'notcontainsAny',
     'splitcontains', 'splitnotcontains', 'splitcontainsAny', 'splitnotcontainsAny', 'customMatch'}
 
+# FILTER_EVAL_ORDER - The order in which the parsed filter types are evaluated against an item.
+#   "isnull" is not present, as it is converted into "is" or "isnot" when parsed.
+FILTER_EVAL_ORDER = ('is', 'isnot', 'customMatch', 'in', 'notin', 'eq', 'ieq', 'ne', 'ine', 'lt', 'lte', 'gt', 'gte',
+    'contains', 'icontains', 'notcontains', 'noticontains', 'containsAny', 'notcontainsAny',
+    'splitcontains', 'splitnotcontains', 'splitcontainsAny', 'splitnotcontainsAny')
+
+
+# STRING_TYPES - The types of string values, for isinstance checks
+try:
+    STRING_TYPES = (str, unicode)
+except NameError:
+    # Python 3
+    STRING_TYPES = (str, )
+
+# FIELD_PATH_SEP - Separates the names in a path to a nested field, e.x. "address__city__eq" filters on item.address.city
+FIELD_PATH_SEP = '__'
 
 # FILTER_METHOD_AND - Used in QueryBuilder to specify that this filter should be an "AND" filter
 FILTER_METHOD_AND = 'AND'
@@ -17,4 +33,34 @@ FILTER_METHOD_OR  = 'OR'
 # FILTER_METHODS - Possible methods for filtering
 FILTER_METHODS = (FILTER_METHOD_AND, FILTER_METHOD_OR)
 
+# INDEX_TYPE_HASH - Used with create_index for a hash index (value -> positions), used by eq, in, is, and isnull filters
+INDEX_TYPE_HASH = 'hash'
+
+# INDEX_TYPE_SORTED - Used with create_index for a sorted index (values in order, with their positions), used by lt, lte, gt, and gte filters
+INDEX_TYPE_SORTED = 'sorted'
+
+# INDEX_TYPE_SPLIT - Used with create_index for a split index (token -> positions, for a given separator), used by the split* filters
+INDEX_TYPE_SPLIT = 'split'
+
+# INDEX_TYPE_NGRAM - Used with create_index for an n-gram index (substring -> positions), used by contains, icontains, notcontains, and noticontains
+INDEX_TYPE_NGRAM = 'ngram'
+
+# INDEX_TYPE_LOWERCASE - Used with create_index to keep the lowercase value of a field for every item, used by ieq, ine, icontains, and noticontains.
+#   Created on its own when CACHE_LOWERCASE is set on the list.
+INDEX_TYPE_LOWERCASE = 'lowercase'
+
+# INDEX_TYPES - Possible types of index
+INDEX_TYPES = (INDEX_TYPE_HASH, INDEX_TYPE_SORTED, INDEX_TYPE_SPLIT, INDEX_TYPE_NGRAM, INDEX_TYPE_LOWERCASE)
+
+# AGGREGATE_TYPES - Possible types of aggregate, used as "fieldName__type" with aggregate and annotate_groups
+AGGREGATE_TYPES = ('count', 'sum', 'min', 'max', 'avg')
+
+# JOIN_INNER - Used with join to only return items which have a match
+JOIN_INNER = 'inner'
+# JOIN_LEFT - Used with join to return every item of the left list, paired with None when it has no match
+JOIN_LEFT = 'left'
+
+# JOIN_TYPES - Possible types of join
+JOIN_TYPES = (JOIN_INNER, JOIN_LEFT)
+
 #vim: set ts=4 st=4 sw=4 expandtab
@@ -0,0 +1,188 @@
+#!/usr/bin/env GoodTests.py
+
+# vim: set ts=4 st=4 sw=4 expandtab :
+'''
+    Test paths to nested fields, like address__city__eq
+
+'''
+
+import sys
+import subprocess
+
+from QueryableList import QueryableListObjs, QueryableListDicts, QueryableListMixed, QueryableListBase, QueryBuilder, INDEX_TYPE_HASH, INDEX_TYPE_SORTED
+
+from tutils import DataObject
+
+
+class TestFieldPaths(object):
+    '''
+        Tests filtering and other operations on nested fields
+    '''
+
+    def setup_method(self, testFunc):
+        # Mixed levels: objects holding dicts holding objects
+        self.objs = QueryableListObjs([
+            DataObject(name='tim', address={ 'city' : 'Boston', 'geo' : DataObject(zip=2101) }),
+            DataObject(name='bob', address={ 'city' : 'Austin', 'geo' : DataObject(zip=73301) }),
+            DataObject(name='sue', address={ 'city' : 'boston', 'geo' : None }),
+            DataObject(name='ann', address=None),
+            DataObject(name='joe', address={ 'city' : 'Denver' }),
+        ])
+
+    def _getNames(self, items):
+        return [ item.name for item in items ]
+
+    def test_filterPath(self):
+        objs = self.objs
+
+        result = self._getNames( objs.filter(address__city__eq='Boston') )
+        assert result == ['tim'] , 'Expected address__city__eq to filter on the nested field, but got: %s' %(repr(result), )
+
+        result = self._getNames( objs.filter(address__city__ieq='BOSTON') )
+        assert result == ['tim', 'sue'] , 'Expected address__city__ieq to filter on the nested field, but got: %s' %(repr(result), )
+
+        result = self._getNames( objs.filter(address__geo__zip__isnull=False, address__geo__zip__gt=10000) )
+        assert result == ['bob'] , 'Expected a path of three names to be followed, but got: %s' %(repr(result), )
+
+        result = self._getNames( objs.filter(address__geo__zip__isnull=True) )
+        assert result == ['sue', 'ann', 'joe'] , 'Expected None along the path to give None, but got: %s' %(repr(result), )
+
+        result = self._getNames( objs.filterOr(address__city__eq='Denver', address__geo__zip__eq=2101) )
+        assert result == ['tim', 'joe'] , 'Expected paths to work in filterOr, but got: %s' %(repr(result), )
+
+        dicts = QueryableListDicts([ { 'a' : { 'b' : 1 } }, { 'a' : DataObject(b=2) }, { 'a' : 5 } ])
+        assert len(dicts.filter(a__b__eq=2)) == 1 , 'Expected an object inside a dict to be followed by attribute'
+        assert len(dicts.filter(a__b__isnull=True)) == 1 , 'Expected a value without the nested field to give None'
+
+        mixed = QueryableListMixed([ { 'a' : { 'b' : 1 } }, DataObject(a={ 'b' : 1 }) ])
+        assert len(mixed.filter(a__b__eq=1)) == 2 , 'Expected paths to work on QueryableListMixed'
+
+    def test_pathNeedsOperation(self):
+        gotException = False
+        try:
+            self.objs.filter(address__city='Boston')
+        except ValueError as e:
+            gotException = True
+            assert 'address__city__eq' in str(e) , 'Expected the error to suggest adding the operation to the path. Got: %s' %(str(e), )
+
+        assert gotException , 'Expected a path without an operation to raise ValueError, as "city" is not an operation'
+
+    def test_pathCached(self):
+        class CachedObjs(QueryableListObjs):
+            USE_CACHED = True
+
+        objs = CachedObjs(self.objs)
+        result = self._getNames( objs.filter(address__city__ne='Austin', address__geo__zip__isnull=False, address__geo__zip__gt=1) )
+        assert result == ['tim'] , 'Expected paths to work with USE_CACHED, but got: %s' %(repr(result), )
+
+    def test_queryBuilderPath(self):
+        query = QueryBuilder()
+        query.addFilter(address__city__in=['Boston', 'Austin'])
+        query.addFilter(address__geo__zip__lt=50000)
+
+        result = self._getNames( query.execute(self.objs) )
+        assert result == ['tim'] , 'Expected paths to work in a QueryBuilder, but got: %s' %(repr(result), )
+
+    def test_indexPath(self):
+        objs = self.objs
+        objs.create_index('address__city', INDEX_TYPE_HASH)
+        objs.create_index('address__geo__zip', INDEX_TYPE_SORTED)
+
+        result = self._getNames( objs.filter(address__city__eq='Boston') )
+        assert result == ['tim'] , 'Expected a hash index on a path to answer eq, but got: %s' %(repr(result), )
+
+        result = self._getNames( objs.filter(address__geo__zip__gte=2101) )
+        assert result == ['tim', 'bob'] , 'Expected a sorted index on a path to answer gte, but got: %s' %(repr(result), )
+
+    def test_otherOperationsPath(self):
+        objs = self.objs
+
+        result = self._getNames( objs.filter(address__city__isnull=False).sort_by('address__city') )
+        assert result == ['bob', 'tim', 'joe', 'sue'] , 'Expected sort_by on a path, but got: %s' %(repr(result), )
+
+        result = self._getNames( objs.filter(address__geo__zip__isnull=False).order_by('address__geo__zip', limit=10) )
+        assert result == ['tim', 'bob'] , 'Expected order_by on a path, but got: %s' %(repr(result), )
+
+        result = objs.values_list('name', 'address__city')
+        assert result[0] == ('tim', 'Boston') and result[3] == ('ann', None) , 'Expected values_list on a path, but got: %s' %(repr(result), )
+
+        groups = objs.group_by('address__city')
+        assert list(groups.keys()) == ['Boston', 'Austin', 'boston', None, 'Denver'] , 'Expected group_by on a path, but got: %s' %(repr(list(groups.keys())), )
+
+        result = objs.aggregate('address__geo__zip__max')
+        assert result == { 'address__geo__zip__max' : 73301 } , 'Expected aggregate on a path, but got: %s' %(repr(result), )
+
+        assert len(objs.distinct('address__city')) == 5 , 'Expected distinct on a path'
+
+    def test_notPath(self):
+        dicts = QueryableListDicts([ { '__private' : 1 }, { '__private' : 2 } ])
+
+        assert len(dicts.filter(__private__eq=1)) == 1 , 'Expected a name starting with "__" to not be a path'
+
+    def test_literalName(self):
+        items = [ { 'my__field' : 2, 'n' : 1 }, { 'my__field' : 1, 'n' : 2 }, { 'my' : { 'field' : 3 }, 'n' : 3 } ]
+
+        # Not declared, so a path
+        dicts = QueryableListDicts(items)
+        results = dicts.filter(my__field__eq=3)
+        assert [ item['n'] for item in results ] == [3] , 'Expected a name with "__" to be a path unless declared in LITERAL_FIELDS, but got: %s' %(repr(results), )
+
+        class LiteralDicts(QueryableListDicts):
+            LITERAL_FIELDS = ('my__field', )
+
+        dicts = LiteralDicts(items)
+
+        results = dicts.filter(my__field__eq=1)
+        assert [ item['n'] for item in results ] == [2] , 'Expected a field in LITERAL_FIELDS to be used as-is, but got: %s' %(repr(results), )
+
+        results = dicts.sort_by('my__field', True)
+        assert [ item['n'] for item in results ] == [1, 2, 3] , 'Expected sort_by on a field in LITERAL_FIELDS, but got: %s' %(repr(results), )
+
+        class LiteralObjs(QueryableListObjs):
+            LITERAL_FIELDS = ('my__field', )
+
+        objs = LiteralObjs([ DataObject(my__field=1, n=1), DataObject(my__field=5, n=2) ])
+        assert [ item.n for item in objs.filter(my__field__gt=2) ] == [2] , 'Expected an attribute in LITERAL_FIELDS to be used as-is'
+        assert objs.values_list('my__field', flat=True) == [1, 5] , 'Expected values_list on an attribute in LITERAL_FIELDS'
+
+        class LiteralMixed(QueryableListMixed):
+            LITERAL_FIELDS = ('my__field', )
+
+        mixed = LiteralMixed(items)
+        assert [ item['n'] for item in mixed.filter(my__field__eq=1) ] == [2] , 'Expected a field in LITERAL_FIELDS to be used as-is on a QueryableListMixed of only dicts'
+
+    def test_queryBuilderReused(self):
+        query = QueryBuilder()
+        query.addFilter(my__field__eq=1)
+
+        pathDicts = QueryableListDicts([ { 'my' : { 'field' : 1 } } ])
+        literalDicts = QueryableListDicts([ { 'my__field' : 1 } ])
+
+        # The same results whichever list the query ran on first
+        for lst in (pathDicts, literalDicts, pathDicts):
+            assert list(query.execute(lst)) == list(lst.filter(my__field__eq=1)) , 'Expected a reused QueryBuilder to match a fresh filter on %s' %(repr(lst), )
+
+    def test_strictSubclassPath(self):
+
+        class StrictQueryableList(QueryableListBase):
+            # Like the README example, raises KeyError for unknown fields
+
+            @staticmethod
+            def _get_item_value(item, fieldName):
+                if hasattr(item, fieldName):
+                    return getattr(item, fieldName)
+                raise KeyError('Invalid attribute "%s" on %s' %(fieldName, item.__class__.__name__))
+
+        strict = StrictQueryableList(self.objs)
+
+        results = strict.filter(address__city__eq='Boston')
+        assert self._getNames(results) == ['tim'] , 'Expected a path to be followed on a type which raises KeyError for unknown fields, but got: %s' %(repr(results), )
+
+        results = strict.sort_by('address__geo__zip')
+        assert self._getNames(results)[:2] == ['tim', 'bob'] , 'Expected sort_by on a path on a type which raises KeyError, but got: %s' %(repr(results), )
+
+
+if __name__ == '__main__':
+    sys.exit(subprocess.Popen('GoodTests.py -n1 "%s" %s' %(sys.argv[0], ' '.join(['"%s"' %(arg.replace('"', '\\"'), ) for arg in sys.argv[1:]]) ), shell=True).wait())
+
+# vim: set ts=4 st=4 sw=4 expandtab :
@@ -0,0 +1,143 @@
+#!/usr/bin/env GoodTests.py
+
+# vim: set ts=4 st=4 sw=4 expandtab :
+'''
+    Test group_by, aggregate, and annotate_groups
+
+'''
+
+import sys
+import subprocess
+
+from QueryableList import QueryableListObjs, QueryableListDicts
+
+from tutils import DataObject, CountingQueryableList
+
+
+class TestGrouping(object):
+    '''
+        Tests grouping and aggregates
+    '''
+
+    def _getObjs(self, listType=QueryableListObjs):
+        return listType([
+            DataObject(kind='fruit', name='apple', price=3),
+            DataObject(kind='veg', name='carrot', price=1),
+            DataObject(kind='fruit', name='pear', price=4),
+            DataObject(kind='veg', name='leek', price=None),
+            DataObject(kind='nut', name='almond', price=10),
+            DataObject(kind='fruit', name='plum', price=2),
+        ])
+
+    def test_groupBy(self):
+        lst = self._getObjs()
+
+        groups = lst.group_by('kind')
+
+        assert list(groups.keys()) == ['fruit', 'veg', 'nut'] , 'Expected groups in the order first seen, but got: %s' %(repr(list(groups.keys())), )
+
+        for group in groups.values():
+            assert issubclass(group.__class__, QueryableListObjs) , 'Expected each group to be the same type as the list, but got: %s' %(group.__class__.__name__, )
+
+        assert [x.name for x in groups['fruit']] == ['apple', 'pear', 'plum'] , 'Expected items to keep their order in a group, but got: %s' %(repr([x.name for x in groups['fruit']]), )
+        assert len(groups['nut']) == 1 , 'Expected 1 item in group "nut"'
+
+        # Groups can be queried further
+        assert groups['fruit'].filter(price__gt=2).count() == 2 , 'Expected to be able to filter a group'
+
+        dicts = QueryableListDicts([ {'a' : 1}, {'a' : 2}, {'b' : 3}, {'a' : 1} ])
+        groups = dicts.group_by('a')
+        assert list(groups.keys()) == [1, 2, None] , 'Expected missing fields to group under None, but got: %s' %(repr(list(groups.keys())), )
+        assert len(groups[1]) == 2 , 'Expected 2 items with a=1'
+
+        assert len(QueryableListObjs().group_by('kind')) == 0 , 'Expected no groups for an empty list'
+
+    def test_groupByUnhashable(self):
+        lst = QueryableListObjs([ DataObject(tags=['a', 'b']) ])
+
+        gotException = False
+        try:
+            lst.group_by('tags')
+        except ValueError:
+            gotException = True
+
+        assert gotException , 'Expected ValueError grouping by an unhashable value'
+
+    def test_aggregate(self):
+        lst = self._getObjs()
+
+        result = lst.aggregate('count', 'price__count', 'price__sum', 'price__min', 'price__max', 'price__avg')
+
+        assert result['count'] == 6 , 'Expected count of 6 items, but got: %s' %(repr(result['count']), )
+        assert result['price__count'] == 5 , 'Expected None values to not be counted, but got: %s' %(repr(result['price__count']), )
+        assert result['price__sum'] == 20 , 'Expected sum of 20, but got: %s' %(repr(result['price__sum']), )
+        assert result['price__min'] == 1 , 'Expected min of 1, but got: %s' %(repr(result['price__min']), )
+        assert result['price__max'] == 10 , 'Expected max of 10, but got: %s' %(repr(result['price__max']), )
+        assert result['price__avg'] == 4.0 , 'Expected avg of 4.0, but got: %s' %(repr(result['price__avg']), )
+
+        result = lst.aggregate('name__min', 'name__max')
+        assert result == {'name__min' : 'almond', 'name__max' : 'plum'} , 'Expected min/max to work on strings, but got: %s' %(repr(result), )
+
+        result = QueryableListObjs().aggregate('count', 'price__sum', 'price__avg')
+        assert result == {'count' : 0, 'price__sum' : None, 'price__avg' : None} , 'Expected None when there are no values, but got: %s' %(repr(result), )
+
+        # avg is not truncated on python 2
+        result = QueryableListDicts([ {'a' : 1}, {'a' : 2} ]).aggregate('a__avg')
+        assert result['a__avg'] == 1.5 , 'Expected avg of 1.5, but got: %s' %(repr(result['a__avg']), )
+
+    def test_aggregateSinglePass(self):
+        lst = self._getObjs(CountingQueryableList)
+
+        CountingQueryableList.numFetches = 0
+        lst.aggregate('price__sum', 'price__min', 'price__max', 'price__avg')
+
+        assert CountingQueryableList.numFetches == len(lst) , 'Expected each value to be fetched once, but got %d fetches for %d items.' %(CountingQueryableList.numFetches, len(lst))
+
+    def test_aggregateInvalid(self):
+        lst = self._getObjs()
+
+        for aggregate in ('price__median', 'price', '__sum', 'sum'):
+            gotException = False
+            try:
+                lst.aggregate(aggregate)
+            except ValueError:
+                gotException = True
+
+            assert gotException , 'Expected ValueError for aggregate %s' %(repr(aggregate), )
+
+    def test_annotateGroups(self):
+        lst = self._getObjs()
+
+        result = lst.annotate_groups('kind', 'count', 'price__sum', 'price__avg')
+
+        assert list(result.keys()) == ['fruit', 'veg', 'nut'] , 'Expected groups in the order first seen, but got: %s' %(repr(list(result.keys())), )
+        assert result['fruit'] == {'count' : 3, 'price__sum' : 9, 'price__avg' : 3.0} , 'Wrong aggregates for "fruit": %s' %(repr(result['fruit']), )
+        assert result['veg'] == {'count' : 2, 'price__sum' : 1, 'price__avg' : 1.0} , 'Wrong aggregates for "veg": %s' %(repr(result['veg']), )
+        assert result['nut'] == {'count' : 1, 'price__sum' : 10, 'price__avg' : 10.0} , 'Wrong aggregates for "nut": %s' %(repr(result['nut']), )
+
+        groups = lst.group_by('kind')
+        for (kind, group) in groups.items():
+            assert group.aggregate('count', 'price__sum', 'price__avg') == result[kind] , 'Expected annotate_groups to match aggregate on each group for "%s"' %(kind, )
+
+    def test_annotateGroupsCompilesOnce(self):
+        compiled = []
+
+        class CompileCountingList(QueryableListObjs):
+
+            @classmethod
+            def _get_field_getter(cls, fieldName):
+                compiled.append(fieldName)
+                return QueryableListObjs._get_field_getter.__func__(cls, fieldName)
+
+        lst = CompileCountingList(self._getObjs())
+
+        result = lst.annotate_groups('kind', 'count', 'price__sum', 'price__max')
+        assert len(result) == 3 , 'Expected 3 groups, got: %s' %(repr(result), )
+
+        assert sorted(compiled) == ['kind', 'price'] , 'Expected each field getter to be compiled once, not once per group. Got: %s' %(repr(compiled), )
+
+
+if __name__ == '__main__':
+    sys.exit(subprocess.Popen('GoodTests.py -n1 "%s" %s' %(sys.argv[0], ' '.join(['"%s"' %(arg.replace('"', '\\"'), ) for arg in sys.argv[1:]]) ), shell=True).wait())
+
+# vim: set ts=4 st=4 sw=4 expandtab :
@@ -0,0 +1,432 @@
+#!/usr/bin/env GoodTests.py
+
+# vim: set ts=4 st=4 sw=4 expandtab :
+'''
+    Test indexes on QueryableLists, and that filtering with them gives the same results as without
+
+'''
+
+import copy
+import gc
+import pickle
+import weakref
+import sys
+import subprocess
+
+from QueryableList import QueryableListObjs, QueryableListDicts, QueryBuilder, INDEX_TYPE_HASH, INDEX_TYPE_SORTED, INDEX_TYPE_SPLIT, INDEX_TYPE_NGRAM
+
+from tutils import DataObject, CountingQueryableList
+
+
+class TestIndexes(object):
+
+    def setup_method(self, testFunc):
+        self.dataObjs = [
+            DataObject(a='one', b='two', num=7, tags=['x']),
+            DataObject(a='one', b='five', num=-5, tags=['y']),
+            DataObject(a='six', c='eleven', num=7, tags=['x']),
+            DataObject(a='ten', b='five', num=3, tags=None),
+            DataObject(a=None, b='two', num=1, tags=['x', 'y']),
+        ]
+
+        self.dataDicts = [
+            { 'a' : 'one', 'b' : 'two', 'num' : 7 },
+            { 'a' : 'one', 'b' : 'five', 'num' : -5 },
+            { 'a' : 'six', 'c' : 'eleven', 'num' : 7 },
+            { 'a' : 'ten', 'b' : 'five', 'num' : 3 },
+            { 'a' : None, 'b' : 'two', 'num' : 1 },
+        ]
+
+    def _assertSameResults(self, indexed, plain, filterMethod, **kwargs):
+        indexedResults = getattr(indexed, filterMethod)(**kwargs)
+        plainResults = getattr(plain, filterMethod)(**kwargs)
+
+        assert list(indexedResults) == list(plainResults) , 'Expected %s(%s) with index to match without.\nGot:      %s\nExpected: %s\n' %(filterMethod, repr(kwargs), repr(indexedResults), repr(plainResults))
+        assert indexedResults.__class__ == plain.__class__ , 'Expected results to be of the same type'
+
+    def test_hashIndex(self):
+        plain = QueryableListDicts(self.dataDicts)
+
+        indexed = QueryableListDicts(self.dataDicts)
+        indexed.create_index('a')
+        indexed.create_index('num', INDEX_TYPE_HASH)
+
+        for filterMethod in ('filterAnd', 'filterOr'):
+            self._assertSameResults(indexed, plain, filterMethod, a='one')
+            self._assertSameResults(indexed, plain, filterMethod, a='nope')
+            self._assertSameResults(indexed, plain, filterMethod, a__in=['one', 'six', None])
+            self._assertSameResults(indexed, plain, filterMethod, a__isnull=True)
+            self._assertSameResults(indexed, plain, filterMethod, a__isnull=False)
+            self._assertSameResults(indexed, plain, filterMethod, a__is=None)
+            self._assertSameResults(indexed, plain, filterMethod, a='one', num=7)
+            self._assertSameResults(indexed, plain, filterMethod, a='one', b='five')
+            self._assertSameResults(indexed, plain, filterMethod, num__in=[7, 3], b__ne='five')
+            self._assertSameResults(indexed, plain, filterMethod, num=7.0)
+
+    def test_indexUsed(self):
+        dataObjs = self.dataObjs
+
+        indexed = CountingQueryableList(dataObjs)
+        indexed.create_index('a')
+
+        CountingQueryableList.numFetches = 0
+
+        results = indexed.filter(a='one')
+        assert list(results) == [ dataObjs[0], dataObjs[1] ] , 'Got unexpected results: %s' %(repr(results), )
+        assert CountingQueryableList.numFetches == 0 , 'Expected an indexed eq filter to not fetch any values. Fetched %d' %(CountingQueryableList.numFetches, )
+
+        results = indexed.filterOr(a='six', a__isnull=True)
+        assert list(results) == [ dataObjs[2], dataObjs[4] ] , 'Got unexpected results: %s' %(repr(results), )
+        assert CountingQueryableList.numFetches == 0 , 'Expected an OR of only indexed filters to not fetch any values. Fetched %d' %(CountingQueryableList.numFetches, )
+
+        # Other filters are only tested against the items the index selected
+        results = indexed.filter(a='one', num__gt=0)
+        assert list(results) == [ dataObjs[0] ] , 'Got unexpected results: %s' %(repr(results), )
+        assert CountingQueryableList.numFetches == 2 , 'Expected remaining filters to only test the 2 items selected by the index. Fetched %d' %(CountingQueryableList.numFetches, )
+
+    def test_broadIndexSkipped(self):
+        dataObjs = self.dataObjs
+
+        indexed = CountingQueryableList(dataObjs)
+        indexed.create_index('a')
+        indexed.create_index('num', INDEX_TYPE_SORTED)
+        plain = QueryableListObjs(dataObjs)
+
+        CountingQueryableList.numFetches = 0
+
+        # Matches most of the list, so a scan is used rather than the index
+        results = indexed.filter(a__isnull=False)
+        assert list(results) == list(plain.filter(a__isnull=False)) , 'Got unexpected results: %s' %(repr(results), )
+        assert CountingQueryableList.numFetches == len(dataObjs) , 'Expected a scan for a filter matching most of the list. Fetched %d' %(CountingQueryableList.numFetches, )
+
+        CountingQueryableList.numFetches = 0
+        results = indexed.filter(num__gte=-5)
+        assert list(results) == list(plain.filter(num__gte=-5)) , 'Got unexpected results: %s' %(repr(results), )
+        assert CountingQueryableList.numFetches == len(dataObjs) , 'Expected a scan for a range covering most of the list. Fetched %d' %(CountingQueryableList.numFetches, )
+
+        # Narrow filters still use the index
+        CountingQueryableList.numFetches = 0
+        results = indexed.filter(a__isnull=True)
+        assert list(results) == [ dataObjs[4] ] , 'Got unexpected results: %s' %(repr(results), )
+        assert CountingQueryableList.numFetches == 0 , 'Expected an indexed isnull filter to not fetch any values. Fetched %d' %(CountingQueryableList.numFetches, )
+
+    def test_sortedIndex(self):
+        plain = QueryableListDicts(self.dataDicts)
+
+        indexed = QueryableListDicts(self.dataDicts)
+        indexed.create_index('num', INDEX_TYPE_SORTED)
+
+        for filterMethod in ('filterAnd', 'filterOr'):
+            for filterType in ('lt', 'lte', 'gt', 'gte'):
+                for value in (-10, -5, 1, 3, 7, 100):
+                    self._assertSameResults(indexed, plain, filterMethod, **{ 'num__' + filterType : value })
+
+            self._assertSameResults(indexed, plain, filterMethod, num__gt=1, num__lte=7)
+            self._assertSameResults(indexed, plain, filterMethod, num__gte=3, num__lt=3)
+            self._assertSameResults(indexed, plain, filterMethod, num__gt=-5, a='one')
+
+    def test_sortedIndexRange(self):
+        dataObjs = self.dataObjs
+
+        indexed = CountingQueryableList(dataObjs)
+        indexed.create_index('num', INDEX_TYPE_SORTED)
+
+        CountingQueryableList.numFetches = 0
+
+        results = indexed.filter(num__gt=1, num__lte=7)
+        assert list(results) == [ dataObjs[0], dataObjs[2], dataObjs[3] ] , 'Got unexpected results: %s' %(repr(results), )
+        assert CountingQueryableList.numFetches == 0 , 'Expected an indexed range to not fetch any values. Fetched %d' %(CountingQueryableList.numFetches, )
+
+        results = indexed.filter(num__lt=0, a='one')
+        assert list(results) == [ dataObjs[1] ] , 'Got unexpected results: %s' %(repr(results), )
+        assert CountingQueryableList.numFetches == 1 , 'Expected remaining filters to only test the 1 item selected by the index. Fetched %d' %(CountingQueryableList.numFetches, )
+
+        # None values are not indexed, and do not match
+        withNone = CountingQueryableList(dataObjs + [ DataObject(a='one', num=None) ])
+        withNone.create_index('num', INDEX_TYPE_SORTED)
+        results = withNone.filter(num__gte=-100)
+        assert len(results) == len(dataObjs) , 'Expected item with None value to not match. Got: %s' %(repr(results), )
+
+    def test_sortedIndexIncomparable(self):
+        indexed = QueryableListDicts(self.dataDicts + [ { 'a' : 'x', 'num' : 'seven' } ])
+
+        gotException = False
+        try:
+            indexed.create_index('num', INDEX_TYPE_SORTED)
+        except ValueError:
+            gotException = True
+
+        # Python 2 can compare anything, so only check on Python 3
+        if sys.version_info.major >= 3:
+            assert gotException is True , 'Expected ValueError creating a sorted index on values which cannot be compared'
+
+        # Lazy rebuild on values which cannot be compared falls back to a scan
+        indexed = QueryableListDicts(self.dataDicts)
+        indexed.create_index('num', INDEX_TYPE_SORTED)
+        indexed.append( { 'a' : 'x', 'num' : 'seven' } )
+
+        results = indexed.filter(a='x')
+        assert len(results) == 1 , 'Expected filter on another field to work after the sorted index could not be rebuilt'
+
+    def test_splitIndex(self):
+        dataDicts = [
+            { 'tags' : 'x,y,z', 'words' : 'the quick fox' },
+            { 'tags' : 'y', 'words' : 'a  lazy dog' },
+            { 'tags' : None, 'words' : 'fox' },
+            { 'tags' : 'x,x', 'words' : None },
+            { 'tags' : 5, 'words' : 'quick' },
+            { 'tags' : '', 'words' : '' },
+        ]
+
+        plain = QueryableListDicts(dataDicts)
+
+        indexed = QueryableListDicts(dataDicts)
+        indexed.create_index('tags', INDEX_TYPE_SPLIT, splitBy=',')
+        indexed.create_index('words', INDEX_TYPE_SPLIT)
+
+        for filterMethod in ('filterAnd', 'filterOr'):
+            for value in ('x', 'y', 'nope', ''):
+                self._assertSameResults(indexed, plain, filterMethod, tags__splitcontains=(',', value))
+                self._assertSameResults(indexed, plain, filterMethod, tags__splitnotcontains=(',', value))
+            self._assertSameResults(indexed, plain, filterMethod, tags__splitcontainsAny=(',', ['z', 'y']))
+            self._assertSameResults(indexed, plain, filterMethod, tags__splitnotcontainsAny=(',', ['z', 'y']))
+            self._assertSameResults(indexed, plain, filterMethod, tags__splitcontains=(',', 'x'), words__splitcontains=(None, 'fox'))
+            self._assertSameResults(indexed, plain, filterMethod, words__splitcontainsAny=(None, ('lazy', 'quick')))
+            # Different separator than the index, scanned
+            self._assertSameResults(indexed, plain, filterMethod, words__splitcontains=(' ', 'lazy'))
+
+    def test_splitIndexUsed(self):
+        dataObjs = [
+            DataObject(a='one', tags='x,y'),
+            DataObject(a='two', tags='y'),
+            DataObject(a='three', tags='z,x'),
+        ]
+
+        indexed = CountingQueryableList(dataObjs)
+        indexed.create_index('tags', INDEX_TYPE_SPLIT, splitBy=',')
+
+        CountingQueryableList.numFetches = 0
+
+        results = indexed.filter(tags__splitcontains=(',', 'x'))
+        assert list(results) == [ dataObjs[0], dataObjs[2] ] , 'Got unexpected results: %s' %(repr(results), )
+        assert CountingQueryableList.numFetches == 0 , 'Expected an indexed splitcontains to not fetch any values. Fetched %d' %(CountingQueryableList.numFetches, )
+
+        results = indexed.filter(tags__splitcontains=(' ', 'x'))
+        assert CountingQueryableList.numFetches == len(dataObjs) , 'Expected a scan when the separator does not match the index'
+
+        gotException = False
+        try:
+            indexed.create_index('a', INDEX_TYPE_HASH, splitBy=',')
+        except ValueError:
+            gotException = True
+
+        assert gotException is True , 'Expected ValueError when splitBy is given for a hash index'
+
+    def test_ngramIndex(self):
+        dataDicts = [
+            { 'name' : 'Hello World' },
+            { 'name' : 'hello there' },
+            { 'name' : None },
+            { 'name' : ['hello', 'xyz'] },
+            { 'name' : 12 },
+            { 'name' : 'WORLDLY' },
+            { 'name' : 'lo' },
+        ]
+
+        plain = QueryableListDicts(dataDicts)
+
+        indexed = QueryableListDicts(dataDicts)
+        indexed.create_index('name', INDEX_TYPE_NGRAM)
+
+        for filterMethod in ('filterAnd', 'filterOr'):
+            for value in ('hello', 'Hello', 'World', 'world', 'lo W', 'xyz', 'nope', 'lo', ''):
+                for filterType in ('contains', 'icontains', 'notcontains', 'noticontains'):
+                    self._assertSameResults(indexed, plain, filterMethod, **{ 'name__' + filterType : value })
+
+            self._assertSameResults(indexed, plain, filterMethod, name__icontains='world', name__notcontains='Hello')
+
+    def test_ngramIndexUsed(self):
+        dataObjs = [
+            DataObject(a='one', name='Some Text Here'),
+            DataObject(a='two', name='Other text'),
+            DataObject(a='three', name='nothing'),
+        ]
+
+        indexed = CountingQueryableList(dataObjs)
+        indexed.create_index('name', INDEX_TYPE_NGRAM)
+
+        CountingQueryableList.numFetches = 0
+
+        results = indexed.filter(name__icontains='TEXT')
+        assert list(results) == [ dataObjs[0], dataObjs[1] ] , 'Got unexpected results: %s' %(repr(results), )
+
+        results = indexed.filter(name__contains='Text')
+        assert list(results) == [ dataObjs[0] ] , 'Got unexpected results: %s' %(repr(results), )
+
+        assert CountingQueryableList.numFetches == 0 , 'Expected an indexed contains to not fetch any values. Fetched %d' %(CountingQueryableList.numFetches, )
+
+        # Too short for the index, scanned
+        results = indexed.filter(name__contains='te')
+        assert list(results) == [ dataObjs[1] ] , 'Got unexpected results: %s' %(repr(results), )
+        assert CountingQueryableList.numFetches == len(dataObjs) , 'Expected a scan for a value shorter than the n-grams'
+
+    def test_unhashableValues(self):
+        plain = QueryableListObjs(self.dataObjs)
+
+        indexed = QueryableListObjs(self.dataObjs)
+        indexed.create_index('tags')
+
+        self._assertSameResults(indexed, plain, 'filterAnd', tags=['x'])
+        self._assertSameResults(indexed, plain, 'filterAnd', tags__isnull=True)
+        self._assertSameResults(indexed, plain, 'filterOr', tags=['x', 'y'], tags__isnull=True)
+
+    def test_modifiedList(self):
+        dataObjs = self.dataObjs
+
+        indexed = QueryableListObjs(dataObjs)
+        indexed.create_index('a')
+
+        assert len(indexed.filter(a='one')) == 2 , 'Expected two matches before modifying the list'
+
+        newObj = DataObject(a='one', num=12)
+        indexed.append(newObj)
+        results = indexed.filter(a='one')
+        assert list(results) == [ dataObjs[0], dataObjs[1], newObj ] , 'Expected index to be rebuilt after append. Got: %s' %(repr(results), )
+
+        del indexed[0]
+        results = indexed.filter(a='one')
+        assert list(results) == [ dataObjs[1], newObj ] , 'Expected index to be rebuilt after delete. Got: %s' %(repr(results), )
+
+        # Replace dataObjs[1] (a='one')
+        indexed[0] = DataObject(a='two')
+        indexed += [ DataObject(a='one') ]
+        indexed.insert(0, DataObject(a='six'))
+        results = indexed.filter(a='six')
+        assert len(results) == 2 and results[1] is dataObjs[2] , 'Expected index to be rebuilt after insert. Got: %s' %(repr(results), )
+
+        results = indexed.filter(a='one')
+        assert len(results) == 2 and results[0] is newObj , 'Expected index to be rebuilt after setitem and +=. Got: %s' %(repr(results), )
+
+        indexed.reverse()
+        results = indexed.filter(a='six')
+        assert results[0] is dataObjs[2] , 'Expected index to be rebuilt after reverse. Got: %s' %(repr(results), )
+
+        # Same length, one item replaced
+        replaceObj = DataObject(a='six')
+        indexed[-1] = replaceObj
+        results = indexed.filter(a='six')
+        assert len(results) == 2 and results[1] is replaceObj , 'Expected index to be rebuilt after replacing an item. Got: %s' %(repr(results), )
+
+        # Also when modified through list itself
+        list.append(indexed, DataObject(a='ten'))
+        assert len(indexed.filter(a='ten')) == 2 , 'Expected index to be rebuilt after list.append'
+
+    def test_rebuildOnEqualItem(self):
+
+        class Record(object):
+            # Equal (and hashed) by primary key only, like an ORM model
+            def __init__(self, pk, status):
+                self.pk = pk
+                self.status = status
+
+            def __eq__(self, other):
+                return isinstance(other, Record) and self.pk == other.pk
+
+            def __ne__(self, other):
+                return not self.__eq__(other)
+
+            def __hash__(self):
+                return hash(self.pk)
+
+        indexed = QueryableListObjs([ Record(1, 'new'), Record(2, 'new') ])
+        indexed.create_index('status')
+
+        assert len(indexed.filter(status='new')) == 2 , 'Expected two matches before replacing an item'
+
+        doneRecord = Record(1, 'done')
+        indexed[0] = doneRecord
+        results = indexed.filter(status='done')
+        assert len(results) == 1 and results[0] is doneRecord , 'Expected index to be rebuilt after replacing an item with an equal one. Got: %s' %(repr(results), )
+
+    def test_unmodifiedNotRebuilt(self):
+        indexed = CountingQueryableList(self.dataObjs)
+        indexed.create_index('a')
+        indexed.filter(a='one')
+
+        CountingQueryableList.numFetches = 0
+        results = indexed.filter(a='one')
+        assert len(results) == 2 , 'Expected two matches. Got: %s' %(repr(results), )
+        assert CountingQueryableList.numFetches == 0 , 'Expected no values fetched when the list was not modified. Got %d fetches' %(CountingQueryableList.numFetches, )
+
+        indexed.append(DataObject(a='one'))
+        CountingQueryableList.numFetches = 0
+        results = indexed.filter(a='one')
+        assert len(results) == 3 , 'Expected index to be rebuilt after append. Got: %s' %(repr(results), )
+        assert CountingQueryableList.numFetches == len(indexed) , 'Expected one rebuild after append. Got %d fetches' %(CountingQueryableList.numFetches, )
+
+        assert results.__class__ is CountingQueryableList , 'Expected filter results of an indexed list to be of its original type. Got: %s' %(repr(results.__class__), )
+        assert copy.copy(indexed).__class__ is CountingQueryableList , 'Expected a copy of an indexed list to be of its original type'
+        assert copy.deepcopy(indexed).__class__ is CountingQueryableList , 'Expected a deep copy of an indexed list to be of its original type'
+        assert repr(indexed).startswith('CountingQueryableList(') , 'Expected an indexed list to keep the name of its type. Got: %s' %(repr(indexed), )
+
+        indexedObjs = QueryableListObjs(self.dataObjs)
+        indexedObjs.create_index('a')
+        unpickled = pickle.loads(pickle.dumps(indexedObjs))
+        assert unpickled.__class__ is QueryableListObjs and len(unpickled.filter(a='one')) == 2 , 'Expected an indexed list to pickle as its original type'
+
+    def test_runtimeTypeFreed(self):
+        RuntimeList = type('RuntimeList', (QueryableListObjs, ), {})
+        indexed = RuntimeList(self.dataObjs)
+        indexed.create_index('a')
+
+        assert isinstance(indexed, RuntimeList) and type(indexed) is not RuntimeList , 'Expected an indexed list to be switched to a subclass of its type'
+        assert len(indexed.filter(a='one')) == 2 , 'Expected two matches'
+
+        typeRef = weakref.ref(RuntimeList)
+        del indexed, RuntimeList
+        gc.collect()
+
+        assert typeRef() is None , 'Expected a type made at runtime (like by QueryableListTuples.with_fields) to be freed once no list uses it, even after indexing one'
+
+    def test_dropIndex(self):
+        indexed = CountingQueryableList(self.dataObjs)
+        indexed.create_index('a')
+        indexed.drop_index('a')
+
+        CountingQueryableList.numFetches = 0
+        indexed.filter(a='one')
+
+        assert CountingQueryableList.numFetches == len(self.dataObjs) , 'Expected a scan after the index was dropped'
+
+    def test_unknownIndexType(self):
+        indexed = QueryableListObjs(self.dataObjs)
+
+        gotException = False
+        try:
+            indexed.create_index('a', 'notAnIndexType')
+        except ValueError:
+            gotException = True
+
+        assert gotException is True , 'Expected ValueError on an unknown index type'
+
+    def test_queryBuilder(self):
+        dataObjs = self.dataObjs
+
+        indexed = CountingQueryableList(dataObjs)
+        indexed.create_index('a')
+
+        query = QueryBuilder()
+        query.addFilterAnd(num__gte=1)
+        query.addFilterOr(a='one', a__in=['ten'])
+
+        CountingQueryableList.numFetches = 0
+
+        results = query.execute(indexed)
+        assert list(results) == [ dataObjs[0], dataObjs[3] ] , 'Got unexpected results: %s' %(repr(results), )
+        assert CountingQueryableList.numFetches == 3 , 'Expected QueryBuilder to use the index on "a". Fetched %d' %(CountingQueryableList.numFetches, )
+
+
+if __name__ == '__main__':
+    sys.exit(subprocess.Popen('GoodTests.py -n1 "%s" %s' %(sys.argv[0], ' '.join(['"%s"' %(arg.replace('"', '\\"'), ) for arg in sys.argv[1:]]) ), shell=True).wait())
+
+# vim: set ts=4 st=4 sw=4 expandtab :
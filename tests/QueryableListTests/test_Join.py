@@ -0,0 +1,117 @@
+#!/usr/bin/env GoodTests.py
+
+# vim: set ts=4 st=4 sw=4 expandtab :
+'''
+    Test join
+
+'''
+
+import sys
+import subprocess
+
+from QueryableList import QueryableListObjs, QueryableListDicts, QueryableListTuples, JOIN_LEFT
+
+from tutils import DataObject
+
+
+class TestJoin(object):
+    '''
+        Tests joining two QueryableLists
+    '''
+
+    def setup_method(self, testFunc):
+        self.users = QueryableListObjs([
+            DataObject(id=1, name='tim'),
+            DataObject(id=2, name='bob'),
+            DataObject(id=3, name='sue'),
+            DataObject(id=None, name='nobody'),
+        ])
+
+        self.orders = QueryableListDicts([
+            { 'order_id' : 10, 'user_id' : 2, 'total' : 5 },
+            { 'order_id' : 11, 'user_id' : 1, 'total' : 7 },
+            { 'order_id' : 12, 'user_id' : 2, 'total' : 9 },
+            { 'order_id' : 13, 'user_id' : 4, 'total' : 1 },
+            { 'order_id' : 14, 'user_id' : None, 'total' : 2 },
+        ])
+
+    def _getNames(self, pairs):
+        return [ (user.name, order and order['order_id']) for (user, order) in pairs ]
+
+    def test_innerJoin(self):
+        result = self._getNames( self.users.join(self.orders, left_on='id', right_on='user_id') )
+
+        expected = [ ('tim', 11), ('bob', 10), ('bob', 12) ]
+        assert result == expected , 'Expected inner join to be %s, but got: %s' %(repr(expected), repr(result))
+
+        # The other way around, with the smaller side on the left
+        result = [ (order['order_id'], user.name) for (order, user) in self.orders.join(self.users, left_on='user_id', right_on='id') ]
+        expected = [ (10, 'bob'), (11, 'tim'), (12, 'bob') ]
+        assert result == expected , 'Expected inner join to be %s, but got: %s' %(repr(expected), repr(result))
+
+    def test_leftJoin(self):
+        result = self._getNames( self.users.join(self.orders, left_on='id', right_on='user_id', how=JOIN_LEFT) )
+
+        expected = [ ('tim', 11), ('bob', 10), ('bob', 12), ('sue', None), ('nobody', None) ]
+        assert result == expected , 'Expected left join to be %s, but got: %s' %(repr(expected), repr(result))
+
+        # The other way around, with the larger side on the left
+        result = [ (order['order_id'], user and user.name) for (order, user) in self.orders.join(self.users, left_on='user_id', right_on='id', how=JOIN_LEFT) ]
+        expected = [ (10, 'bob'), (11, 'tim'), (12, 'bob'), (13, None), (14, None) ]
+        assert result == expected , 'Expected left join to be %s, but got: %s' %(repr(expected), repr(result))
+
+    def test_joinOn(self):
+        left = QueryableListDicts([ { 'k' : 'a', 'x' : 1 }, { 'k' : 'b', 'x' : 2 } ])
+        right = QueryableListDicts([ { 'k' : 'b', 'y' : 3 }, { 'k' : 'c', 'y' : 4 } ])
+
+        result = list(left.join(right, on='k'))
+        assert result == [ (left[1], right[0]) ] , 'Expected join on a shared field name, but got: %s' %(repr(result), )
+
+        # A plain list is used as a QueryableListMixed
+        result = list(left.join(list(right), on='k'))
+        assert result == [ (left[1], right[0]) ] , 'Expected join with a plain list, but got: %s' %(repr(result), )
+
+        rows = QueryableListTuples.with_fields( ('k', 'z') )([ ('a', 5), ('c', 6) ])
+        result = list(rows.join(list(right), on='k'))
+        assert result == [ (rows[1], right[1]) ] , 'Expected join of tuples with a plain list of dicts, but got: %s' %(repr(result), )
+
+        result = list(left.join([ DataObject(k='a'), { 'k' : 'b' } ], on='k'))
+        assert [ pair[0] for pair in result ] == [ left[0], left[1] ] , 'Expected join with a plain list of mixed items, but got: %s' %(repr(result), )
+
+    def test_joinMerge(self):
+        result = list( self.users.join(self.orders, left_on='id', right_on='user_id', how='left', merge=True) )
+
+        assert len(result) == 5 , 'Expected 5 merged results, but got %d' %(len(result), )
+        assert result[0] == { 'id' : 1, 'name' : 'tim', 'order_id' : 11, 'user_id' : 1, 'total' : 7 } , 'Wrong merged result: %s' %(repr(result[0]), )
+        assert result[3] == { 'id' : 3, 'name' : 'sue' } , 'Expected an unmatched left item to be merged alone, but got: %s' %(repr(result[3]), )
+
+        left = QueryableListDicts([ { 'k' : 1, 'v' : 'left' } ])
+        right = QueryableListDicts([ { 'k' : 1, 'v' : 'right' } ])
+        result = list(left.join(right, on='k', merge=True))
+        assert result == [ { 'k' : 1, 'v' : 'left' } ] , 'Expected the left item to win on shared fields, but got: %s' %(repr(result), )
+        assert left[0]['v'] == 'left' and right[0]['v'] == 'right' , 'Expected merge to not modify the items'
+
+    def test_joinInvalid(self):
+        for kwargs in ( {}, { 'left_on' : 'id' }, { 'on' : 'id', 'right_on' : 'user_id' }, { 'on' : 'id', 'how' : 'outer' } ):
+            gotException = False
+            try:
+                self.users.join(self.orders, **kwargs)
+            except ValueError:
+                gotException = True
+
+            assert gotException , 'Expected ValueError from join with %s' %(repr(kwargs), )
+
+        left = QueryableListDicts([ { 'k' : [1] } ])
+        gotException = False
+        try:
+            list(left.join(left, on='k'))
+        except ValueError:
+            gotException = True
+
+        assert gotException , 'Expected ValueError joining on an unhashable value'
+
+
+if __name__ == '__main__':
+    sys.exit(subprocess.Popen('GoodTests.py -n1 "%s" %s' %(sys.argv[0], ' '.join(['"%s"' %(arg.replace('"', '\\"'), ) for arg in sys.argv[1:]]) ), shell=True).wait())
+
+# vim: set ts=4 st=4 sw=4 expandtab :
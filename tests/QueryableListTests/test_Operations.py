@@ -220,7 +220,35 @@ class TestOperations(object):
         doTest(qlObjs, 'AND', {'num__gte' : 7}, (dataObjs[0], dataObjs[2] ) )
         doTest(qlObjs, 'AND', {'num__gte' : -5}, (dataObjs[0], dataObjs[1], dataObjs[2]  ) )
         doTest(qlObjs, 'AND', {'num__gte' : -6}, (dataObjs[0], dataObjs[1], dataObjs[2]  ) )
-        
+
+    def test_ieq_ine(self):
+        dataObjs = self.dataObjs
+        doTest = self._doTest
+
+        qlObjs = QueryableListObjs(dataObjs)
+
+        doTest(qlObjs, 'AND', {'a__ieq' : 'ONE'}, ( dataObjs[0], dataObjs[1] ) )
+        doTest(qlObjs, 'OR', {'a__ieq' : 'Six', 'q__ieq' : 'CHEESE'}, ( dataObjs[0], dataObjs[1], dataObjs[2] ) )
+        doTest(qlObjs, 'AND', {'a__ine' : 'ONE'}, ( dataObjs[2], ) )
+
+        # A value which cannot be lowercased (None) never equals, so "ine" matches it in both AND and OR
+        doTest(qlObjs, 'AND', {'null1__ine' : 'x'}, ( dataObjs[0], dataObjs[1], dataObjs[2] ) )
+        doTest(qlObjs, 'OR', {'null1__ine' : 'x'}, ( dataObjs[0], dataObjs[1], dataObjs[2] ) )
+        doTest(qlObjs, 'OR', {'null1__ieq' : 'x', 'a__ieq' : 'SIX'}, ( dataObjs[2], ) )
+
+    def test_contains(self):
+        dataObjs = self.dataObjs
+        doTest = self._doTest
+
+        qlObjs = QueryableListObjs(dataObjs)
+
+        doTest(qlObjs, 'AND', {'q__contains' : 'hee'}, ( dataObjs[0], dataObjs[1] ) )
+        doTest(qlObjs, 'AND', {'q__icontains' : 'HEE', 'b__contains' : 'w'}, ( dataObjs[0], ) )
+        doTest(qlObjs, 'AND', {'b__notcontains' : 'w'}, ( dataObjs[1], dataObjs[2] ) )
+        doTest(qlObjs, 'OR', {'b__contains' : 'f', 'q__noticontains' : 'CHEESE'}, ( dataObjs[1], dataObjs[2] ) )
+        doTest(qlObjs, 'AND', {'null1__contains' : 'x'}, tuple() )
+
+
         
 if __name__ == '__main__':
     sys.exit(subprocess.Popen('GoodTests.py -n1 "%s" %s' %(sys.argv[0], ' '.join(['"%s"' %(arg.replace('"', '\\"'), ) for arg in sys.argv[1:]]) ), shell=True).wait())
@@ -0,0 +1,209 @@
+#!/usr/bin/env GoodTests.py
+
+# vim: set ts=4 st=4 sw=4 expandtab :
+'''
+    Test QueryBuilder, building and executing reusable queries
+
+'''
+
+import sys
+import subprocess
+
+from QueryableList import QueryableListObjs, QueryableListDicts, QueryableListMixed, QueryBuilder
+
+from tutils import DataObject
+
+
+class TestQueryBuilder(object):
+
+    def setup_class(self):
+        self.dataObjs = [
+            DataObject(a='one', b='two', num=7),
+            DataObject(a='one', b='five', num=-5),
+            DataObject(a='six', c='eleven', num=7),
+            DataObject(a='ten', b='five', num=3),
+        ]
+
+        self.dataDicts = [
+            { 'a' : 'one', 'b' : 'two', 'num' : 7 },
+            { 'a' : 'one', 'b' : 'five', 'num' : -5 },
+            { 'a' : 'six', 'c' : 'eleven', 'num' : 7 },
+            { 'a' : 'ten', 'b' : 'five', 'num' : 3 },
+        ]
+
+    def test_execute(self):
+        dataObjs = self.dataObjs
+        dataDicts = self.dataDicts
+
+        query = QueryBuilder()
+        query.addFilter(num__gt=0)
+        query.addFilter('OR', a='one', b='five')
+
+        results = query.execute(QueryableListObjs(dataObjs))
+        assert isinstance(results, QueryableListObjs) , 'Expected execute to return the same type as provided. Got: %s' %(results.__class__.__name__, )
+        assert list(results) == [ dataObjs[0], dataObjs[3] ] , 'Got unexpected results: %s' %(repr(results), )
+
+        # Same query, run again against different data and types
+        results = query.execute(QueryableListDicts(dataDicts))
+        assert isinstance(results, QueryableListDicts) , 'Expected execute to return the same type as provided. Got: %s' %(results.__class__.__name__, )
+        assert list(results) == [ dataDicts[0], dataDicts[3] ] , 'Got unexpected results: %s' %(repr(results), )
+
+        results = query.execute(dataDicts + dataObjs)
+        assert isinstance(results, QueryableListMixed) , 'Expected plain list to execute as QueryableListMixed. Got: %s' %(results.__class__.__name__, )
+        assert list(results) == [ dataDicts[0], dataDicts[3], dataObjs[0], dataObjs[3] ] , 'Got unexpected results: %s' %(repr(results), )
+
+    def test_manyLinks(self):
+        dataObjs = self.dataObjs
+
+        qlObjs = QueryableListObjs(dataObjs)
+
+        query = QueryBuilder()
+        query.addFilterAnd(num__gte=-5)
+        query.addFilterOr(a='one', b='five')
+        query.addFilterAnd(num__ne=7)
+        query.addFilterOr(c__isnull=True, a='six')
+        query.addFilterAnd(a__ne='six')
+
+        expected = qlObjs.filter(num__gte=-5).filterOr(a='one', b='five').filter(num__ne=7).filterOr(c__isnull=True, a='six').filter(a__ne='six')
+
+        results = query.execute(qlObjs)
+        assert list(results) == list(expected) , 'Expected executing the chain to match applying each link in turn.\nGot:      %s\nExpected: %s\n' %(repr(results), repr(expected))
+        assert list(results) == [ dataObjs[1], dataObjs[3] ] , 'Got unexpected results: %s' %(repr(results), )
+
+        # An OR link without any filters matches nothing
+        query.addFilterOr()
+        assert len(query.execute(qlObjs)) == 0 , 'Expected an empty OR link to match nothing'
+
+    def test_addFilterValidates(self):
+
+        query = QueryBuilder()
+
+        gotException = False
+        try:
+            query.addFilter(num__notAnOperation=5)
+        except ValueError:
+            gotException = True
+
+        assert gotException is True , 'Expected addFilter to raise ValueError on an unknown filter type'
+
+        gotException = False
+        try:
+            query.addFilter('XOR', num=5)
+        except ValueError:
+            gotException = True
+
+        assert gotException is True , 'Expected addFilter to raise ValueError on an unknown filter method'
+
+        assert len(query.filters) == 0 , 'Expected invalid filters to not be added'
+
+    def test_addAfterExecute(self):
+        dataObjs = self.dataObjs
+
+        qlObjs = QueryableListObjs(dataObjs)
+
+        query = QueryBuilder()
+        query.addFilterAnd(a='one')
+
+        results = query.execute(qlObjs)
+        assert list(results) == [ dataObjs[0], dataObjs[1] ] , 'Got unexpected results: %s' %(repr(results), )
+
+        query.addFilterAnd(num__lt=0)
+        results = query.execute(qlObjs)
+        assert list(results) == [ dataObjs[1] ] , 'Expected filter added after an execute to apply. Got: %s' %(repr(results), )
+
+    def test_copy(self):
+        dataObjs = self.dataObjs
+
+        qlObjs = QueryableListObjs(dataObjs)
+
+        query = QueryBuilder()
+        query.addFilterAnd(a='one')
+
+        queryCopy = query.copy()
+        queryCopy.addFilterAnd(b='five')
+
+        assert list(query.execute(qlObjs)) == [ dataObjs[0], dataObjs[1] ] , 'Expected filter added on copy to not change original'
+        assert list(queryCopy.execute(qlObjs)) == [ dataObjs[1] ] , 'Expected copy to have both filters'
+
+    def test_orderBy(self):
+        dataObjs = self.dataObjs
+
+        query = QueryBuilder()
+        query.addFilter(num__gt=0)
+        query.order_by('num', reverse=True)
+
+        qlObjs = QueryableListObjs(dataObjs)
+
+        assert list(query.execute(qlObjs)) == [ dataObjs[0], dataObjs[2], dataObjs[3] ] , 'Expected results in order, equal items keeping list order'
+        assert query.first(qlObjs) is dataObjs[0] , 'Expected first to return the first item in order'
+        assert list(query.stream(iter(dataObjs), QueryableListObjs)) == [ dataObjs[0], dataObjs[2], dataObjs[3] ] , 'Expected stream results in order'
+
+        queryCopy = query.copy()
+        queryCopy.order_by('num', limit=2)
+
+        assert list(queryCopy.execute(qlObjs)) == [ dataObjs[3], dataObjs[0] ] , 'Expected the first 2 items in order'
+        assert queryCopy.first(qlObjs) is dataObjs[3] , 'Expected first to return the first item in order'
+        assert len(query.execute(qlObjs)) == 3 , 'Expected ordering the copy to not change the original'
+
+        queryCopy.order_by('num', limit=0)
+        assert queryCopy.first(qlObjs) is None , 'Expected first with limit=0 to return None'
+
+        # Same as sort_by: "-" prefix for largest first, None values last
+        withNone = QueryableListObjs(dataObjs + [ DataObject(a='one', num=None) ])
+
+        query = QueryBuilder()
+        query.addFilter(a='one')
+        query.order_by('-num', limit=2)
+        assert list(query.execute(withNone)) == [ dataObjs[0], dataObjs[1] ] , 'Expected "-" prefix to order from largest to smallest'
+
+        query.order_by('num', nullsFirst=True)
+        assert list(query.execute(withNone)) == [ withNone[-1], dataObjs[1], dataObjs[0] ] , 'Expected None value first with nullsFirst'
+
+    def test_orderByLimitTerminals(self):
+        dataObjs = self.dataObjs
+
+        qlObjs = QueryableListObjs(dataObjs)
+
+        query = QueryBuilder()
+        query.addFilter(num__ne=None)
+        assert query.count(qlObjs) == 4 , 'Expected count of all 4 matches without a limit'
+
+        query.order_by('num', limit=2)
+        assert len(query.execute(qlObjs)) == 2 , 'Expected execute to return 2 items with limit=2'
+        assert query.count(qlObjs) == 2 , 'Expected count to match execute with limit=2. Got: %s' %(repr(query.count(qlObjs)), )
+        assert query.exists(qlObjs) is True , 'Expected exists with limit=2 to be True'
+
+        gotException = False
+        try:
+            query.get(qlObjs)
+        except ValueError:
+            gotException = True
+        assert gotException is True , 'Expected get to raise with 2 items after the limit'
+
+        query.order_by('num', limit=1)
+        assert query.count(qlObjs) == 1 , 'Expected count of 1 with limit=1'
+        assert query.get(qlObjs) is dataObjs[1] , 'Expected get with limit=1 to return the first item in order'
+
+        query.order_by('num', limit=10)
+        assert query.count(qlObjs) == 4 , 'Expected count of all 4 matches with a limit larger than the matches'
+
+        query.order_by('num', limit=0)
+        assert query.count(qlObjs) == 0 , 'Expected count of 0 with limit=0'
+        assert query.exists(qlObjs) is False , 'Expected exists with limit=0 to be False'
+        assert query.get(qlObjs) is None , 'Expected get with limit=0 to return None'
+
+    def test_noFilters(self):
+        dataObjs = self.dataObjs
+
+        qlObjs = QueryableListObjs(dataObjs)
+
+        results = QueryBuilder().execute(qlObjs)
+
+        assert list(results) == dataObjs , 'Expected a query with no filters to return everything'
+        assert results is not qlObjs , 'Expected execute to return a new collection'
+
+
+if __name__ == '__main__':
+    sys.exit(subprocess.Popen('GoodTests.py -n1 "%s" %s' %(sys.argv[0], ' '.join(['"%s"' %(arg.replace('"', '\\"'), ) for arg in sys.argv[1:]]) ), shell=True).wait())
+
+# vim: set ts=4 st=4 sw=4 expandtab :
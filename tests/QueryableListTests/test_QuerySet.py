@@ -0,0 +1,94 @@
+#!/usr/bin/env GoodTests.py
+
+# vim: set ts=4 st=4 sw=4 expandtab :
+'''
+    Test QuerySet, the lazy query returned by QueryableList.lazy()
+
+'''
+
+import sys
+import subprocess
+
+from QueryableList import QueryableListObjs, QuerySet
+
+from tutils import DataObject, CountingQueryableList
+
+
+class TestQuerySet(object):
+
+    def setup_method(self, testFunc):
+        self.dataObjs = [
+            DataObject(a='one', num=7),
+            DataObject(a='two', num=-5),
+            DataObject(a='three', num=12),
+            DataObject(a='four', num=3),
+            DataObject(a='five', num=None),
+        ]
+
+    def test_lazy(self):
+        dataObjs = self.dataObjs
+
+        lst = CountingQueryableList(dataObjs)
+        CountingQueryableList.numFetches = 0
+
+        query = lst.lazy().filter(num__isnull=False).filter(num__gt=0).filterOr(a='one', a__ne='three')
+
+        assert isinstance(query, QuerySet) , 'Expected lazy().filter to return a QuerySet. Got: %s' %(query.__class__.__name__, )
+        assert CountingQueryableList.numFetches == 0 , 'Expected nothing to be fetched before the results are needed'
+
+        assert len(query) == 2 , 'Expected 2 results. Got: %s' %(repr(query), )
+        assert list(query) == [ dataObjs[0], dataObjs[3] ] , 'Got unexpected results: %s' %(repr(query), )
+        assert query[1] is dataObjs[3] , 'Expected indexing to return results in order'
+        assert dataObjs[0] in query , 'Expected "in" to check the results'
+        assert query.count() == 2 , 'Expected count() to be the number of results'
+
+        numFetches = CountingQueryableList.numFetches
+        list(query)
+        assert CountingQueryableList.numFetches == numFetches , 'Expected results to be kept after the first evaluation'
+
+        results = query.all()
+        assert results.__class__ == CountingQueryableList , 'Expected all() to return the type of the queried list'
+        assert list(results) == [ dataObjs[0], dataObjs[3] ] , 'Got unexpected results from all(): %s' %(repr(results), )
+
+    def test_chainDoesNotModify(self):
+        dataObjs = self.dataObjs
+
+        base = QueryableListObjs(dataObjs).lazy().filter(num__isnull=False, num__gte=3)
+        narrower = base.filter(num__lt=10)
+
+        assert len(base) == 3 , 'Expected adding a filter to return a new QuerySet, not modify the original. Got: %s' %(repr(base), )
+        assert len(narrower) == 2 , 'Got unexpected results: %s' %(repr(narrower), )
+
+        assert not QueryableListObjs(dataObjs).lazy().filter(a='nope') , 'Expected a QuerySet with no results to be False'
+
+    def test_sortBy(self):
+        dataObjs = self.dataObjs
+
+        query = QueryableListObjs(dataObjs).lazy().sort_by('num', reverse=True).filter(num__isnull=False)
+
+        assert list(query) == [ dataObjs[2], dataObjs[0], dataObjs[3], dataObjs[1] ] , 'Expected filters to apply before sorting. Got: %s' %(repr(query), )
+
+    def test_evaluatedWhenNeeded(self):
+        lst = QueryableListObjs(self.dataObjs)
+
+        query = lst.lazy().filter(a='six')
+
+        newObj = DataObject(a='six', num=6)
+        lst.append(newObj)
+
+        assert list(query) == [ newObj ] , 'Expected the list contents at evaluation time to be used. Got: %s' %(repr(query), )
+
+    def test_invalidFilter(self):
+        gotException = False
+        try:
+            QueryableListObjs(self.dataObjs).lazy().filter(a__notAFilter='x')
+        except ValueError:
+            gotException = True
+
+        assert gotException is True , 'Expected ValueError when the filter is added, not when it runs'
+
+
+if __name__ == '__main__':
+    sys.exit(subprocess.Popen('GoodTests.py -n1 "%s" %s' %(sys.argv[0], ' '.join(['"%s"' %(arg.replace('"', '\\"'), ) for arg in sys.argv[1:]]) ), shell=True).wait())
+
+# vim: set ts=4 st=4 sw=4 expandtab :
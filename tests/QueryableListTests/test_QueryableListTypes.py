@@ -5,7 +5,7 @@
 import sys
 import subprocess
 
-from QueryableList import QueryableListObjs, QueryableListDicts, QueryableListMixed
+from QueryableList import QueryableListObjs, QueryableListDicts, QueryableListMixed, QueryBuilder
 
 
 class DataObject(object):
@@ -103,7 +103,143 @@ class TestQueryableListTypes(object):
         assert gotException is False, 'Got Exception for QueryableListMixed on dicts when should not have: %s%s' %(str(type(e)), str(e)) 
         assert len(found) == 2, 'Did not find correct number of items'
 
+    def test_fieldGetters(self):
+        objs = QueryableListObjs(self.dataObjs + [ DataObject(b='missing a') ])
+        getA = objs._get_field_getter('a')
+        assert [ getA(item) for item in objs ] == [ 'one', 'one', 'six', None ] , 'Wrong values from the QueryableListObjs field getter'
+        assert objs._get_column('a') == [ 'one', 'one', 'six', None ] , 'Wrong values from the QueryableListObjs column'
 
+        dicts = QueryableListDicts(self.dataDicts + [ { 'b' : 'missing a' } ])
+        getA = dicts._get_field_getter('a')
+        assert [ getA(item) for item in dicts ] == [ 'one', 'one', 'six', None ] , 'Wrong values from the QueryableListDicts field getter'
+        assert dicts._get_column('a') == [ 'one', 'one', 'six', None ] , 'Wrong values from the QueryableListDicts column'
+
+    def test_fieldGettersContainsOnly(self):
+        class ContainsOnly(object):
+            '''
+                Implements __getitem__ and __contains__, but does not raise KeyError on a missing key
+            '''
+            def __init__(self, **kwargs):
+                self.values = kwargs
+
+            def __contains__(self, key):
+                return key in self.values
+
+            def __getitem__(self, key):
+                return self.values.get(key, 'not None')
+
+        dicts = QueryableListDicts([ ContainsOnly(a=1), ContainsOnly(b=2) ])
+        assert dicts._get_column('a') == [ 1, None ] , 'Expected "in" to be checked for items which are not dicts'
+        assert len(dicts.filter(a__isnull=True)) == 1 , 'Expected "in" to be checked for items which are not dicts'
+
+    def test_fieldGettersSubclass(self):
+        class UpperObjs(QueryableListObjs):
+            @staticmethod
+            def _get_item_value(item, fieldName):
+                return getattr(item, fieldName.lower(), None)
+
+        objs = UpperObjs(self.dataObjs)
+        assert objs._get_column('A') == [ 'one', 'one', 'six' ] , 'Expected a subclass with its own _get_item_value to use it for columns'
+        assert len(objs.filter(A='one')) == 2 , 'Expected a subclass with its own _get_item_value to use it for filters'
+        assert [ x.a for x in objs.sort_by('-A') ] == [ 'six', 'one', 'one' ] , 'Expected a subclass with its own _get_item_value to use it for sorting'
+
+
+
+    def test_mixedPromotion(self):
+        mixedDicts = QueryableListMixed(self.dataDicts)
+        assert mixedDicts._getFieldAccessType() is QueryableListDicts , 'Expected QueryableListMixed of only dicts to use QueryableListDicts access'
+
+        mixedObjs = QueryableListMixed(self.dataObjs)
+        assert mixedObjs._getFieldAccessType() is QueryableListObjs , 'Expected QueryableListMixed of only objects to use QueryableListObjs access'
+
+        mixed = QueryableListMixed(self.dataDicts + self.dataObjs)
+        assert mixed._getFieldAccessType() is QueryableListMixed , 'Expected QueryableListMixed of dicts and objects to not be promoted'
+
+        assert QueryableListMixed()._getFieldAccessType() is QueryableListMixed , 'Expected an empty QueryableListMixed to not be promoted'
+
+        for lst in (mixedDicts, mixedObjs, mixed):
+            found = lst.filter(a='one', b__isnull=False)
+            assert found.__class__ is QueryableListMixed , 'Expected results to still be a QueryableListMixed'
+            assert len(found) == len(lst) // 3 * 2 , 'Did not find correct number of items'
+            assert lst._get_column('c') == [ None, None, 'eleven' ] * (len(lst) // 3) , 'Wrong column values'
+
+            query = QueryBuilder()
+            query.addFilter(a='six')
+            assert len(query.execute(list(lst))) == len(lst) // 3 , 'Did not find correct number of items with QueryBuilder'
+
+    def test_mixedPromotionModified(self):
+        lst = QueryableListMixed(self.dataDicts)
+        assert lst._getFieldAccessType() is QueryableListDicts , 'Expected QueryableListMixed of only dicts to use QueryableListDicts access'
+
+        lst.append(DataObject(a='one', b='two'))
+        assert lst._getFieldAccessType() is QueryableListMixed , 'Expected the promoted type to be checked again after append'
+        assert len(lst.filter(a='one')) == 3 , 'Expected the appended object to be found'
+
+        del lst[-1]
+        assert lst._getFieldAccessType() is QueryableListDicts , 'Expected the promoted type to be checked again after del'
+
+        lst[:] = self.dataObjs
+        assert lst._getFieldAccessType() is QueryableListObjs , 'Expected the promoted type to be checked again after setting a slice'
+
+    def test_mixedNotTrackedUntilQueried(self):
+        lst = QueryableListMixed()
+        for dataDict in self.dataDicts:
+            lst.append(dataDict)
+
+        assert type(lst) is QueryableListMixed , 'Expected a QueryableListMixed which was never queried to not record its modifications'
+
+        assert len(lst.filter(a='one')) == 2 , 'Expected to find two items'
+        lst.append(DataObject(a='one', b='two'))
+        assert len(lst.filter(a='one')) == 3 , 'Expected the promoted type to be checked again after the first query'
+
+    def test_mixedPromotionUsedByProjections(self):
+        class CountingMixed(QueryableListMixed):
+            numGetters = 0
+
+            @classmethod
+            def _get_field_getter(cls, fieldName):
+                CountingMixed.numGetters += 1
+                return super(CountingMixed, cls)._get_field_getter(fieldName)
+
+        lst = CountingMixed(self.dataDicts)
+
+        assert lst.values('a', 'c') == [ {'a' : 'one', 'c' : None}, {'a' : 'one', 'c' : None}, {'a' : 'six', 'c' : 'eleven'} ] , 'Wrong values'
+        assert lst.values_list('a', 'b') == [ ('one', 'two'), ('one', 'five'), ('six', None) ] , 'Wrong values_list'
+        assert len(lst.distinct('a')) == 2 , 'Expected two distinct values of "a"'
+        assert list(lst.group_by('a').keys()) == [ 'one', 'six' ] , 'Wrong groups'
+        assert lst.aggregate('c__count') == {'c__count' : 1} , 'Wrong aggregate'
+        assert len(list(lst.join(lst, on='a'))) == 5 , 'Wrong number of joined pairs'
+        assert [ x.get('b') for x in lst.sort_by('b') ] == [ 'five', 'two', None ] , 'Wrong order'
+
+        assert CountingMixed.numGetters == 0 , 'Expected a QueryableListMixed of only dicts to use the QueryableListDicts getters, but its own were used %d times' %(CountingMixed.numGetters, )
+
+    def test_mixedTypesNotKept(self):
+        import gc
+        import weakref
+
+        class RuntimeObject(object):
+            def __init__(self, a):
+                self.a = a
+
+        lst = QueryableListMixed([ RuntimeObject('one'), RuntimeObject('two') ])
+        assert len(lst.filter(a='one')) == 1 , 'Expected to find one item'
+
+        typeRef = weakref.ref(RuntimeObject)
+        del lst, RuntimeObject
+        gc.collect()
+
+        assert typeRef() is None , 'Expected a type only used by discarded items to not be kept alive by QueryableListMixed'
+
+    def test_mixedPromotionSubclass(self):
+        class UpperMixed(QueryableListMixed):
+            @staticmethod
+            def _get_item_value(item, fieldName):
+                return QueryableListMixed._get_item_value(item, fieldName.lower())
+
+        lst = UpperMixed(self.dataDicts)
+        assert lst._getFieldAccessType() is UpperMixed , 'Expected a subclass with its own _get_item_value to not be promoted'
+        assert len(lst.filter(A='one')) == 2 , 'Expected a subclass with its own _get_item_value to use it'
+        assert lst._get_column('C') == [ None, None, 'eleven' ] , 'Expected a subclass with its own _get_item_value to use it for columns'
 
 
 if __name__ == '__main__':
@@ -0,0 +1,131 @@
+#!/usr/bin/env GoodTests.py
+
+# vim: set ts=4 st=4 sw=4 expandtab :
+'''
+    Test first, exists, and get, which stop as soon as they have their answer, and count_where
+
+'''
+
+import sys
+import subprocess
+
+from QueryableList import QueryBuilder
+
+from tutils import DataObject, CountingQueryableList
+
+
+class TestSingleMatch(object):
+
+    def setup_method(self, testFunc):
+        self.dataObjs = [
+            DataObject(a='one', num=7),
+            DataObject(a='two', num=-5),
+            DataObject(a='three', num=12),
+            DataObject(a='two', num=3),
+            DataObject(a='five', num=9),
+        ]
+
+        CountingQueryableList.numFetches = 0
+
+    def test_first(self):
+        dataObjs = self.dataObjs
+        lst = CountingQueryableList(dataObjs)
+
+        found = lst.first(a='two')
+        assert found is dataObjs[1] , 'Expected first match. Got: %s' %(repr(found), )
+        assert CountingQueryableList.numFetches == 2 , 'Expected to stop at the first match. Fetched %d' %(CountingQueryableList.numFetches, )
+
+        assert lst.first(a='nope') is None , 'Expected None when nothing matches'
+
+    def test_exists(self):
+        lst = CountingQueryableList(self.dataObjs)
+
+        assert lst.exists(num__gt=0) is True , 'Expected exists to be True'
+        assert CountingQueryableList.numFetches == 1 , 'Expected to stop at the first match. Fetched %d' %(CountingQueryableList.numFetches, )
+
+        assert lst.exists(num__gt=100) is False , 'Expected exists to be False'
+
+    def test_get(self):
+        dataObjs = self.dataObjs
+        lst = CountingQueryableList(dataObjs)
+
+        found = lst.get(a='three')
+        assert found is dataObjs[2] , 'Expected the matching item. Got: %s' %(repr(found), )
+
+        assert lst.get(a='nope') is None , 'Expected None when nothing matches'
+
+        CountingQueryableList.numFetches = 0
+        gotException = False
+        try:
+            lst.get(a='two')
+        except ValueError:
+            gotException = True
+
+        assert gotException is True , 'Expected ValueError when more than one item matches'
+        assert CountingQueryableList.numFetches == 4 , 'Expected to stop at the second match. Fetched %d' %(CountingQueryableList.numFetches, )
+
+    def test_countWhere(self):
+        dataObjs = self.dataObjs
+        lst = CountingQueryableList(dataObjs)
+
+        assert lst.count_where(a='two') == 2 , 'Expected 2 matches'
+        assert lst.count_where(a='two', num__gt=0) == 1 , 'Expected 1 match'
+        assert lst.count_where(a='nope') == 0 , 'Expected 0 matches'
+
+        lst.create_index('a')
+        CountingQueryableList.numFetches = 0
+
+        assert lst.count_where(a='two') == 2 , 'Expected 2 matches with an index'
+        assert CountingQueryableList.numFetches == 0 , 'Expected an indexed count to not fetch any values. Fetched %d' %(CountingQueryableList.numFetches, )
+
+        assert lst.count_where(a='two', num__gt=0) == 1 , 'Expected 1 match with an index'
+
+        query = QueryBuilder()
+        query.addFilterAnd(num__gt=0)
+        query.addFilterOr(a='two', a__ieq='FIVE')
+
+        assert query.count(lst) == 2 , 'Expected QueryBuilder.count to count 2 matches'
+        assert query.count(dataObjs) == 2 , 'Expected QueryBuilder.count to work on a plain list'
+        assert query.count(lst, useCache=True) == 2 , 'Expected QueryBuilder.count to work with useCache'
+
+    def test_indexed(self):
+        dataObjs = self.dataObjs
+        lst = CountingQueryableList(dataObjs)
+        lst.create_index('a')
+
+        assert lst.first(a='two') is dataObjs[1] , 'Expected first match in list order with an index'
+        assert lst.get(a='five') is dataObjs[4] , 'Expected get to use the index'
+        assert lst.exists(a='six') is False , 'Expected exists to be False'
+
+        assert CountingQueryableList.numFetches == len(dataObjs) , 'Expected only the fetches to build the index. Fetched %d' %(CountingQueryableList.numFetches, )
+
+    def test_queryBuilder(self):
+        dataObjs = self.dataObjs
+        lst = CountingQueryableList(dataObjs)
+
+        query = QueryBuilder()
+        query.addFilterAnd(num__gt=0)
+        query.addFilterOr(a='two', a__ieq='FIVE')
+
+        assert query.first(lst) is dataObjs[3] , 'Got unexpected first match'
+        assert query.exists(lst) is True , 'Expected exists to be True'
+
+        gotException = False
+        try:
+            query.get(lst)
+        except ValueError:
+            gotException = True
+        assert gotException is True , 'Expected ValueError when more than one item matches'
+
+        query.addFilter(num__lt=5)
+        assert query.get(dataObjs) is dataObjs[3] , 'Expected get to work on a plain list'
+
+        query.addFilter(a='one')
+        assert query.first(lst) is None , 'Expected None when nothing matches'
+        assert query.exists(lst) is False , 'Expected exists to be False'
+
+
+if __name__ == '__main__':
+    sys.exit(subprocess.Popen('GoodTests.py -n1 "%s" %s' %(sys.argv[0], ' '.join(['"%s"' %(arg.replace('"', '\\"'), ) for arg in sys.argv[1:]]) ), shell=True).wait())
+
+# vim: set ts=4 st=4 sw=4 expandtab :
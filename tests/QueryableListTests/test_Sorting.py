@@ -10,7 +10,7 @@ import copy
 import sys
 import subprocess
 
-from QueryableList import QueryableListObjs, QueryableListDicts, QueryableListMixed
+from QueryableList import QueryableListObjs, QueryableListDicts, QueryableListMixed, QueryBuilder
 
 from tutils import DataObject
 
@@ -159,6 +159,196 @@ class TestSorting(object):
 
         assert isinstance(sortedByBRev, QueryableListDicts) , 'Expected return to be a QueryableListDicts instance. Got: %s' %(sortedByBRev.__class__.__name__, )
 
+    def test_sortMultipleFields(self):
+        dataDicts = [
+            { 'p' : 2, 'c' : 'b', 'n' : 1 },
+            { 'p' : 1, 'c' : 'a', 'n' : 2 },
+            { 'p' : 2, 'c' : 'a', 'n' : 3 },
+            { 'p' : 1, 'c' : 'b', 'n' : 4 },
+            { 'p' : 2, 'c' : 'a', 'n' : 5 },
+        ]
+
+        qlDicts = QueryableListDicts(dataDicts)
+
+        def getNums(lst):
+            return [ item['n'] for item in lst ]
+
+        results = qlDicts.sort_by('p', 'c')
+        assert getNums(results) == [2, 4, 3, 5, 1] , 'Got unexpected order for sort_by("p", "c"): %s' %(repr(getNums(results)), )
+
+        results = qlDicts.sort_by('-p', 'c')
+        assert getNums(results) == [3, 5, 1, 2, 4] , 'Got unexpected order for sort_by("-p", "c"): %s' %(repr(getNums(results)), )
+
+        results = qlDicts.sort_by('p', '-c')
+        assert getNums(results) == [4, 2, 1, 3, 5] , 'Got unexpected order for sort_by("p", "-c"): %s' %(repr(getNums(results)), )
+
+        results = qlDicts.sort_by('p', 'c', reverse=True)
+        assert getNums(results) == [1, 3, 5, 4, 2] , 'Got unexpected order for sort_by("p", "c", reverse=True): %s' %(repr(getNums(results)), )
+
+        # Old positional reverse
+        results = qlDicts.sort_by('p', True)
+        assert getNums(results) == [1, 3, 5, 2, 4] , 'Got unexpected order for sort_by("p", True): %s' %(repr(getNums(results)), )
+
+        assert isinstance(results, QueryableListDicts) , 'Expected return to be a QueryableListDicts instance. Got: %s' %(results.__class__.__name__, )
+
+        gotException = False
+        try:
+            qlDicts.sort_by()
+        except ValueError:
+            gotException = True
+
+        assert gotException is True , 'Expected ValueError when no field is given'
+
+    def test_sortDictsByNonStringKey(self):
+        qlDicts = QueryableListDicts([ {0 : 2, 1 : 'b'}, {0 : 1, 1 : 'c'}, {0 : 3, 1 : 'a'} ])
+
+        results = qlDicts.sort_by(0)
+        assert [ item[0] for item in results ] == [1, 2, 3] , 'Expected sort_by(0) to sort on the int key 0. Got: %s' %(repr(list(results)), )
+
+        results = qlDicts.sort_by(0, reverse=True)
+        assert [ item[0] for item in results ] == [3, 2, 1] , 'Expected sort_by(0, reverse=True) to sort on the int key 0 from largest to smallest. Got: %s' %(repr(list(results)), )
+
+        results = qlDicts.sort_by(1, 0)
+        assert [ item[0] for item in results ] == [3, 2, 1] , 'Expected sort_by(1, 0) to sort on the int key 1 first. Got: %s' %(repr(list(results)), )
+
+        results = qlDicts.order_by(0, limit=2)
+        assert [ item[0] for item in results ] == [1, 2] , 'Expected order_by(0, limit=2) to order on the int key 0. Got: %s' %(repr(list(results)), )
+
+    def test_sortFieldNameKeyword(self):
+        qlObjs = QueryableListObjs(self.dataObjs)
+
+        for reverse in (False, True):
+            expected = list(qlObjs.sort_by('a', reverse=reverse))
+
+            results = qlObjs.sort_by(fieldName='a', reverse=reverse)
+            assert list(results) == expected , 'Expected sort_by(fieldName=..) to match sort_by with a positional field (reverse=%s)' %(reverse, )
+
+            results = qlObjs.lazy().sort_by(fieldName='a', reverse=reverse)
+            assert list(results) == expected , 'Expected QuerySet.sort_by to forward fieldName (reverse=%s)' %(reverse, )
+
+    def test_sortNone(self):
+        dataObjs = [
+            DataObject(a=3, n=1),
+            DataObject(a=None, n=2),
+            DataObject(a=1, n=3),
+            DataObject(n=4),
+        ]
+
+        qlObjs = QueryableListObjs(dataObjs)
+
+        def getNums(lst):
+            return [ item.n for item in lst ]
+
+        results = qlObjs.sort_by('a')
+        assert getNums(results) == [3, 1, 2, 4] , 'Expected None to be last by default. Got: %s' %(repr(getNums(results)), )
+
+        results = qlObjs.sort_by('a', reverse=True)
+        assert getNums(results) == [1, 3, 2, 4] , 'Expected None to be last when reversed. Got: %s' %(repr(getNums(results)), )
+
+        results = qlObjs.sort_by('-a', nullsFirst=True)
+        assert getNums(results) == [2, 4, 1, 3] , 'Expected None to be first with nullsFirst. Got: %s' %(repr(getNums(results)), )
+
+        results = qlObjs.sort_by('a', nullsFirst=True)
+        assert getNums(results) == [2, 4, 3, 1] , 'Expected None to be first with nullsFirst. Got: %s' %(repr(getNums(results)), )
+
+    def test_orderBy(self):
+        dataObjs = self.dataObjs + [ DataObject(a=7, b='zzz') ]
+
+        qlObjs = QueryableListObjs(dataObjs)
+
+        for reverse in (False, True):
+            expectedList = list(qlObjs.sort_by('a', reverse=reverse))
+
+            ordered = qlObjs.order_by('a', reverse=reverse)
+            assert list(ordered) == expectedList , 'Expected order_by to match sort_by (reverse=%s)' %(reverse, )
+            assert isinstance(ordered, QueryableListObjs) , 'Expected return to be a QueryableListObjs instance. Got: %s' %(ordered.__class__.__name__, )
+
+            for limit in (0, 1, 3, 4, 10):
+                ordered = qlObjs.order_by('a', reverse=reverse, limit=limit)
+                assert list(ordered) == expectedList[:limit] , 'Expected order_by with limit=%d to match the first items of sort_by (reverse=%s).\nGot:      %s\nExpected: %s\n' %(limit, reverse, repr(self._get_list_of_values(ordered, 'b')), repr(self._get_list_of_values(expectedList[:limit], 'b')))
+
+        assert list(qlObjs) == dataObjs , 'Expected order_by to not modify original list'
+
+    def test_orderByLikeSortBy(self):
+        dataObjs = [
+            DataObject(a=3, n=1),
+            DataObject(a=None, n=2),
+            DataObject(a=1, n=3),
+            DataObject(n=4),
+            DataObject(a=3, n=5),
+            DataObject(a=8, n=6),
+        ]
+
+        qlObjs = QueryableListObjs(dataObjs)
+
+        def getNums(lst):
+            return [ item.n for item in lst ]
+
+        # None values, a "-" prefix, and nullsFirst give the same order as sort_by, with or without a limit
+        for fieldName in ('a', '-a'):
+            for reverse in (False, True):
+                for nullsFirst in (False, True):
+                    expected = getNums(qlObjs.sort_by(fieldName, reverse=reverse, nullsFirst=nullsFirst))
+
+                    for limit in (None, 0, 2, 5, 10):
+                        ordered = getNums(qlObjs.order_by(fieldName, reverse=reverse, limit=limit, nullsFirst=nullsFirst))
+                        assert ordered == expected[:limit] , 'Expected order_by(%s, reverse=%s, limit=%s, nullsFirst=%s) to match sort_by.\nGot:      %s\nExpected: %s\n' %(repr(fieldName), reverse, repr(limit), nullsFirst, repr(ordered), repr(expected[:limit]))
+
+        results = qlObjs.order_by('-a', limit=2)
+        assert getNums(results) == [6, 1] , 'Expected "-" prefix to order from largest to smallest. Got: %s' %(repr(getNums(results)), )
+
+
+    def test_orderByMultipleFields(self):
+        dataObjs = [
+            DataObject(p=2, c=1, n=1),
+            DataObject(p=1, c=None, n=2),
+            DataObject(p=2, c=3, n=3),
+            DataObject(p=None, c=2, n=4),
+            DataObject(p=1, c=5, n=5),
+        ]
+
+        qlObjs = QueryableListObjs(dataObjs)
+
+        def getNums(lst):
+            return [ item.n for item in lst ]
+
+        # Same and mixed directions, with or without a limit, the same as sort_by. Also through QueryBuilder, from a generator.
+        for fieldNames in ( ('p', 'c'), ('-p', '-c'), ('p', '-c'), ('-p', 'c') ):
+            for reverse in (False, True):
+                expected = getNums(qlObjs.sort_by(*fieldNames, reverse=reverse))
+
+                query = QueryBuilder()
+                for limit in (None, 0, 2, 10):
+                    ordered = getNums(qlObjs.order_by(*fieldNames, reverse=reverse, limit=limit))
+                    assert ordered == expected[:limit] , 'Expected order_by(%s, reverse=%s, limit=%s) to match sort_by.\nGot:      %s\nExpected: %s\n' %(repr(fieldNames), reverse, repr(limit), repr(ordered), repr(expected[:limit]))
+
+                    query.order_by(*fieldNames, reverse=reverse, limit=limit)
+                    ordered = getNums(query.stream(iter(dataObjs), QueryableListObjs))
+                    assert ordered == expected[:limit] , 'Expected QueryBuilder.order_by(%s, reverse=%s, limit=%s) to match sort_by.\nGot:      %s\nExpected: %s\n' %(repr(fieldNames), reverse, repr(limit), repr(ordered), repr(expected[:limit]))
+
+        gotException = False
+        try:
+            qlObjs.order_by()
+        except ValueError:
+            gotException = True
+
+        assert gotException is True , 'Expected ValueError when no field is given'
+
+    def test_sortOldReverse(self):
+        qlObjs = QueryableListObjs(self.dataObjs)
+
+        expected = list(qlObjs.sort_by('a', reverse=True))
+        for reverse in (True, 1):
+            assert list(qlObjs.sort_by('a', reverse)) == expected , 'Expected old form sort_by("a", %s) to sort in reverse' %(repr(reverse), )
+
+        expected = list(qlObjs.sort_by('a'))
+        for reverse in (False, 0):
+            assert list(qlObjs.sort_by('a', reverse)) == expected , 'Expected old form sort_by("a", %s) to not sort in reverse' %(repr(reverse), )
+
+        # With reverse as a keyword, a second positional argument is a field
+        qlDicts = QueryableListDicts([ {0 : 1, 1 : 'b'}, {0 : 1, 1 : 'a'}, {0 : 0, 1 : 'c'} ])
+        assert [ item[1] for item in qlDicts.sort_by(0, 1, reverse=False) ] == ['c', 'a', 'b'] , 'Expected sort_by(0, 1, reverse=False) to sort on the int keys 0 and 1'
+
 
 if __name__ == '__main__':
     sys.exit(subprocess.Popen('GoodTests.py -n1 "%s" %s' %(sys.argv[0], ' '.join(['"%s"' %(arg.replace('"', '\\"'), ) for arg in sys.argv[1:]]) ), shell=True).wait())
@@ -253,6 +253,129 @@ class TestSpecialOps(object):
         assert origID1 == afterID1 , 'Expected id to not change after iadd (i.e. a copy was not made.)\nBefore = %d\nAfter  = %d' %(origID1, afterID1)
         testHasItems(origRef1, gdd(self, set3Nums), 'd1ref = ' + mkNumSet('d', set3Nums) )
 
+    def test_or(self):
+        set1Nums = [0, 1, 1, 3]
+        set2Nums = [3, 5, 2, 5]
+        set3Nums = [0, 1, 1, 3, 5, 2, 5]
+        # |= checks each item against the list as it grows, so the repeated 5 is only appended once
+        set4Nums = [0, 1, 1, 3, 5, 2]
+
+        for (listType, gdx, typeCh) in ( (QueryableListObjs, gdo, 'o'), (QueryableListDicts, gdd, 'd') ):
+            q1 = listType( gdx(self, set1Nums) )
+            q2 = listType( gdx(self, set2Nums) )
+
+            orRes = q1 | q2
+            assert list(orRes) == gdx(self, set3Nums) , 'Expected %s in order' %(mkOpStr(typeCh, set1Nums, '|', set2Nums, set3Nums), )
+            assert orRes.__class__ == listType , 'Expected | to return the same type'
+            assert list(q1) == gdx(self, set1Nums) , 'Expected | to not modify the original'
+
+            q1 |= q2
+            assert list(q1) == gdx(self, set4Nums) , 'Expected %s in order' %(mkOpStr(typeCh, set1Nums, '|=', set2Nums, set4Nums), )
+
+    def test_and(self):
+        set1Nums = [0, 1, 5, 1, 3]
+        set2Nums = [3, 1]
+        set3Nums = [1, 1, 3]
+
+        for (listType, gdx, typeCh) in ( (QueryableListObjs, gdo, 'o'), (QueryableListDicts, gdd, 'd') ):
+            q1 = listType( gdx(self, set1Nums) )
+            q2 = listType( gdx(self, set2Nums) )
+
+            andRes = q1 & q2
+            assert list(andRes) == gdx(self, set3Nums) , 'Expected %s in order' %(mkOpStr(typeCh, set1Nums, '&', set2Nums, set3Nums), )
+            assert andRes.__class__ == listType , 'Expected & to return the same type'
+            assert list(q1) == gdx(self, set1Nums) , 'Expected & to not modify the original'
+
+    def test_xor(self):
+        set1Nums = [0, 1, 5, 1, 3]
+        set2Nums = [4, 1, 3, 2]
+        set3Nums = [0, 5, 1, 4, 2]
+
+        for (listType, gdx, typeCh) in ( (QueryableListObjs, gdo, 'o'), (QueryableListDicts, gdd, 'd') ):
+            q1 = listType( gdx(self, set1Nums) )
+            q2 = listType( gdx(self, set2Nums) )
+
+            xorRes = q1 ^ q2
+            assert list(xorRes) == gdx(self, set3Nums) , 'Expected %s in order' %(mkOpStr(typeCh, set1Nums, '^', set2Nums, set3Nums), )
+            assert xorRes.__class__ == listType , 'Expected ^ to return the same type'
+            assert list(q1) == gdx(self, set1Nums) , 'Expected ^ to not modify the original'
+
+    def test_iand(self):
+        # Adjacent items to remove, which removing while iterating would skip
+        set1Nums = [0, 1, 2, 5, 1, 3, 4]
+        set2Nums = [3, 1]
+        set3Nums = [1, 1, 3]
+
+        for (listType, gdx, typeCh) in ( (QueryableListObjs, gdo, 'o'), (QueryableListDicts, gdd, 'd') ):
+            q1 = listType( gdx(self, set1Nums) )
+            q2 = listType( gdx(self, set2Nums) )
+            origID1 = id(q1)
+
+            q1 &= q2
+            assert list(q1) == gdx(self, set3Nums) , 'Expected %s in order. Got: %s' %(mkOpStr(typeCh, set1Nums, '&=', set2Nums, set3Nums), repr(q1))
+            assert id(q1) == origID1 , 'Expected &= to modify the list in place'
+            assert list(q2) == gdx(self, set2Nums) , 'Expected &= to not modify the other list'
+
+    def test_ixor(self):
+        set1Nums = [0, 1, 5, 1, 3]
+        set2Nums = [4, 1, 3, 2]
+        set3Nums = [0, 5, 1, 4, 2]
+
+        for (listType, gdx, typeCh) in ( (QueryableListObjs, gdo, 'o'), (QueryableListDicts, gdd, 'd') ):
+            q1 = listType( gdx(self, set1Nums) )
+            q2 = listType( gdx(self, set2Nums) )
+            origID1 = id(q1)
+
+            q1 ^= q2
+            assert list(q1) == gdx(self, set3Nums) , 'Expected %s in order. Got: %s' %(mkOpStr(typeCh, set1Nums, '^=', set2Nums, set3Nums), repr(q1))
+            assert id(q1) == origID1 , 'Expected ^= to modify the list in place'
+
+    def test_inplaceIndexed(self):
+        q1 = QueryableListObjs( gdo(self, [0, 1, 2, 3]) )
+        q1.create_index('a')
+
+        assert len(q1.filter(a='two')) == 1 , 'Expected to find item before -='
+
+        q1 -= q1.filter(a='two')
+        assert len(q1.filter(a='two')) == 0 , 'Expected index to be rebuilt after -='
+
+        q1 &= q1.filter(a__in=['one', 'four'])
+        assert list(q1.filter(a='one')) == gdo(self, [0]) , 'Expected index to be rebuilt after &='
+
+    def test_unhashableItems(self):
+        dicts = [ { 'a' : 'one' }, { 'a' : 'two' }, { 'a' : 'three' } ]
+        equalDict = { 'a' : 'one' }
+
+        q1 = QueryableListDicts( dicts )
+        q2 = QueryableListDicts( [ dicts[2], equalDict ] )
+
+        assert list(q1 - q2) == [ dicts[0], dicts[1] ] , 'Expected unhashable items to be matched by identity in -'
+        assert list(q1 & q2) == [ dicts[2] ] , 'Expected unhashable items to be matched by identity in &'
+        assert list(q1 | q2) == dicts + [ equalDict ] , 'Expected unhashable items to be matched by identity in |'
+        assert list(q1 ^ q2) == [ dicts[0], dicts[1], equalDict ] , 'Expected unhashable items to be matched by identity in ^'
+
+    def test_distinct(self):
+        items = [ 1, 2, 1, 3, 2, 'a', 'a' ]
+        result = QueryableListObjs(items).distinct()
+        assert list(result) == [ 1, 2, 3, 'a' ] , 'Expected first occurrences in order, but got: %s' %(repr(list(result)), )
+        assert issubclass(result.__class__, QueryableListObjs) , 'Expected distinct to return the same type'
+
+        dicts = [ { 'a' : 1, 'b' : 'x' }, { 'a' : 2, 'b' : 'x' }, { 'a' : 1, 'b' : 'y' }, { 'a' : 1, 'b' : 'x' }, { 'b' : 'z' } ]
+        lst = QueryableListDicts(dicts)
+
+        assert list(lst.distinct('a')) == [ dicts[0], dicts[1], dicts[4] ] , 'Expected distinct on one field to keep the first item of each value'
+        assert list(lst.distinct('a', 'b')) == [ dicts[0], dicts[1], dicts[2], dicts[4] ] , 'Expected distinct on two fields to match on both'
+
+        # Unhashable items are only duplicates if they are the same object
+        result = QueryableListDicts([ dicts[0], dicts[0], dicts[3] ]).distinct()
+        assert list(result) == [ dicts[0], dicts[3] ] , 'Expected unhashable items to be matched by identity in distinct'
+
+        tags = [ 'one', 'two' ]
+        objs = [ DataObject(tags=tags, n=1), DataObject(tags=tags, n=2), DataObject(tags=[ 'one', 'two' ], n=2) ]
+        lst = QueryableListObjs(objs)
+        assert list(lst.distinct('tags')) == [ objs[0], objs[2] ] , 'Expected unhashable field values to be matched by identity in distinct'
+        assert list(lst.distinct('tags', 'n')) == objs , 'Expected unhashable field values to be matched by identity in distinct on two fields'
+
 
 if __name__ == '__main__':
     sys.exit(subprocess.Popen('GoodTests.py -n1 "%s" %s' %(sys.argv[0], ' '.join(['"%s"' %(arg.replace('"', '\\"'), ) for arg in sys.argv[1:]]) ), shell=True).wait())
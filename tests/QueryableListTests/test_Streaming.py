@@ -0,0 +1,83 @@
+#!/usr/bin/env GoodTests.py
+
+# vim: set ts=4 st=4 sw=4 expandtab :
+'''
+    Test filtering any iterable without loading it into a list (ifilter, ifilterOr, QueryBuilder.stream)
+
+'''
+
+import sys
+import subprocess
+
+from QueryableList import QueryableListObjs, QueryableListDicts, QueryBuilder
+
+from tutils import DataObject
+
+
+class TestStreaming(object):
+
+    def setup_method(self, testFunc):
+        self.dataDicts = [
+            { 'a' : 'one', 'num' : 7 },
+            { 'a' : 'two', 'num' : -5 },
+            { 'a' : 'three', 'num' : 12 },
+            { 'a' : 'four', 'num' : 3 },
+        ]
+
+    def _generate(self, consumed):
+        for item in self.dataDicts:
+            consumed.append(item)
+            yield item
+
+    def test_ifilter(self):
+        dataDicts = self.dataDicts
+        consumed = []
+
+        results = QueryableListDicts.ifilter(self._generate(consumed), num__gt=0, a__ne='three')
+
+        assert not isinstance(results, list) , 'Expected ifilter to return an iterator, not a list'
+        assert consumed == [] , 'Expected nothing to be consumed before iterating'
+
+        assert next(results) is dataDicts[0] , 'Expected first match to be yielded first'
+        assert consumed == [ dataDicts[0] ] , 'Expected items to be consumed only as needed. Consumed: %s' %(repr(consumed), )
+
+        assert list(results) == [ dataDicts[3] ] , 'Got unexpected remaining results'
+
+        results = list(QueryableListDicts.ifilterAnd(iter(dataDicts), a='two'))
+        assert results == [ dataDicts[1] ] , 'Got unexpected results from ifilterAnd: %s' %(repr(results), )
+
+        expected = QueryableListDicts(dataDicts).filterOr(a='two', num__gt=10)
+        results = list(QueryableListDicts.ifilterOr(iter(dataDicts), a='two', num__gt=10))
+        assert results == list(expected) , 'Expected ifilterOr to match filterOr. Got: %s' %(repr(results), )
+
+    def test_ifilterObjs(self):
+        dataObjs = [ DataObject(**item) for item in self.dataDicts ]
+
+        results = list(QueryableListObjs.ifilter( (obj for obj in dataObjs), num__lt=5 ))
+        assert results == [ dataObjs[1], dataObjs[3] ] , 'Got unexpected results: %s' %(repr(results), )
+
+    def test_queryBuilderStream(self):
+        dataDicts = self.dataDicts
+        consumed = []
+
+        query = QueryBuilder()
+        query.addFilterAnd(num__gt=0)
+        query.addFilterOr(a='one', a__ieq='FOUR')
+
+        results = query.stream(self._generate(consumed), QueryableListDicts)
+        assert consumed == [] , 'Expected nothing to be consumed before iterating'
+        assert list(results) == [ dataDicts[0], dataDicts[3] ] , 'Got unexpected results'
+
+        # Default is mixed access
+        dataObjs = [ DataObject(**item) for item in dataDicts ]
+        results = list(query.stream(iter(dataObjs + dataDicts)))
+        assert results == [ dataObjs[0], dataObjs[3], dataDicts[0], dataDicts[3] ] , 'Got unexpected results from mixed stream: %s' %(repr(results), )
+
+        results = list(query.stream(iter(dataDicts), QueryableListDicts, useCache=True))
+        assert results == [ dataDicts[0], dataDicts[3] ] , 'Got unexpected results with useCache'
+
+
+if __name__ == '__main__':
+    sys.exit(subprocess.Popen('GoodTests.py -n1 "%s" %s' %(sys.argv[0], ' '.join(['"%s"' %(arg.replace('"', '\\"'), ) for arg in sys.argv[1:]]) ), shell=True).wait())
+
+# vim: set ts=4 st=4 sw=4 expandtab :
@@ -0,0 +1,126 @@
+#!/usr/bin/env GoodTests.py
+
+# vim: set ts=4 st=4 sw=4 expandtab :
+'''
+    Test QueryableListTuples, for tuples and namedtuples with a schema
+
+'''
+
+import sys
+import subprocess
+
+from collections import namedtuple
+
+from QueryableList import QueryableListTuples, QueryBuilder, INDEX_TYPE_HASH
+
+
+Person = namedtuple('Person', ('id', 'name', 'age', 'city'))
+
+
+class TestTuples(object):
+    '''
+        Tests QueryableListTuples
+    '''
+
+    def setup_method(self, testFunc):
+        self.rows = [
+            (1, 'tim', 30, 'Boston'),
+            (2, 'bob', 17, 'Austin'),
+            (3, 'sue', 45, None),
+            (4, 'ann', 17, 'boston'),
+        ]
+
+        self.Rows = QueryableListTuples.with_fields( ('id', 'name', 'age', 'city'), name='Rows' )
+
+    def test_filter(self):
+        rows = self.Rows(self.rows)
+
+        assert rows.__class__.__name__ == 'Rows' , 'Expected the name given to with_fields to be used'
+
+        found = rows.filter(age__gte=18)
+        assert issubclass(found.__class__, self.Rows) , 'Expected results to keep the schema'
+        assert [ row[0] for row in found ] == [ 1, 3 ] , 'Wrong results for age__gte: %s' %(repr(found), )
+
+        found = rows.filter(city__ieq='boston', age=17)
+        assert list(found) == [ self.rows[3] ] , 'Wrong results for city__ieq and age: %s' %(repr(found), )
+
+        found = rows.filterOr(name='tim', city__isnull=True)
+        assert [ row[0] for row in found ] == [ 1, 3 ] , 'Wrong results for filterOr: %s' %(repr(found), )
+
+        assert len(rows.filter(notAField__isnull=True)) == 4 , 'Expected a field not in the schema to be None'
+
+        # Chained filters keep working on the results
+        assert len(rows.filter(age=17).filter(name='bob')) == 1 , 'Expected to be able to filter the results again'
+
+    def test_queryBuilder(self):
+        rows = self.Rows(self.rows)
+
+        query = QueryBuilder()
+        query.addFilter(age__lt=40)
+        query.addFilter(city__icontains='ost')
+
+        assert [ row[0] for row in query.execute(rows) ] == [ 1, 4 ] , 'Wrong results from QueryBuilder'
+
+        rows.create_index('age', INDEX_TYPE_HASH)
+        assert [ row[0] for row in rows.filter(age=17) ] == [ 2, 4 ] , 'Wrong results using an index'
+
+    def test_sortAndProject(self):
+        rows = self.Rows(self.rows)
+
+        assert [ row[0] for row in rows.sort_by('age', '-name') ] == [ 2, 4, 1, 3 ] , 'Wrong sort_by order'
+        assert [ row[0] for row in rows.order_by('age', reverse=True, limit=2) ] == [ 3, 1 ] , 'Wrong order_by order'
+
+        assert rows.values_list('name', 'age') == [ ('tim', 30), ('bob', 17), ('sue', 45), ('ann', 17) ] , 'Wrong values_list'
+        assert rows.values_list('name', flat=True) == [ 'tim', 'bob', 'sue', 'ann' ] , 'Wrong flat values_list'
+        assert rows.values_list('name', 'missing')[0] == ('tim', None) , 'Expected a field not in the schema to be None in values_list'
+        assert rows.values('id', age__gt=40) == [ { 'id' : 3 } ] , 'Wrong values'
+
+        assert rows.aggregate('age__max', 'count') == { 'age__max' : 45, 'count' : 4 } , 'Wrong aggregate'
+
+    def test_namedtuple(self):
+        People = QueryableListTuples.with_fields(Person)
+        people = People([ Person(*row) for row in self.rows ])
+
+        found = people.filter(name__in=['bob', 'ann'])
+        assert [ person.id for person in found ] == [ 2, 4 ] , 'Wrong results for namedtuples'
+
+        assert people.values_list('city', flat=True) == [ 'Boston', 'Austin', None, 'boston' ] , 'Wrong values_list for namedtuples'
+
+    def test_schemaDict(self):
+        # Only some of the positions, as a dict
+        Rows = QueryableListTuples.with_fields({ 'name' : 1, 'city' : 3 })
+        rows = Rows(self.rows)
+
+        assert [ row[0] for row in rows.filter(city='Austin') ] == [ 2 ] , 'Wrong results with a dict schema'
+        assert rows.filter(city='Austin', age__isnull=True).count() == 1 , 'Expected a field not in a dict schema to be None'
+
+    def test_subclassFields(self):
+        class Rows(QueryableListTuples):
+            FIELDS = ('id', 'name', 'age', 'city')
+
+        rows = Rows(self.rows)
+        assert len(rows.filter(age=17)) == 2 , 'Expected FIELDS set on a subclass to be used'
+
+    def test_noSchema(self):
+        for fields in ( None, { 'a' : 'zero' } ):
+            gotException = False
+            try:
+                QueryableListTuples.with_fields(fields)
+            except ValueError:
+                gotException = True
+
+            assert gotException , 'Expected ValueError for schema %s' %(repr(fields), )
+
+        gotException = False
+        try:
+            QueryableListTuples(self.rows).filter(age=17)
+        except ValueError:
+            gotException = True
+
+        assert gotException , 'Expected ValueError filtering a QueryableListTuples without a schema'
+
+
+if __name__ == '__main__':
+    sys.exit(subprocess.Popen('GoodTests.py -n1 "%s" %s' %(sys.argv[0], ' '.join(['"%s"' %(arg.replace('"', '\\"'), ) for arg in sys.argv[1:]]) ), shell=True).wait())
+
+# vim: set ts=4 st=4 sw=4 expandtab :
@@ -0,0 +1,150 @@
+#!/usr/bin/env GoodTests.py
+
+# vim: set ts=4 st=4 sw=4 expandtab :
+'''
+    Test USE_CACHED, fetching each field at most once per item, and CACHE_LOWERCASE
+
+'''
+
+import sys
+import subprocess
+
+from QueryableList import QueryableListBase, QueryBuilder, INDEX_TYPE_LOWERCASE
+
+from tutils import DataObject
+
+
+class CountingQueryableList(QueryableListBase):
+    '''
+        A QueryableList which counts every time a value is fetched
+    '''
+
+    fetches = []
+
+    @staticmethod
+    def _get_item_value(item, fieldName):
+        CountingQueryableList.fetches.append( (id(item), fieldName) )
+        return getattr(item, fieldName, None)
+
+
+class CachedCountingQueryableList(CountingQueryableList):
+
+    USE_CACHED = True
+
+
+class LowerCountingQueryableList(CountingQueryableList):
+
+    CACHE_LOWERCASE = True
+
+
+class TestValueCache(object):
+
+    def setup_method(self, testFunc):
+        self.dataObjs = [
+            DataObject(a='one', num=7),
+            DataObject(a='two', num=-5),
+            DataObject(a='three', num=12),
+            DataObject(a='four', num=3),
+        ]
+
+        del CountingQueryableList.fetches[:]
+
+    def test_notCached(self):
+        dataObjs = self.dataObjs
+
+        results = CountingQueryableList(dataObjs).filter(num__gt=0, num__lt=10)
+
+        assert list(results) == [ dataObjs[0], dataObjs[3] ] , 'Got unexpected results: %s' %(repr(results), )
+
+        # num__lt is only checked on items which passed num__gt
+        assert len(CountingQueryableList.fetches) == 7 , 'Expected 7 fetches without cache. Got: %d' %(len(CountingQueryableList.fetches), )
+
+    def test_cached(self):
+        dataObjs = self.dataObjs
+
+        results = CachedCountingQueryableList(dataObjs).filter(num__gt=0, num__lt=10, num__ne=3)
+
+        assert list(results) == [ dataObjs[0] ] , 'Got unexpected results: %s' %(repr(results), )
+
+        fetches = CountingQueryableList.fetches
+        assert len(fetches) == len(dataObjs) , 'Expected every item to be fetched exactly once. Got %d fetches for %d items' %(len(fetches), len(dataObjs))
+        assert len(set(fetches)) == len(fetches) , 'Expected no (item, field) to be fetched twice'
+
+        # Filtering again must fetch again, not use values left over from the last filter
+        results.filter(num__gt=0, num__lt=10)
+        assert len(fetches) == len(dataObjs) + 1 , 'Expected a second filter to fetch the value again'
+
+    def test_cachedQueryBuilder(self):
+        dataObjs = self.dataObjs
+
+        query = QueryBuilder()
+        query.addFilterAnd(num__gt=0)
+        query.addFilterOr(num__lt=10, a='three')
+
+        results = query.execute(CountingQueryableList(dataObjs), useCache=True)
+
+        assert list(results) == [ dataObjs[0], dataObjs[2], dataObjs[3] ] , 'Got unexpected results: %s' %(repr(results), )
+
+        fetches = CountingQueryableList.fetches
+        assert len(fetches) == len(set(fetches)) , 'Expected no (item, field) to be fetched twice across the links of a query'
+
+        del fetches[:]
+        results = query.execute(CountingQueryableList(dataObjs))
+
+        assert len(fetches) > len(set(fetches)) , 'Expected values to be fetched again without cache'
+
+    def test_lowercaseCache(self):
+        dataObjs = self.dataObjs + [ DataObject(a=None, num=1), DataObject(a=['x'], num=2) ]
+
+        lst = LowerCountingQueryableList(dataObjs)
+        plain = CountingQueryableList(dataObjs)
+
+        for filters in ( {'a__ieq' : 'ONE'}, {'a__ine' : 'one'}, {'a__icontains' : 'T'}, {'a__noticontains' : 'T'}, {'a__ieq' : 'two', 'a__icontains' : 'w'} ):
+            for filterMethod in ('filterAnd', 'filterOr'):
+                results = getattr(lst, filterMethod)(**filters)
+                expected = getattr(plain, filterMethod)(**filters)
+                assert list(results) == list(expected) , 'Expected %s(%s) with lowercase cache to match without. Got: %s  Expected: %s' %(filterMethod, repr(filters), repr(results), repr(expected))
+
+        del CountingQueryableList.fetches[:]
+        lst.filter(a__ieq='three')
+        lst.filterOr(a__icontains='o', a__ieq='four')
+
+        assert len(CountingQueryableList.fetches) == 0 , 'Expected cached lowercase values to be used by later filters. Got %d fetches' %(len(CountingQueryableList.fetches), )
+
+        # These match most of the list, but the cached values are still used rather than a scan which lowercases every value
+        results = lst.filter(a__ine='four')
+        assert len(results) == len(dataObjs) - 1 , 'Expected every item but one to match ine. Got: %s' %(repr(results), )
+        results = lst.filter(a__noticontains='w')
+        assert list(results) == [ dataObjs[0] ] + dataObjs[2:] , 'Got unexpected results for noticontains: %s' %(repr(results), )
+        assert len(CountingQueryableList.fetches) == 0 , 'Expected cached lowercase values to be used by ine and noticontains. Got %d fetches' %(len(CountingQueryableList.fetches), )
+
+        # Does not affect case-sensitive filters
+        results = lst.filter(a='one')
+        assert list(results) == [ dataObjs[0] ] , 'Got unexpected results: %s' %(repr(results), )
+
+    def test_lowercaseCacheCleared(self):
+        dataObjs = self.dataObjs
+
+        lst = LowerCountingQueryableList(dataObjs)
+        lst.filter(a__ieq='one')
+
+        newObj = DataObject(a='ONE')
+        lst.append(newObj)
+        results = lst.filter(a__ieq='one')
+        assert list(results) == [ dataObjs[0], newObj ] , 'Expected lowercase cache to be cleared after append. Got: %s' %(repr(results), )
+
+        newObj.a = 'two'
+        lst.drop_index('a', INDEX_TYPE_LOWERCASE)
+        results = lst.filter(a__ieq='one')
+        assert list(results) == [ dataObjs[0] ] , 'Expected lowercase cache to be rebuilt after drop_index. Got: %s' %(repr(results), )
+
+        query = QueryBuilder()
+        query.addFilter(a__ieq='TWO')
+        results = query.execute(lst)
+        assert list(results) == [ dataObjs[1], newObj ] , 'Got unexpected results from QueryBuilder: %s' %(repr(results), )
+
+
+if __name__ == '__main__':
+    sys.exit(subprocess.Popen('GoodTests.py -n1 "%s" %s' %(sys.argv[0], ' '.join(['"%s"' %(arg.replace('"', '\\"'), ) for arg in sys.argv[1:]]) ), shell=True).wait())
+
+# vim: set ts=4 st=4 sw=4 expandtab :
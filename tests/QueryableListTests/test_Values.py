@@ -0,0 +1,115 @@
+#!/usr/bin/env GoodTests.py
+
+# vim: set ts=4 st=4 sw=4 expandtab :
+'''
+    Test values and values_list
+
+'''
+
+import sys
+import subprocess
+
+from collections import defaultdict
+
+from QueryableList import QueryableListObjs, QueryableListDicts, QueryableListMixed
+
+from tutils import DataObject
+
+
+class UpperDictsQueryableList(QueryableListDicts):
+    '''
+        A QueryableListDicts with its own field access, which must be used instead of the bulk accessor
+    '''
+
+    @staticmethod
+    def _get_item_value(item, fieldName):
+        return item.get(fieldName.upper())
+
+
+class TestValues(object):
+    '''
+        Tests projecting fields with values and values_list
+    '''
+
+    def _getDicts(self):
+        return [
+            { 'name' : 'one', 'num' : 1, 'other' : 'x' },
+            { 'name' : 'two', 'num' : 2, 'other' : 'y' },
+            { 'name' : 'three', 'other' : 'z' },
+        ]
+
+    def test_values(self):
+        for lst in ( QueryableListDicts(self._getDicts()), QueryableListObjs([ DataObject(**x) for x in self._getDicts() ]), QueryableListMixed(self._getDicts()) ):
+            listType = lst.__class__.__name__
+
+            result = lst.values('name', 'num')
+            expected = [ { 'name' : 'one', 'num' : 1 }, { 'name' : 'two', 'num' : 2 }, { 'name' : 'three', 'num' : None } ]
+            assert result == expected , 'Expected values on %s to be %s, but got: %s' %(listType, repr(expected), repr(result))
+
+            result = lst.values('name')
+            assert result == [ { 'name' : 'one' }, { 'name' : 'two' }, { 'name' : 'three' } ] , 'Wrong values on %s with one field: %s' %(listType, repr(result))
+
+    def test_valuesList(self):
+        for lst in ( QueryableListDicts(self._getDicts()), QueryableListObjs([ DataObject(**x) for x in self._getDicts() ]), QueryableListMixed(self._getDicts()) ):
+            listType = lst.__class__.__name__
+
+            result = lst.values_list('name', 'num')
+            expected = [ ('one', 1), ('two', 2), ('three', None) ]
+            assert result == expected , 'Expected values_list on %s to be %s, but got: %s' %(listType, repr(expected), repr(result))
+
+            result = lst.values_list('num')
+            assert result == [ (1, ), (2, ), (None, ) ] , 'Expected tuples of one on %s, but got: %s' %(listType, repr(result))
+
+            result = lst.values_list('name', flat=True)
+            assert result == [ 'one', 'two', 'three' ] , 'Expected flat values on %s, but got: %s' %(listType, repr(result))
+
+    def test_valuesFiltered(self):
+        lst = QueryableListDicts(self._getDicts())
+
+        result = lst.values('name', num=2)
+        assert result == [ { 'name' : 'two' } ] , 'Expected values to only include matching items, but got: %s' %(repr(result), )
+
+        result = lst.values_list('name', flat=True, num__isnull=True)
+        assert result == [ 'three' ] , 'Expected values_list to only include matching items, but got: %s' %(repr(result), )
+
+        result = lst.values_list('name', 'other', name__ne='one')
+        assert result == [ ('two', 'y'), ('three', 'z') ] , 'Expected values_list to only include matching items, but got: %s' %(repr(result), )
+
+    def test_valuesSubclass(self):
+        lst = UpperDictsQueryableList([ { 'A' : 1, 'B' : 2 }, { 'A' : 3 } ])
+
+        result = lst.values_list('a', 'b')
+        assert result == [ (1, 2), (3, None) ] , 'Expected a subclass with its own _get_item_value to use it, but got: %s' %(repr(result), )
+
+    def test_valuesDefaultdict(self):
+        items = [ defaultdict(list, x) for x in self._getDicts() ]
+        lst = QueryableListDicts(items)
+
+        result = lst.values_list('name', 'num')
+        assert result == [ ('one', 1), ('two', 2), ('three', None) ] , 'Expected a missing key on a defaultdict to be None, but got: %s' %(repr(result), )
+        assert 'num' not in items[2] , 'Expected values_list to not insert a missing key into a defaultdict'
+
+        result = lst.values('num')
+        assert result == [ { 'num' : 1 }, { 'num' : 2 }, { 'num' : None } ] , 'Expected a missing key on a defaultdict to be None, but got: %s' %(repr(result), )
+
+        result = lst.values_list('num', flat=True)
+        assert result == [ 1, 2, None ] , 'Expected flat values_list to match, but got: %s' %(repr(result), )
+        assert 'num' not in items[2] , 'Expected values to not insert a missing key into a defaultdict'
+
+    def test_valuesInvalid(self):
+        lst = QueryableListDicts(self._getDicts())
+
+        for (func, args, kwargs) in ( (lst.values, [], {}), (lst.values_list, [], {}), (lst.values_list, ['name', 'num'], {'flat' : True}) ):
+            gotException = False
+            try:
+                func(*args, **kwargs)
+            except ValueError:
+                gotException = True
+
+            assert gotException , 'Expected ValueError from %s(%s, %s)' %(func.__name__, repr(args), repr(kwargs))
+
+
+if __name__ == '__main__':
+    sys.exit(subprocess.Popen('GoodTests.py -n1 "%s" %s' %(sys.argv[0], ' '.join(['"%s"' %(arg.replace('"', '\\"'), ) for arg in sys.argv[1:]]) ), shell=True).wait())
+
+# vim: set ts=4 st=4 sw=4 expandtab :
@@ -3,6 +3,10 @@
 '''
 
 # vim: set ts=4 st=4 sw=4 expandtab :
+
+from QueryableList import QueryableListBase
+
+
 def filterDictToStr(filterDict):
     return ', '.join(['%s=%s' %(key, repr(value)) for key, value in filterDict.items()])
 
@@ -50,5 +54,18 @@ class hashableDict(dict):
         return ret
 
 
+class CountingQueryableList(QueryableListBase):
+    '''
+        A QueryableList which counts every time a value is fetched
+    '''
+
+    numFetches = 0
+
+    @staticmethod
+    def _get_item_value(item, fieldName):
+        CountingQueryableList.numFetches += 1
+        return getattr(item, fieldName, None)
+
+
 def assembleItems(item, nums):
     return [item[num] for num in nums]